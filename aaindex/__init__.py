@@ -1,16 +1,30 @@
-from importlib.metadata import version, PackageNotFoundError
-
 from .aaindex1 import *
 from .aaindex2 import *
 from .aaindex3 import *
+from . import encoding
+from .encoding import encode
+from .features import pair_features, pair_feature_codes
+from . import descriptors
+from . import mutations
+from . import contacts
+from . import msa
+from . import quantisation
+from . import cache
 
-# Single-source version from installed package metadata
-try:
-    __version__ = version("aaindex")
-except PackageNotFoundError:
-    __version__ = "0.0.0"
+def __getattr__(name):
+    # Single-source version from installed package metadata, resolved on first
+    # access so that importing the package does not pay for importlib.metadata
+    if name == "__version__":
+        from importlib.metadata import version, PackageNotFoundError
+        try:
+            return version("aaindex")
+        except PackageNotFoundError:
+            return "0.0.0"
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 __author__ = "AJ McKenna: https://github.com/amckenna41"
 __license__ = "MIT"
 
-__all__ = ["AAIndex1", "aaindex1", "AAIndex2", "aaindex2", "AAIndex3", "aaindex3"]
\ No newline at end of file
+__all__ = ["AAIndex1", "aaindex1", "AAIndex2", "aaindex2", "AAIndex3", "aaindex3", "encoding", "encode",
+           "pair_features", "pair_feature_codes", "descriptors", "mutations", "contacts", "msa",
+           "quantisation", "cache"]
\ No newline at end of file
@@ -0,0 +1,6 @@
+#allow the command-line tool to be run with: python -m aaindex
+import sys
+
+from .cli import main
+
+sys.exit(main())
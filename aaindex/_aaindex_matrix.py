@@ -7,8 +7,16 @@ import json
 import os
 import sys
 import copy
+import hashlib
 import re
-from typing import Dict, Iterator, List, Optional, Union
+import threading
+import zlib
+from collections import OrderedDict
+from datetime import date
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from ._arrow import _dense_to_arrow, _metadata_to_arrow, _read_parquet, _write_parquet
+from .encoding import AMINO_ACIDS, _check_na_policy, _require_numpy, encode
 
 
 class Map(dict):
@@ -56,6 +64,132 @@ class Map(dict):
         return f"Map({dict.__repr__(self)})"
 
 
+class FrozenMap(Map):
+    """An immutable Map, returned for records of a frozen database.
+
+    Keys are mirrored into the instance ``__dict__`` once on construction so
+    dot-notation reads never write to the object, making a FrozenMap safe to
+    share between threads. Any mutation raises a TypeError.
+    """
+
+    def __init__(self, *args, **kwargs):
+        dict.__init__(self, *args, **kwargs)
+        self.__dict__.update(self)
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError("'FrozenMap' object is immutable.")
+
+    __setattr__ = __setitem__ = __delattr__ = __delitem__ = _immutable
+    clear = pop = popitem = setdefault = update = __ior__ = _immutable
+
+    def __copy__(self) -> "FrozenMap":
+        return self
+
+    def __deepcopy__(self, memo: Dict) -> "FrozenMap":
+        return self
+
+    def __reduce__(self):
+        return (FrozenMap, (dict(self),))
+
+    def __repr__(self) -> str:
+        return f"FrozenMap({dict.__repr__(self)})"
+
+
+def _pack_blob(obj) -> bytes:
+    """Serialise parsed database content into a compact, zlib compressed JSON blob."""
+    return zlib.compress(json.dumps(obj, separators=(",", ":")).encode("utf-8"), 9)
+
+
+def _unpack_blob(blob: bytes):
+    """Deserialise a blob written by _pack_blob()."""
+    return json.loads(zlib.decompress(blob).decode("utf-8"))
+
+
+def _freeze(obj):
+    """Return a deeply immutable copy of a parsed record, dicts become FrozenMaps and lists tuples."""
+    if isinstance(obj, dict):
+        return FrozenMap({k: _freeze(v) for k, v in obj.items()})
+    if isinstance(obj, list):
+        return tuple(_freeze(v) for v in obj)
+    return obj
+
+def _read_release(path: str) -> Tuple[str, str]:
+    """Read a raw AAindex release file, returning its text and the SHA-256 hex digest of its bytes."""
+    try:
+        with open(path, "rb") as f:
+            raw = f.read()
+    except OSError as e:
+        raise OSError(f"Error opening AAindex release file, check it is present at: {path}.") from e
+    return raw.decode("utf-8"), hashlib.sha256(raw).hexdigest()
+
+def _release_date(path: str) -> str:
+    """Return the modification date of a file in the format of last_updated, e.g. February 13, 2017."""
+    modified = date.fromtimestamp(os.path.getmtime(path))
+    return f"{modified:%B} {modified.day}, {modified.year}"
+
+def _database_hash(raw_path: str, records: Dict, custom: bool) -> str:
+    """Return the SHA-256 hex digest of a database's raw file, or of its records assigned in memory."""
+    if not custom and os.path.isfile(raw_path):
+        return _read_release(raw_path)[1]
+    return hashlib.sha256(json.dumps(records, sort_keys=True).encode("utf-8")).hexdigest()
+
+def _record_offsets(raw_path: str) -> Optional[Dict[str, List[int]]]:
+    """Return the sidecar index mapping each accession number to the [offset, length] of its record in a raw file.
+
+    The index is read from ``<raw file>.offsets.json`` in the data directory,
+    or built by scanning the raw file and written there if it is missing or
+    was built for a raw file of a different size. Returns None if the raw file
+    is not present.
+    """
+    index_path = raw_path + ".offsets.json"
+    try:
+        size = os.path.getsize(raw_path)
+    except OSError:
+        return None
+    try:
+        with open(index_path) as f:
+            index = json.load(f)
+        if index["size"] == size:
+            return index["records"]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    #scan the raw file, each record spanning from its H line to the closing // line
+    with open(raw_path, "rb") as f:
+        raw = f.read()
+    records: Dict[str, List[int]] = {}
+    start, position, code = 0, 0, None
+    for line in raw.splitlines(keepends=True):
+        if code is None and line.startswith(b"H "):
+            code = line[2:].strip().decode("utf-8")
+        position += len(line)
+        if line.startswith(b"//"):
+            if code is not None:
+                records[code] = [start, position - start]
+            start, code = position, None
+    #the index is rebuilt on next use if the data directory is read-only
+    try:
+        with open(index_path, "w") as f:
+            json.dump({"size": size, "records": records}, f, separators=(",", ":"))
+    except OSError:
+        pass
+    return records
+
+def _read_record(raw_path: str, offset: int, length: int) -> List[str]:
+    """Return the lines of the single record at a byte offset of a raw AAindex file."""
+    with open(raw_path, "rb") as f:
+        f.seek(offset)
+        return f.read(length).decode("utf-8").splitlines(keepends=True)
+
+def _diff_records(old: Dict, new: Dict) -> Dict[str, List[str]]:
+    """Return the sorted accession numbers of the records added, removed and changed between two releases."""
+    return {
+        "added": sorted(new.keys() - old.keys()),
+        "removed": sorted(old.keys() - new.keys()),
+        "changed": sorted(code for code in new.keys() & old.keys() if new[code] != old[code]),
+    }
+
+
 class _AAIndexMatrix:
     """Base class for AAindex2 and AAindex3 matrix database parsers.
 
@@ -68,11 +202,28 @@ class _AAIndexMatrix:
         aaindex_module_path: Absolute path to the aaindex package directory.
         data_dir: Subdirectory name containing raw and cached data files.
         aaindex_filename: Base filename for this database (no extension).
-        aaindex_json: Parsed database keyed by accession number.
+        aaindex_json: Parsed database keyed by accession number, loaded from
+            disk on first access.
+        record_cache_size: Number of records parsed alone from the raw file
+            kept in an LRU cache while the database is not loaded.
         last_updated: Date string of the last published database update.
+        content_hash: SHA-256 hex digest of the release the records were
+            parsed from.
     """
 
     def __init__(self, filename: str) -> None:
+        #set by freeze(), after which the instance and its records are immutable
+        self._frozen = False
+
+        #byte offsets of the records in the raw file, and an LRU of records parsed from them,
+        #used to serve single record lookups without loading the whole database
+        self.record_cache_size = 128
+        self._offsets: Optional[Dict[str, List[int]]] = None
+        self._record_cache: OrderedDict = OrderedDict()
+
+        #nested matrix dicts keyed by record code, each with the stored record it was expanded from
+        self._matrix_cache: Dict[str, Tuple[Dict, Dict]] = {}
+
         #resolve the package directory for data file lookups
         self.aaindex_module_path = os.path.dirname(
             os.path.abspath(sys.modules[self.__module__].__file__)
@@ -80,26 +231,138 @@ class _AAIndexMatrix:
         self.data_dir = "data"
         self.aaindex_filename = filename
 
-        #load from cached JSON if available, otherwise parse the raw file
+        #database is loaded lazily on first access, keeping import cheap; the lock
+        #ensures concurrent first accesses from several threads load it only once
+        self._aaindex_json: Optional[Dict] = None
+        self._load_lock = threading.RLock()
+
+        #True if aaindex_json was assigned in memory rather than loaded from disk,
+        #in which case pickles must carry the records instead of a reference to the files
+        self._custom_json = False
+
+        #expanded, immutable records keyed by accession number, built by freeze()
+        self._records: Optional[Dict] = None
+
+        #date as shown on https://www.genome.jp/aaindex/
+        self.last_updated = "February 13, 2017"
+
+        #SHA-256 of the release the records were parsed from, computed on first access or set by refresh()
+        self._content_hash: Optional[str] = None
+
+        #per-record dense matrix arrays keyed by (record code, NA policy), built by to_array()
+        self._array_cache: Dict = {}
+
+        #stacked matrix tensors keyed by (tuple of record codes, NA policy), built by to_tensor()
+        self._tensor_cache: Dict = {}
+
+        #reduced precision copies of the tensors keyed by (dtype, tuple of record codes,
+        #NA policy), built by quantised()
+        self._quantised_cache: Dict = {}
+
+    def _load(self) -> Dict:
+        """Load the database from the cached JSON if available, otherwise parse the raw file."""
         json_path = os.path.join(
             self.aaindex_module_path, self.data_dir, self.aaindex_filename + ".json"
         )
         if os.path.isfile(json_path):
             with open(json_path) as aai_json:
-                self.aaindex_json = json.load(aai_json)
-        else:
-            self.aaindex_json = self.parse_aaindex()
+                aaindex_json = json.load(aai_json)
+            #reparse caches written before matrices were stored in packed form
+            if "matrix_values" in next(iter(aaindex_json.values()), {"matrix_values": []}):
+                return aaindex_json
+        return self.parse_aaindex()
 
-        #date as shown on https://www.genome.jp/aaindex/
-        self.last_updated = "February 13, 2017"
+    def warm(self, arrays: bool = False) -> None:
+        """Load the database now rather than on first access.
+
+        Useful to move the blocking file I/O and JSON parsing out of latency
+        sensitive code paths, e.g. at service start up or in a worker thread.
+
+        Args:
+            arrays: Also build the stacked matrix tensor used by the array
+                    based APIs, requires numpy.
+        """
+        #the database property loads it on first access
+        _ = self.aaindex_json
+        if arrays:
+            self.to_tensor()
+
+    def freeze(self, arrays: bool = False) -> None:
+        """Load the database and make this instance immutable and thread-safe to share.
+
+        The parsed records are replaced by deeply immutable copies and every
+        record is expanded once, so __getitem__() and search() return shared
+        FrozenMap records without building or writing to any object. Afterwards
+        the property setters raise an AttributeError. Freezing is irreversible
+        and idempotent.
+
+        Args:
+            arrays: Also build the stacked matrix tensor used by the array
+                    based APIs, requires numpy.
+        """
+        self.warm(arrays=arrays)
+        with self._load_lock:
+            if self._frozen:
+                return
+            self._aaindex_json = _freeze(self._aaindex_json)
+            self._records = {code: _freeze(self._expand_record(code, record))
+                             for code, record in self._aaindex_json.items()}
+            self._frozen = True
+
+    @property
+    def frozen(self) -> bool:
+        """True if freeze() has been called on this instance."""
+        return self._frozen
+
+    def __getstate__(self) -> Dict:
+        """Return a compact pickle state for the instance.
+
+        The parsed records are not pickled: the state references the database
+        files by data_dir and aaindex_filename, and the unpickled instance
+        loads them lazily from the aaindex package installed in the receiving
+        process, making it cheap to send to multiprocessing, Spark or Dask
+        workers. Only if aaindex_json was assigned in memory are the records
+        included, as a single compressed blob. Caches are not pickled.
+        """
+        state = {
+            "aaindex_filename": self.aaindex_filename,
+            "data_dir": self.data_dir,
+            "last_updated": self.last_updated,
+            "frozen": self._frozen,
+        }
+        if self._custom_json:
+            state["aaindex_json"] = _pack_blob(self._aaindex_json)
+            state["content_hash"] = self._content_hash
+        return state
+
+    def __setstate__(self, state: Dict) -> None:
+        """Restore an instance from the state returned by __getstate__().
+
+        Frozen instances are loaded and frozen again immediately.
+        """
+        _AAIndexMatrix.__init__(self, state["aaindex_filename"])
+        self.data_dir = state["data_dir"]
+        self.last_updated = state["last_updated"]
+        if "aaindex_json" in state:
+            self.aaindex_json = _unpack_blob(state["aaindex_json"])
+            self._content_hash = state["content_hash"]
+        if state["frozen"]:
+            self.freeze()
+
+    def _check_writable(self, name: str) -> None:
+        """Raise an AttributeError if the instance is frozen."""
+        if self._frozen:
+            raise AttributeError(f"can't set {name!r}, {self.__class__.__name__} instance is frozen.")
 
     def parse_aaindex(self) -> Dict:
         """Parse the raw AAindex database file into a nested dict and cache as JSON.
 
         Each record is keyed by its accession number and stores metadata
-        alongside the full symmetric 20x20 matrix reconstructed from the
-        lower-triangular source data. The result is written to a .json file in
-        the data directory for fast subsequent loads.
+        alongside its matrix values. Symmetric matrices are stored once as a
+        packed lower triangle and asymmetric matrices in full (row-major), with
+        a per-record ``symmetric`` flag; see _pack_matrix(). The nested
+        ``matrix`` dict is rebuilt from these on access. The result is written
+        to a .json file in the data directory for fast subsequent loads.
 
         Returns:
             dict: Parsed database keyed by accession number.
@@ -108,12 +371,6 @@ class _AAIndexMatrix:
             IOError: If the raw database file cannot be opened.
             ValueError: If a duplicate accession number is encountered.
         """
-        #template for each record's metadata fields
-        template_dict = {
-            "H": [], "D": [], "R": [], "A": [],
-            "*": [], "T": [], "J": [], "C": [], "M": [],
-        }
-
         tmp_filepath = os.path.join(
             self.aaindex_module_path, self.data_dir, self.aaindex_filename
         )
@@ -126,9 +383,32 @@ class _AAIndexMatrix:
                 f"check it is present at: {tmp_filepath}."
             ) from e
 
+        aaindex_json = self._parse_lines(lines)
+
+        #cache parsed database as JSON for fast subsequent loads
+        json_out_path = os.path.join(
+            self.aaindex_module_path, self.data_dir, self.aaindex_filename + ".json"
+        )
+        with open(json_out_path, "w") as output_f:
+            json.dump(aaindex_json, output_f, indent=4, sort_keys=True)
+
+        return aaindex_json
+
+    def _parse_lines(self, lines: List[str]) -> Dict:
+        """Parse the lines of a raw AAindex2/3 release into records keyed by accession number."""
+        #template for each record's metadata fields
+        template_dict = {
+            "H": [], "D": [], "R": [], "A": [],
+            "*": [], "T": [], "J": [], "C": [], "M": [],
+        }
+
         #regex to normalise double-quote characters in field values
         clean_up_pattern = re.compile("\"")
 
+        #regex to extract the row and column amino acid orders from the M line,
+        #tolerating the malformed "cols rows =" header present in some records
+        header_pattern = re.compile(r"rows\s*=\s*([^,\s]+),?\s*cols[^=]*=\s*(\S+)")
+
         aaindex_json: Dict = {}
         current_dict = copy.deepcopy(template_dict)
         current_entry: str = "H"  # first non-space line in any block is always H
@@ -160,8 +440,7 @@ class _AAIndexMatrix:
                 for pair in corr_pairs:
                     correlation_coefficients[pair[0]] = pair[1]
 
-                #parse the M block into a full symmetric matrix
-                matrix: Dict = {}
+                #parse the M block header and rows of values
                 row_order: List[str] = []
                 col_order: List[str] = []
                 matrix_rows: List[List] = []
@@ -169,10 +448,10 @@ class _AAIndexMatrix:
                 for m_line in current_dict["M"]:
                     stripped = m_line.strip()
                     if stripped.startswith("rows"):
-                        #format: rows = <AA_STRING> cols = <AA_STRING>
-                        parts = stripped.replace(",", "").split()
-                        row_order = list(parts[2])
-                        col_order = list(parts[5])
+                        #format: rows = <AA_STRING>, cols = <AA_STRING>
+                        header = header_pattern.match(stripped)
+                        row_order = list(header.group(1))
+                        col_order = list(header.group(2))
                     else:
                         row_vals: List = []
                         for token in stripped.split():
@@ -186,19 +465,7 @@ class _AAIndexMatrix:
                         if row_vals:
                             matrix_rows.append(row_vals)
 
-                #reconstruct full symmetric matrix from lower-triangular data
-                for i, row_aa in enumerate(row_order):
-                    if i >= len(matrix_rows):
-                        break
-                    matrix.setdefault(row_aa, {})
-                    for j, val in enumerate(matrix_rows[i]):
-                        if j >= len(col_order):
-                            break
-                        col_aa = col_order[j]
-                        matrix[row_aa][col_aa] = val
-                        #fill the symmetric counterpart
-                        matrix.setdefault(col_aa, {})
-                        matrix[col_aa][row_aa] = val
+                symmetric, matrix_values = self._pack_matrix(matrix_rows, row_order, col_order)
 
                 if name in aaindex_json:
                     raise ValueError(f"Duplicate accession number found: {name}.")
@@ -209,7 +476,8 @@ class _AAIndexMatrix:
                     "pmid": pmid,
                     "correlation_coefficients": correlation_coefficients,
                     "notes": notes,
-                    "matrix": matrix,
+                    "symmetric": symmetric,
+                    "matrix_values": matrix_values,
                     "row_order": row_order,
                     "col_order": col_order,
                 }
@@ -221,19 +489,157 @@ class _AAIndexMatrix:
                 current_entry = line[0]
             current_dict[current_entry].append(line[1:].strip())
 
-        #cache parsed database as JSON for fast subsequent loads
-        json_out_path = os.path.join(
-            self.aaindex_module_path, self.data_dir, self.aaindex_filename + ".json"
-        )
-        with open(json_out_path, "w") as output_f:
-            json.dump(aaindex_json, output_f, indent=4, sort_keys=True)
-
         return aaindex_json
 
+    def refresh(self, path: str, release_date: Optional[str] = None) -> Map:
+        """Update the database in place from a newer release file.
+
+        The release file, in the raw flat file format published on
+        https://www.genome.jp/aaindex/, is parsed and diffed against the
+        loaded records. Cached arrays of changed or removed records are
+        dropped and rebuilt on next access, and cached tensors holding changed
+        records are patched slice by slice; caches over unaffected records are
+        kept as they are. The packaged data files are not modified.
+        last_updated is set to the release date and content_hash to the
+        SHA-256 of the release file, so a pinned snapshot can be audited
+        against the file it was built from.
+
+        Args:
+            path: Path to the new release file.
+            release_date: Date of the release, e.g. "February 13, 2017".
+                          Defaults to the modification date of the file.
+
+        Returns:
+            Map with the sorted accession numbers of the ``added``,
+            ``removed`` and ``changed`` records, and the ``release_date`` and
+            ``content_hash`` recorded.
+
+        Raises:
+            AttributeError: If the instance is frozen.
+            OSError: If the release file cannot be opened.
+            ValueError: If a duplicate accession number is encountered.
+        """
+        self._check_writable("aaindex_json")
+        text, content_hash = _read_release(path)
+        records = self._parse_lines(text.splitlines(keepends=True))
+        with self._load_lock:
+            diff = _diff_records(self.aaindex_json, records)
+            self.aaindex_json = records
+            self.last_updated = release_date or _release_date(path)
+            self._content_hash = content_hash
+            self._refresh_arrays(diff)
+        return Map(diff, release_date=self.last_updated, content_hash=content_hash)
+
+    def _refresh_arrays(self, diff: Dict[str, List[str]]) -> None:
+        """Carry the cached arrays and tensors over a refresh(), rebuilding only those of affected records."""
+        changed, removed = set(diff["changed"]), set(diff["removed"])
+        self._array_cache = {key: array for key, array in self._array_cache.items()
+                             if key[0].strip().upper() not in changed | removed}
+        self._quantised_cache = {key: quantised for key, quantised in self._quantised_cache.items()
+                                 if (changed | removed).isdisjoint(code.strip().upper() for code in key[1])}
+
+        tensors, self._tensor_cache = self._tensor_cache, {}
+        for (record_codes, na_policy), (tensor, pair_table) in tensors.items():
+            codes = [code.strip().upper() for code in record_codes]
+            if removed.intersection(codes):
+                continue
+            if not changed.isdisjoint(codes):
+                np = _require_numpy()
+                tensor = tensor.copy()
+                try:
+                    for i, code in enumerate(codes):
+                        if code in changed:
+                            tensor[i] = self.to_array(code, na_policy)
+                except ValueError:
+                    #NA values now present under the "raise" policy, raised again on next access
+                    continue
+                pair_table = np.ascontiguousarray(tensor.reshape(len(codes), -1).T)
+                tensor.flags.writeable = False
+                pair_table.flags.writeable = False
+            self._tensor_cache[(record_codes, na_policy)] = (tensor, pair_table)
+
+    @staticmethod
+    def _pack_matrix(matrix_rows: List[List], row_order: List[str],
+                     col_order: List[str]) -> Tuple[bool, List]:
+        """Pack the parsed rows of a matrix into a flat list of values.
+
+        Matrices given as a lower triangle, or given in full but numerically
+        symmetric, are packed row-major as their lower triangle
+        (n * (n + 1) / 2 values, value (i, j) with i >= j at i * (i + 1) / 2 + j).
+        Any other matrix is stored in full, row-major over row_order x col_order,
+        so genuinely asymmetric matrices keep both halves. Missing values are None.
+
+        Args:
+            matrix_rows: Parsed rows of values from the record's M block.
+            row_order: Amino acid labelling each row.
+            col_order: Amino acid labelling each column.
+
+        Returns:
+            Tuple of the symmetric flag and the flat list of packed values.
+        """
+        n_rows, n_cols = len(row_order), len(col_order)
+        lower_triangular = all(len(row) == i + 1 for i, row in enumerate(matrix_rows))
+
+        if row_order == col_order and lower_triangular:
+            packed: List = []
+            for i in range(n_rows):
+                row = matrix_rows[i] if i < len(matrix_rows) else []
+                packed.extend(row[j] if j < len(row) else None for j in range(i + 1))
+            return True, packed
+
+        full = [
+            [row[j] if j < len(row) else None for j in range(n_cols)]
+            for row in matrix_rows[:n_rows]
+        ]
+        full.extend([None] * n_cols for _ in range(n_rows - len(full)))
+        if row_order == col_order and all(
+            full[i][j] == full[j][i] for i in range(n_rows) for j in range(i)
+        ):
+            return True, [full[i][j] for i in range(n_rows) for j in range(i + 1)]
+        return False, [val for row in full for val in row]
+
+    @staticmethod
+    def _matrix_value(record: Dict, aa1: str, aa2: str) -> Optional[float]:
+        """Return the (aa1, aa2) value of a record from its packed matrix values."""
+        row_order, col_order = record["row_order"], record["col_order"]
+        if aa1 not in row_order or aa2 not in col_order:
+            return None
+        i, j = row_order.index(aa1), col_order.index(aa2)
+        if record["symmetric"]:
+            if i < j:
+                i, j = j, i
+            return record["matrix_values"][i * (i + 1) // 2 + j]
+        return record["matrix_values"][i * len(col_order) + j]
+
+    def _expand_record(self, code: str, record: Dict) -> Dict:
+        """Return a copy of a stored record with its nested ``matrix`` dict rebuilt.
+
+        The matrix is built by slicing the packed values row by row and cached
+        per record code, rebuilt whenever the stored record is replaced. Each
+        caller gets its own copy of the row dicts, so mutating a returned
+        record never changes later lookups.
+        """
+        cached = self._matrix_cache.get(code)
+        if cached is None or cached[0] is not record:
+            row_order, col_order = record["row_order"], record["col_order"]
+            values, n_cols = record["matrix_values"], len(col_order)
+            if record["symmetric"]:
+                rows = [values[i * (i + 1) // 2:(i + 1) * (i + 2) // 2] for i in range(len(row_order))]
+                matrix = {aa1: {aa2: rows[i][j] if j <= i else rows[j][i] for j, aa2 in enumerate(col_order)}
+                          for i, aa1 in enumerate(row_order)}
+            else:
+                matrix = {aa1: dict(zip(col_order, values[i * n_cols:(i + 1) * n_cols]))
+                          for i, aa1 in enumerate(row_order)}
+            cached = self._matrix_cache[code] = (record, matrix)
+        expanded = dict(record)
+        expanded["matrix"] = {aa1: dict(row) for aa1, row in cached[1].items()}
+        return expanded
+
     def get(self, record_code: str, aa1: str, aa2: str) -> Optional[float]:
         """Return the pairwise matrix score for two amino acids from a given record.
 
-        The matrix is symmetric so get(code, aa1, aa2) == get(code, aa2, aa1).
+        aa1 indexes the matrix row and aa2 the column. For symmetric records
+        (see the record's ``symmetric`` flag) get(code, aa1, aa2) == get(code, aa2, aa1).
         Returns None when either amino acid carries an NA value in the source data
         or when the amino acid letter is not present in this record's matrix.
 
@@ -249,16 +655,385 @@ class _AAIndexMatrix:
             TypeError: If aa1 or aa2 are not strings.
             ValueError: If record_code is not found in the database.
         """
-        record = self[record_code]
+        record = self._lookup(record_code)
         try:
             aa1 = aa1.strip().upper()
             aa2 = aa2.strip().upper()
         except AttributeError:
             raise TypeError("aa1 and aa2 must be single-letter string amino acid codes.")
-        matrix = record.matrix
-        if aa1 in matrix and aa2 in matrix[aa1]:
-            return matrix[aa1][aa2]
-        return None
+        return self._matrix_value(record, aa1, aa2)
+
+    def encode(self, sequence: str):
+        """Encode an amino acid sequence into integer codes for use with get_many().
+
+        Args:
+            sequence: Amino acid sequence of single-letter codes.
+
+        Returns:
+            1D numpy uint8 array of codes indexing :data:`aaindex.encoding.ALPHABET`.
+
+        Raises:
+            TypeError: If sequence is not a string.
+            ValueError: If sequence contains characters outside the alphabet.
+        """
+        return encode(sequence)
+
+    def to_array(self, record_code: str, na_policy: str = "nan"):
+        """Return a record's matrix as a dense 20x20 numpy array.
+
+        Rows and columns follow the canonical AAindex ordering
+        (:data:`aaindex.encoding.AMINO_ACIDS`), so the integer codes returned by
+        encode() index the array directly. NA values, including amino acids
+        absent from the record's matrix, are replaced according to na_policy;
+        their positions are given by na_mask(). Arrays are built once per
+        record and policy, cached and returned read-only.
+
+        Args:
+            record_code: AAindex accession number.
+            na_policy: How NA values are replaced, one of "zero", "nan"
+                       (default), "mean" (mean of the matrix column),
+                       "diagonal_mean" (mean of the matrix diagonal) or
+                       "raise" (raise a ValueError if any are present).
+
+        Returns:
+            Read-only 20x20 float64 numpy array of pairwise scores.
+
+        Raises:
+            ValueError: If record_code is not found in the database, na_policy
+                        is invalid, or na_policy is "raise" and NA values are present.
+        """
+        array = self._array_cache.get((record_code, na_policy))
+        if array is not None:
+            return array
+
+        _check_na_policy(na_policy)
+        code = self._normalise_code(record_code)
+        array = self._array_cache.get((code, na_policy))
+        if array is None:
+            if na_policy == "nan":
+                array = self._build_array(code)
+            else:
+                array = self._fill_na(code, self.to_array(code, "nan"), na_policy)
+            array.flags.writeable = False
+
+        #cache under both the normalised and the as-given code for fast repeat lookups
+        self._array_cache[(code, na_policy)] = array
+        self._array_cache[(record_code, na_policy)] = array
+        return array
+
+    def na_mask(self, record_code: str):
+        """Return a boolean mask of the NA values in a record's dense matrix.
+
+        Args:
+            record_code: AAindex accession number.
+
+        Returns:
+            20x20 bool numpy array, True where the record has no value for the
+            amino acid pair, in the same layout as to_array().
+
+        Raises:
+            ValueError: If record_code is not found in the database.
+        """
+        np = _require_numpy()
+        return np.isnan(self.to_array(record_code, "nan"))
+
+    def _build_array(self, code: str):
+        """Build the dense 20x20 array of a record's matrix with NA values as NaN."""
+        np = _require_numpy()
+        record = self.aaindex_json[code]
+        array = np.full((len(AMINO_ACIDS), len(AMINO_ACIDS)), np.nan)
+        for i, aa1 in enumerate(AMINO_ACIDS):
+            for j, aa2 in enumerate(AMINO_ACIDS):
+                val = self._matrix_value(record, aa1, aa2)
+                if val is not None:
+                    array[i, j] = val
+        return array
+
+    @staticmethod
+    def _fill_na(code: str, array, na_policy: str):
+        """Return a copy of a NaN-holding matrix array with NA values replaced per na_policy."""
+        np = _require_numpy()
+        mask = np.isnan(array)
+        if na_policy == "raise":
+            if mask.any():
+                raise ValueError(f"Record {code} contains {int(mask.sum())} NA value(s).")
+            return array.copy()
+        if na_policy == "zero":
+            return np.where(mask, 0.0, array)
+
+        known = np.where(mask, 0.0, array)
+        if na_policy == "mean":
+            #columns with no values at all fall back to the mean of the whole matrix
+            counts = (~mask).sum(axis=0)
+            overall = known.sum() / max(int(counts.sum()), 1)
+            fill = np.full(array.shape[1], overall)
+            np.divide(known.sum(axis=0), counts, out=fill, where=counts > 0)
+            return np.where(mask, fill[np.newaxis, :], array)
+
+        #diagonal_mean
+        diagonal = np.diagonal(array)
+        valid = ~np.isnan(diagonal)
+        fill = diagonal[valid].mean() if valid.any() else np.nan
+        return np.where(mask, fill, array)
+
+    def get_many(self, record_code: str, pairs, na_policy: str = "nan"):
+        """Return pairwise scores for many pre-encoded amino acid pairs at once.
+
+        Vectorised counterpart of get(): the record's dense array is gathered
+        with the integer codes directly, skipping the per-call string
+        normalisation and dict lookups.
+
+        Args:
+            record_code: AAindex accession number.
+            pairs: Integer array-like of shape (..., 2) holding (aa1, aa2) codes
+                   as produced by encode(), each in the range 0-19.
+            na_policy: How NA values are replaced, see to_array(). Defaults to NaN.
+
+        Returns:
+            float64 numpy array of shape pairs.shape[:-1].
+
+        Raises:
+            ValueError: If record_code is not found, na_policy is invalid or
+                        pairs is not of shape (..., 2).
+            IndexError: If a code is outside the range of the 20 amino acids.
+        """
+        np = _require_numpy()
+        array = self.to_array(record_code, na_policy)
+        pairs = np.asarray(pairs, dtype=np.intp)
+        if pairs.ndim == 0 or pairs.shape[-1] != 2:
+            raise ValueError(f"pairs must be an array of shape (..., 2), got {pairs.shape}.")
+        return array[pairs[..., 0], pairs[..., 1]]
+
+    def to_tensor(self, record_codes: Optional[List[str]] = None, na_policy: str = "nan"):
+        """Return the matrices of many records stacked into a single 3D numpy array.
+
+        Each slice is the record's to_array() matrix, so the tensor has shape
+        (n_matrices, 20, 20) with rows and columns in canonical AAindex order.
+        Tensors are cached per requested set of records and returned read-only.
+
+        Args:
+            record_codes: Accession numbers to stack, in the desired order.
+                          Defaults to all records, ordered as record_codes().
+            na_policy: How NA values are replaced, see to_array(). Defaults to NaN.
+
+        Returns:
+            Read-only float64 numpy array of shape (n_matrices, 20, 20).
+
+        Raises:
+            ValueError: If any record code is not found in the database or
+                        na_policy is invalid.
+        """
+        return self._stacked(record_codes, na_policy)[0]
+
+    def quantised(self, dtype: str = "int8", record_codes: Optional[List[str]] = None,
+                  na_policy: str = "nan"):
+        """Return the stacked matrices of to_tensor() stored at reduced precision.
+
+        The (n_matrices, 20, 20) tensor is stored as float32, float16 or int8
+        with a scale and offset per matrix, see
+        :class:`aaindex.quantisation.QuantisedArray`, taking a half, a quarter
+        or an eighth of the float64 memory. dequantise() restores float values
+        in one vectorised pass, and quantisation_report() gives the error each
+        format introduces. Results are cached.
+
+        Args:
+            dtype: Storage format, one of "float32", "float16" or "int8".
+            record_codes: Accession numbers to stack, in the desired order.
+                          Defaults to all records, ordered as record_codes().
+            na_policy: How NA values are replaced, see to_array(). Defaults to
+                       NaN, which int8 storage keeps.
+
+        Returns:
+            QuantisedArray of shape (n_matrices, 20, 20).
+
+        Raises:
+            ValueError: If dtype is not a supported storage format, a record
+                        code is not found or na_policy is invalid.
+        """
+        #imported here as the quantisation module imports Map from this one
+        from .quantisation import quantise
+        if record_codes is None:
+            record_codes = self.record_codes()
+        elif isinstance(record_codes, str):
+            record_codes = [record_codes]
+        key = (dtype, tuple(record_codes), na_policy)
+        quantised = self._quantised_cache.get(key)
+        if quantised is None:
+            quantised = quantise(self.to_tensor(record_codes, na_policy), dtype)
+            self._quantised_cache[key] = quantised
+        return quantised
+
+    def quantisation_report(self, record_codes: Optional[List[str]] = None, na_policy: str = "nan",
+                            dtypes: Optional[List[str]] = None) -> Map:
+        """Return the memory use and error of each reduced precision storage format.
+
+        Args:
+            record_codes: Accession numbers of the matrices to report on.
+                          Defaults to all records, ordered as record_codes().
+            na_policy: How NA values are replaced, see to_array(). Defaults to NaN.
+            dtypes: Storage formats to report on. Defaults to all of
+                    :data:`aaindex.quantisation.QUANTISED_DTYPES`.
+
+        Returns:
+            Map keyed by storage format of Maps with the ``nbytes`` of the
+            stored tensors, their ``compression`` against float64 and, as
+            arrays of shape (n_matrices,), the ``max_abs_error`` and ``rmse`` of
+            each matrix, see QuantisedArray.error().
+
+        Raises:
+            ValueError: If a dtype is not a supported storage format, a record
+                        code is not found or na_policy is invalid.
+        """
+        from .quantisation import QUANTISED_DTYPES
+        reference = self.to_tensor(record_codes, na_policy)
+        report = Map()
+        for dtype in (QUANTISED_DTYPES if dtypes is None else dtypes):
+            quantised = self.quantised(dtype, record_codes, na_policy)
+            report[dtype] = Map(quantised.error(reference), nbytes=quantised.nbytes,
+                                compression=reference.nbytes / max(quantised.nbytes, 1))
+        return report
+
+    def pair_features(self, aa_i, aa_j, record_codes: Optional[List[str]] = None,
+                      na_policy: str = "nan"):
+        """Return the score of every requested matrix for many amino acid pairs at once.
+
+        Gathers from a cached (400, n_matrices) table laid out pair-major, so
+        all matrix scores for a pair are read from one contiguous row in a
+        single vectorised call, instead of one get() call per matrix per pair.
+
+        Args:
+            aa_i: Amino acid sequence string or integer code array (from
+                  encode()) for the first residue of each pair.
+            aa_j: Sequence string or integer code array of the same length for
+                  the second residue of each pair.
+            record_codes: Accession numbers of the matrices to use, in the
+                          desired column order. Defaults to all records,
+                          ordered as record_codes().
+            na_policy: How NA values are replaced, see to_array(). Defaults to NaN.
+
+        Returns:
+            float64 numpy array of shape (n_pairs, n_matrices).
+
+        Raises:
+            ValueError: If aa_i and aa_j differ in length, a record code is not
+                        found or na_policy is invalid.
+            IndexError: If a code is outside the range of the 20 amino acids.
+        """
+        np = _require_numpy()
+        pair_table = self._stacked(record_codes, na_policy)[1]
+        n_aa = len(AMINO_ACIDS)
+        aa_i = np.asarray(encode(aa_i) if isinstance(aa_i, str) else aa_i, dtype=np.intp)
+        aa_j = np.asarray(encode(aa_j) if isinstance(aa_j, str) else aa_j, dtype=np.intp)
+        if aa_i.shape != aa_j.shape:
+            raise ValueError(f"aa_i and aa_j must have the same shape, got {aa_i.shape} and {aa_j.shape}.")
+        if aa_i.size and (min(aa_i.min(), aa_j.min()) < 0 or max(aa_i.max(), aa_j.max()) >= n_aa):
+            raise IndexError(f"Amino acid codes must be in the range 0-{n_aa - 1}.")
+        return pair_table[aa_i * n_aa + aa_j]
+
+    def to_arrow(self, table: str = "matrices", form: str = "long",
+                 record_codes: Optional[List[str]] = None, na_policy: str = "nan"):
+        """Export the database as an Apache Arrow table.
+
+        The ``matrices`` table holds the stacked to_tensor() matrices: in
+        ``long`` form one row per (record_code, aa1, aa2) triple with a
+        ``value`` column, in ``wide`` form one row per (record_code, aa1) with a
+        column per aa2. Label columns are dictionary encoded, so the table can
+        be handed to pandas, polars, DuckDB or Spark directly. In long form, a
+        value column without nulls wraps the numpy buffer without copying. The ``metadata`` table
+        holds one row per record with its description, references, pmid,
+        notes, symmetric flag, row/col orders and correlation coefficients.
+
+        Args:
+            table: Which table to export, "matrices" or "metadata".
+            form: Layout of the matrices table, "long" or "wide".
+            record_codes: Accession numbers to export, in the desired order.
+                          Defaults to all records, ordered as record_codes().
+            na_policy: How NA values are replaced, see to_array(). Under the
+                       default "nan" policy they are exported as nulls.
+
+        Returns:
+            pyarrow.Table.
+
+        Raises:
+            ImportError: If pyarrow is not installed.
+            ValueError: If table, form or na_policy is invalid, or a record code
+                        is not found in the database.
+        """
+        np = _require_numpy()
+        if record_codes is None:
+            record_codes = self.record_codes()
+        elif isinstance(record_codes, str):
+            record_codes = [record_codes]
+        codes = [self._normalise_code(code) for code in record_codes]
+        if table == "matrices":
+            tensor = self.to_tensor(codes, na_policy)
+            mask = np.isnan(tensor) if na_policy == "nan" else None
+            return _dense_to_arrow(tensor, [codes, list(AMINO_ACIDS), list(AMINO_ACIDS)],
+                                   ["record_code", "aa1", "aa2"], form, mask=mask)
+        if table == "metadata":
+            return _metadata_to_arrow(self.aaindex_json, codes,
+                                      ["description", "references", "pmid", "notes",
+                                       "symmetric", "row_order", "col_order"])
+        raise ValueError(f"table must be one of ['matrices', 'metadata'], got {table!r}.")
+
+    def to_parquet(self, path: str, table: str = "matrices", form: str = "long",
+                   record_codes: Optional[List[str]] = None, na_policy: str = "nan", **kwargs) -> None:
+        """Write a table exported by to_arrow() to a Parquet file.
+
+        Args:
+            path: Output Parquet filepath.
+            table: Which table to export, "matrices" or "metadata".
+            form: Layout of the matrices table, "long" or "wide".
+            record_codes: Accession numbers to export, defaults to all records.
+            na_policy: How NA values are replaced, see to_arrow().
+            **kwargs: Passed through to ``pyarrow.parquet.write_table``.
+
+        Raises:
+            ImportError: If pyarrow is not installed.
+            ValueError: If table, form or na_policy is invalid, or a record code
+                        is not found in the database.
+        """
+        _write_parquet(self.to_arrow(table, form, record_codes, na_policy), path, **kwargs)
+
+    @staticmethod
+    def read_parquet(path: str, columns: Optional[List[str]] = None):
+        """Read a Parquet file written by to_parquet() into an Arrow table.
+
+        The file is memory-mapped, so numeric columns are not copied into memory
+        until accessed.
+
+        Args:
+            path: Parquet filepath.
+            columns: Optional subset of columns to read.
+
+        Returns:
+            pyarrow.Table.
+
+        Raises:
+            ImportError: If pyarrow is not installed.
+        """
+        return _read_parquet(path, columns)
+
+    def _stacked(self, record_codes: Optional[List[str]] = None, na_policy: str = "nan"):
+        """Return the cached (tensor, pair_table) pair for the given record codes and NA policy."""
+        if record_codes is None:
+            record_codes = self.record_codes()
+        elif isinstance(record_codes, str):
+            record_codes = [record_codes]
+        key = (tuple(record_codes), na_policy)
+        if key not in self._tensor_cache:
+            np = _require_numpy()
+            n_aa = len(AMINO_ACIDS)
+            if record_codes:
+                tensor = np.stack([self.to_array(code, na_policy) for code in record_codes])
+            else:
+                _check_na_policy(na_policy)
+                tensor = np.empty((0, n_aa, n_aa))
+            pair_table = np.ascontiguousarray(tensor.reshape(len(record_codes), n_aa * n_aa).T)
+            tensor.flags.writeable = False
+            pair_table.flags.writeable = False
+            self._tensor_cache[key] = (tensor, pair_table)
+        return self._tensor_cache[key]
 
     def values(self, record_code: str) -> Dict:
         """Return the full 20x20 matrix dict for a given record.
@@ -301,7 +1076,7 @@ class _AAIndexMatrix:
         for desc in description:
             for index, value in self.aaindex_json.items():
                 if desc.lower() in value["description"].lower():
-                    all_indices[index] = value
+                    all_indices[index] = self._records[index] if self._frozen else self._expand_record(index, value)
         return all_indices
 
     def amino_acids(self) -> List[str]:
@@ -347,23 +1122,65 @@ class _AAIndexMatrix:
                          leading/trailing whitespace is stripped).
 
         Returns:
-            Record data as a Map, accessible via dict or dot notation.
+            Record data as a Map, accessible via dict or dot notation. If the
+            database is frozen, a shared, immutable FrozenMap.
 
         Raises:
             TypeError: If record_code is not a string.
             ValueError: If record_code is not found in the database.
         """
+        code = self._normalise_code(record_code)
+        if self._frozen:
+            return self._records[code]
+        return Map(self._expand_record(code, self._lookup(code)))
+
+    def _lookup(self, record_code: str) -> Dict:
+        """Return the stored record of an accession number.
+
+        Until the database is loaded, the record is read alone from its byte
+        offset in the raw file and parsed, rather than loading every record,
+        and kept in an LRU cache of the record_cache_size most recent records.
+        """
+        code = self._normalise_code(record_code)
+        if self._aaindex_json is not None:
+            return self._aaindex_json[code]
+        with self._load_lock:
+            record = self._record_cache.pop(code, None)
+            if record is None:
+                raw_path = os.path.join(self.aaindex_module_path, self.data_dir, self.aaindex_filename)
+                record = self._parse_lines(_read_record(raw_path, *self._offsets[code])).get(code)
+                if record is None:
+                    #the index no longer matches the raw file, fall back to loading the database
+                    return self.aaindex_json[code]
+            self._record_cache[code] = record
+            while len(self._record_cache) > self.record_cache_size:
+                self._record_cache.popitem(last=False)
+        return record
+
+    def _known_codes(self):
+        """Return the accession numbers of the loaded database, or of the raw file's offset index if not loaded."""
+        if self._aaindex_json is None and self._offsets is None:
+            with self._load_lock:
+                if self._aaindex_json is None and self._offsets is None:
+                    raw_path = os.path.join(self.aaindex_module_path, self.data_dir, self.aaindex_filename)
+                    self._offsets = _record_offsets(raw_path)
+        if self._aaindex_json is None and self._offsets is not None:
+            return self._offsets
+        return self.aaindex_json
+
+    def _normalise_code(self, record_code: str) -> str:
+        """Return the stripped, uppercased record code, validating it exists in the database."""
         try:
             record_code = record_code.strip().upper()
         except AttributeError:
             raise TypeError(
                 f"record_code must be a string, got {type(record_code)}."
             )
-        if record_code not in self.aaindex_json:
+        if record_code not in self._known_codes():
             raise ValueError(
                 f"Record ({record_code}) not found in {self.__class__.__name__}."
             )
-        return Map(self.aaindex_json[record_code])
+        return record_code
 
     def __len__(self) -> int:
         """Return total number of records in the database."""
@@ -393,13 +1210,47 @@ class _AAIndexMatrix:
 
 ######################          Getters & Setters          ######################
 
+    @property
+    def aaindex_json(self) -> Dict:
+        if self._aaindex_json is None:
+            with self._load_lock:
+                if self._aaindex_json is None:
+                    self._aaindex_json = self._load()
+        return self._aaindex_json
+
+    @aaindex_json.setter
+    def aaindex_json(self, value: Dict) -> None:
+        self._check_writable("aaindex_json")
+        self._aaindex_json = value
+        self._custom_json = value is not None
+        self._matrix_cache.clear()
+        self._content_hash = None
+
+    @property
+    def content_hash(self) -> str:
+        """SHA-256 hex digest of the raw release file the records were parsed from.
+
+        For records assigned to aaindex_json in memory, the digest of their
+        canonical JSON serialisation instead.
+        """
+        if self._content_hash is None:
+            with self._load_lock:
+                if self._content_hash is None:
+                    raw_path = os.path.join(self.aaindex_module_path, self.data_dir, self.aaindex_filename)
+                    self._content_hash = _database_hash(raw_path, self.aaindex_json, self._custom_json)
+        return self._content_hash
+
     @property
     def data_dir(self) -> str:
         return self._data_dir
 
     @data_dir.setter
     def data_dir(self, value: str) -> None:
+        self._check_writable("data_dir")
         self._data_dir = value
+        self._offsets = None
+        self._record_cache.clear()
+        self._matrix_cache.clear()
 
     @property
     def aaindex_filename(self) -> str:
@@ -407,7 +1258,11 @@ class _AAIndexMatrix:
 
     @aaindex_filename.setter
     def aaindex_filename(self, value: str) -> None:
+        self._check_writable("aaindex_filename")
         self._aaindex_filename = value
+        self._offsets = None
+        self._record_cache.clear()
+        self._matrix_cache.clear()
 
     @property
     def last_updated(self) -> str:
@@ -415,4 +1270,5 @@ class _AAIndexMatrix:
 
     @last_updated.setter
     def last_updated(self, value: str) -> None:
+        self._check_writable("last_updated")
         self._last_updated = value
@@ -0,0 +1,138 @@
+################################################################################
+################          Apache Arrow / Parquet Export        #################
+################################################################################
+
+#importing required modules and dependencies
+from typing import Dict, List, Optional, Sequence
+
+from .encoding import _require_numpy
+
+__all__: List[str] = []
+
+
+def _require_pyarrow():
+    """Import and return pyarrow, raising an informative error if it is unavailable.
+
+    Returns:
+        The pyarrow module.
+
+    Raises:
+        ImportError: If pyarrow is not installed.
+    """
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise ImportError(
+            "pyarrow is required for Arrow and Parquet export, "
+            "install it with: pip install aaindex[arrow]."
+        ) from e
+    return pyarrow
+
+
+def _dictionary_column(labels: Sequence[str], indices):
+    """Return a dictionary-encoded string column of labels selected by indices."""
+    pa = _require_pyarrow()
+    np = _require_numpy()
+    return pa.DictionaryArray.from_arrays(
+        pa.array(indices.astype(np.int32, copy=False)), pa.array(list(labels), pa.string())
+    )
+
+
+def _dense_to_arrow(array, labels: List[Sequence[str]], names: List[str], form: str = "long",
+                    value_name: str = "value", mask=None):
+    """Convert a dense numeric array into an Arrow table.
+
+    In ``long`` form the table has one row per array element: a dictionary
+    encoded label column per axis followed by the value column. In ``wide``
+    form the last axis is spread into one value column per label and the table
+    has one row per combination of the remaining axes. Masked elements become
+    nulls via a validity bitmap. Only the long form value column without a
+    mask wraps the numpy buffer without copying; wide form columns are taken
+    from a transposed copy, and masked columns are copied by pyarrow.
+
+    Args:
+        array: Numeric numpy array.
+        labels: Labels along each axis of array.
+        names: Column name for the labels of each axis.
+        form: Table layout, "long" or "wide".
+        value_name: Name of the value column in long form.
+        mask: Optional bool array of array's shape, True where values are null.
+
+    Returns:
+        pyarrow.Table.
+
+    Raises:
+        ValueError: If form is invalid.
+    """
+    pa = _require_pyarrow()
+    np = _require_numpy()
+    if form not in ("long", "wide"):
+        raise ValueError(f"form must be one of ['long', 'wide'], got {form!r}.")
+
+    if form == "long":
+        values = np.ascontiguousarray(array).ravel()
+        mask = None if mask is None or not mask.any() else np.ascontiguousarray(mask).ravel()
+        columns: Dict = {}
+        for axis, (axis_labels, name) in enumerate(zip(labels, names)):
+            stride = int(np.prod(array.shape[axis + 1:], dtype=np.int64))
+            indices = (np.arange(values.size) // stride) % array.shape[axis]
+            columns[name] = _dictionary_column(axis_labels, indices)
+        columns[value_name] = pa.array(values, mask=mask)
+        return pa.table(columns)
+
+    #wide: move the last axis first so each output column is one contiguous row
+    n_rows = int(np.prod(array.shape[:-1], dtype=np.int64))
+    values = np.ascontiguousarray(np.moveaxis(array, -1, 0)).reshape(array.shape[-1], n_rows)
+    if mask is not None and mask.any():
+        mask = np.ascontiguousarray(np.moveaxis(mask, -1, 0)).reshape(array.shape[-1], n_rows)
+    else:
+        mask = None
+    columns = {}
+    for axis, (axis_labels, name) in enumerate(zip(labels[:-1], names[:-1])):
+        stride = int(np.prod(array.shape[axis + 1:-1], dtype=np.int64))
+        indices = (np.arange(n_rows) // stride) % array.shape[axis]
+        columns[name] = _dictionary_column(axis_labels, indices)
+    for col, label in enumerate(labels[-1]):
+        columns[label] = pa.array(values[col], mask=None if mask is None else mask[col])
+    return pa.table(columns)
+
+
+def _metadata_to_arrow(aaindex_json: Dict, record_codes: List[str], fields: List[str]):
+    """Convert the metadata fields of a parsed database into an Arrow table.
+
+    Args:
+        aaindex_json: Parsed database keyed by accession number.
+        record_codes: Accession numbers of the rows, in the desired order.
+        fields: Scalar record fields to include as columns.
+
+    Returns:
+        pyarrow.Table with a record_code column, one column per field and a
+        correlation_coefficients map<string, double> column.
+    """
+    pa = _require_pyarrow()
+    columns: Dict = {"record_code": pa.array(record_codes, pa.string())}
+    for field in fields:
+        columns[field] = pa.array([aaindex_json[code][field] for code in record_codes])
+    columns["correlation_coefficients"] = pa.array(
+        [
+            [(other, float(coefficient))
+             for other, coefficient in aaindex_json[code]["correlation_coefficients"].items()]
+            for code in record_codes
+        ],
+        pa.map_(pa.string(), pa.float64()),
+    )
+    return pa.table(columns)
+
+
+def _write_parquet(table, path: str, **kwargs) -> None:
+    """Write an Arrow table to a Parquet file."""
+    _require_pyarrow()
+    import pyarrow.parquet as pq
+    pq.write_table(table, path, **kwargs)
+
+
+def _read_parquet(path: str, columns: Optional[List[str]] = None):
+    """Read a Parquet file into an Arrow table, memory-mapping the file."""
+    _require_pyarrow()
+    import pyarrow.parquet as pq
+    return pq.read_table(path, columns=columns, memory_map=True)
@@ -9,9 +9,16 @@ import sys
 import copy
 import re
 import csv
-from typing import Dict, Iterator, List, Union
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterator, List, Optional, Union
 
-from ._aaindex_matrix import Map
+from ._aaindex_matrix import (Map, _database_hash, _diff_records, _freeze, _pack_blob, _read_record,
+                              _read_release, _record_offsets, _release_date, _unpack_blob)
+from ._arrow import _dense_to_arrow, _metadata_to_arrow, _read_parquet, _write_parquet
+from .encoding import (ALPHABET, AMINO_ACIDS, GAP_CODE, MAX_KMER, MAX_TABLE_BYTES, _check_na_policy, _require_numpy, encode,
+                       encode_kmers)
+from .quantisation import QUANTISED_DTYPES, QuantisedArray, quantise
 
 __all__: List[str] = ['AAIndex1', 'aaindex1']
 
@@ -28,41 +35,162 @@ class AAIndex1():
         aaindex_module_path: Absolute path to the aaindex package directory.
         data_dir: Subdirectory name containing raw and cached data files.
         aaindex_filename: Base filename for this database (no extension).
-        aaindex_json: Parsed database keyed by accession number.
-        categories: Dict mapping each record code to its category.
+        aaindex_json: Parsed database keyed by accession number, loaded from
+            disk on first access.
+        categories: Dict mapping each record code to its category, loaded from
+            disk on first access.
+        record_cache_size: Number of records parsed alone from the raw file
+            kept in an LRU cache while the database is not loaded.
         last_updated: Date string of the last published database update.
+        content_hash: SHA-256 hex digest of the release the records were
+            parsed from.
     """
     def __init__(self) -> None:
+        #set by freeze(), after which the instance and its records are immutable
+        self._frozen = False
+
+        #byte offsets of the records in the raw file, and an LRU of records parsed from them,
+        #used to serve single record lookups without loading the whole database
+        self.record_cache_size = 128
+        self._offsets: Optional[Dict[str, List[int]]] = None
+        self._record_cache: OrderedDict = OrderedDict()
+
         #resolve the package directory for data file lookups
         self.aaindex_module_path = os.path.dirname(os.path.abspath(sys.modules[self.__module__].__file__))
         self.data_dir = "data"
         self.aaindex_filename = "aaindex1"
 
-        #get dict of categories
-        self.categories = self.get_all_categories()
+        #categories and database are loaded lazily on first access, keeping import cheap;
+        #the lock ensures concurrent first accesses from several threads load them only once
+        self._categories: Optional[Dict] = None
+        self._aaindex_json: Optional[Dict] = None
+        self._load_lock = threading.RLock()
+
+        #True if aaindex_json/categories were assigned in memory rather than loaded from
+        #disk, in which case pickles must carry them instead of a reference to the files
+        self._custom_json = False
+        self._custom_categories = False
+
+        #date as shown on https://www.genome.jp/aaindex/
+        self.last_updated = "February 13, 2017"
+
+        #SHA-256 of the release the records were parsed from, computed on first access or set by refresh()
+        self._content_hash: Optional[str] = None
+
+        #dense value arrays and their normalised variants and lookup tables, keyed by
+        #the records, NA policy and variant requested, built by to_array()/normalised()
+        self._array_cache: Dict = {}
+
+        #reduced precision copies of the value arrays keyed by (dtype, records, normalisation,
+        #NA policy), built by quantised()
+        self._quantised_cache: Dict = {}
 
-        #load from cached JSON if available, otherwise parse the raw file
+        #amino acid list, computed once on first call to amino_acids()
+        self._amino_acids_cache: Optional[List[str]] = None
+
+    def _load(self) -> Dict:
+        """Load the database from the cached JSON if available, otherwise parse the raw file."""
         json_path = os.path.join(self.aaindex_module_path, self.data_dir, f"{self.aaindex_filename}.json")
         if os.path.isfile(json_path):
             with open(json_path) as aai_json:
-                self.aaindex_json = json.load(aai_json)
-        else:
-            self.aaindex_json = self.parse_aaindex()
+                return json.load(aai_json)
+        return self.parse_aaindex()
 
-        #date as shown on https://www.genome.jp/aaindex/
-        self.last_updated = "February 13, 2017"
+    def warm(self, arrays: bool = False) -> None:
+        """Load the database and categories now rather than on first access.
 
-        #cache amino acid list once at init to avoid re-sorting on every call
-        self._amino_acids_cache: List[str] = sorted(
-            self.aaindex_json[next(iter(self.aaindex_json))]["values"].keys()
-        )
+        Useful to move the blocking file I/O and JSON parsing out of latency
+        sensitive code paths, e.g. at service start up or in a worker thread.
+
+        Args:
+            arrays: Also build the dense value array used by the array based
+                    APIs, requires numpy.
+        """
+        #the database and categories properties load them on first access
+        _ = self.aaindex_json, self.categories
+        self.amino_acids()
+        if arrays:
+            self.to_array()
+
+    def freeze(self, arrays: bool = False) -> None:
+        """Load the database and make this instance immutable and thread-safe to share.
+
+        The parsed records and categories are replaced by deeply immutable
+        copies, so __getitem__(), search() and get_record_by_category() return
+        shared FrozenMap records without building or writing to any object.
+        Afterwards the property setters raise an AttributeError. Freezing is
+        irreversible and idempotent.
+
+        Args:
+            arrays: Also build the dense value array used by the array based
+                    APIs, requires numpy.
+        """
+        self.warm(arrays=arrays)
+        with self._load_lock:
+            if self._frozen:
+                return
+            self._aaindex_json = _freeze(self._aaindex_json)
+            self._categories = _freeze(self._categories)
+            self._frozen = True
+
+    @property
+    def frozen(self) -> bool:
+        """True if freeze() has been called on this instance."""
+        return self._frozen
+
+    def __getstate__(self) -> Dict:
+        """Return a compact pickle state for the instance.
+
+        The parsed records are not pickled: the state references the database
+        files by data_dir and aaindex_filename, and the unpickled instance
+        loads them lazily from the aaindex package installed in the receiving
+        process, making it cheap to send to multiprocessing, Spark or Dask
+        workers. Only if aaindex_json or categories were assigned in memory
+        are they included, each as a single compressed blob. Caches are not
+        pickled.
+        """
+        state = {
+            "aaindex_filename": self.aaindex_filename,
+            "data_dir": self.data_dir,
+            "last_updated": self.last_updated,
+            "frozen": self._frozen,
+        }
+        if self._custom_json:
+            state["aaindex_json"] = _pack_blob(self._aaindex_json)
+            state["content_hash"] = self._content_hash
+        if self._custom_categories:
+            state["categories"] = _pack_blob(self._categories)
+        return state
+
+    def __setstate__(self, state: Dict) -> None:
+        """Restore an instance from the state returned by __getstate__().
+
+        Frozen instances are loaded and frozen again immediately.
+        """
+        AAIndex1.__init__(self)
+        self.aaindex_filename = state["aaindex_filename"]
+        self.data_dir = state["data_dir"]
+        self.last_updated = state["last_updated"]
+        if "aaindex_json" in state:
+            self.aaindex_json = _unpack_blob(state["aaindex_json"])
+            self._content_hash = state["content_hash"]
+        if "categories" in state:
+            self.categories = _unpack_blob(state["categories"])
+        if state["frozen"]:
+            self.freeze()
+
+    def _check_writable(self, name: str) -> None:
+        """Raise an AttributeError if the instance is frozen."""
+        if self._frozen:
+            raise AttributeError(f"can't set {name!r}, {self.__class__.__name__} instance is frozen.")
 
     def parse_aaindex(self) -> Dict:
         """Parse the raw AAindex1 database file into a nested dict and cache as JSON.
 
         Each record is keyed by its accession number and stores metadata, amino
-        acid values, and category. The result is written to a .json file in the
-        data directory for fast subsequent loads.
+        acid values, and category. NA values are stored as 0 in the values dict,
+        with the affected amino acids listed under ``na_values``. The result is
+        written to a .json file in the data directory for fast subsequent loads.
 
         Returns:
             Parsed database keyed by accession number.
@@ -71,12 +199,6 @@ class AAIndex1():
             IOError: If the raw database file cannot be opened.
             ValueError: If a duplicate accession number is encountered.
         """
-        #initialise keys of AAi database
-        template_dict = {
-            "H": [], "D": [], "R": [], "A": [],
-            "*": [], "T": [], "J": [], "C": [], "I": [],
-        }
-
         #open AAi file for reading and parsing
         tmp_filepath = os.path.join(self.aaindex_module_path, self.data_dir, self.aaindex_filename)
         try:
@@ -85,6 +207,25 @@ class AAIndex1():
         except OSError as e:
             raise OSError(f"Error opening AAindex1 file, check file is in filepath: {tmp_filepath}.") from e
 
+        aaindex_json = self._parse_lines(lines)
+
+        #cache parsed database as JSON for fast subsequent loads
+        json_out_path = os.path.join(
+            self.aaindex_module_path, self.data_dir, f"{self.aaindex_filename}.json"
+        )
+        with open(json_out_path, 'w') as output_f:
+            json.dump(aaindex_json, output_f, indent=4, sort_keys=True)
+
+        return aaindex_json
+
+    def _parse_lines(self, lines: List[str]) -> Dict:
+        """Parse the lines of a raw AAindex1 release into records keyed by accession number."""
+        #initialise keys of AAi database
+        template_dict = {
+            "H": [], "D": [], "R": [], "A": [],
+            "*": [], "T": [], "J": [], "C": [], "I": [],
+        }
+
         #regex to normalise double-quote characters in field values
         clean_up_pattern = re.compile("\"")
 
@@ -163,23 +304,116 @@ class AAIndex1():
 
             current_dict[current_entry].append(line[1:].strip())
 
-        #post-process: set NA values to 0, add category and '-' gap placeholder
+        #post-process: set NA values to 0 (recording which were NA), add category and '-' gap placeholder
         for index in aaindex_json:
+            aaindex_json[index]['na_values'] = []
             for val in aaindex_json[index]['values']:
                 if aaindex_json[index]['values'][val] == 'NA':
                     aaindex_json[index]['values'][val] = 0
-            aaindex_json[index]['category'] = self.categories[index]
+                    aaindex_json[index]['na_values'].append(val)
+            aaindex_json[index]['category'] = self.categories.get(index, '')
             aaindex_json[index]['values']['-'] = 0
 
-        #cache parsed database as JSON for fast subsequent loads
-        json_out_path = os.path.join(
-            self.aaindex_module_path, self.data_dir, f"{self.aaindex_filename}.json"
-        )
-        with open(json_out_path, 'w') as output_f:
-            json.dump(aaindex_json, output_f, indent=4, sort_keys=True)
-
         return aaindex_json
 
+    def refresh(self, path: str, release_date: Optional[str] = None) -> Map:
+        """Update the database in place from a newer AAindex1 release file.
+
+        The release file, in the raw flat file format published on
+        https://www.genome.jp/aaindex/, is parsed and diffed against the
+        loaded records. Cached arrays holding changed records are patched,
+        recomputing only the rows (or lookup table columns) of those records;
+        caches over unaffected records are kept as they are, while those over
+        a removed record, or over all records when records were added or
+        removed, are dropped and rebuilt on next access. The packaged data
+        files are not modified. last_updated is set to the release date and
+        content_hash to the SHA-256 of the release file, so a pinned snapshot
+        can be audited against the file it was built from. Records new to the
+        release have an empty category unless listed in categories.
+
+        Args:
+            path: Path to the new AAindex1 release file.
+            release_date: Date of the release, e.g. "February 13, 2017".
+                          Defaults to the modification date of the file.
+
+        Returns:
+            Map with the sorted accession numbers of the ``added``,
+            ``removed`` and ``changed`` records, and the ``release_date`` and
+            ``content_hash`` recorded.
+
+        Raises:
+            AttributeError: If the instance is frozen.
+            OSError: If the release file cannot be opened.
+            ValueError: If a duplicate accession number is encountered.
+        """
+        self._check_writable("aaindex_json")
+        text, content_hash = _read_release(path)
+        records = self._parse_lines(text.splitlines(keepends=True))
+        with self._load_lock:
+            old_codes = self.record_codes()
+            diff = _diff_records(self.aaindex_json, records)
+            self.aaindex_json = records
+            self.last_updated = release_date or _release_date(path)
+            self._content_hash = content_hash
+            self._amino_acids_cache = None
+            self._refresh_arrays(old_codes, diff)
+        return Map(diff, release_date=self.last_updated, content_hash=content_hash)
+
+    def _refresh_arrays(self, old_codes: List[str], diff: Dict[str, List[str]]) -> None:
+        """Carry the cached arrays over a refresh(), patching the rows or columns of changed records."""
+        changed, removed = set(diff["changed"]), set(diff["removed"])
+        resized = bool(diff["added"] or diff["removed"])
+        self._quantised_cache = {key: quantised for key, quantised in self._quantised_cache.items()
+                                 if key[1] is not None
+                                 and (changed | removed).isdisjoint(code.strip().upper() for code in key[1])
+                                 or key[1] is None and not (resized or changed)}
+
+        #record codes of each cache entry sit at a fixed position of its key, see to_array(),
+        #normalised(), _value_table() and kmer_table()
+        positions = {"normalised": 2, "table": 1, "kmer": 2}
+        cache, self._array_cache = self._array_cache, {}
+        kept, stale = {}, []
+        for key, array in cache.items():
+            kind = key[0] if isinstance(key[0], str) else "values"
+            record_codes = key[positions.get(kind, 0)]
+            if record_codes is None:
+                if resized:
+                    continue
+                record_codes = old_codes
+            codes = [code.strip().upper() for code in record_codes]
+            if removed.intersection(codes):
+                continue
+            if changed.isdisjoint(codes):
+                kept[key] = array
+            else:
+                stale.append((key, kind, codes))
+
+        #rebuild the entries of the changed records alone, then copy them into the cached arrays
+        self._array_cache = dict(kept)
+        for key, kind, codes in stale:
+            rows = [i for i, code in enumerate(codes) if code in changed]
+            subset = [codes[i] for i in rows]
+            try:
+                if kind == "values":
+                    fresh = self.to_array(subset, key[1])
+                elif kind == "normalised":
+                    fresh = self.normalised(key[1], subset, key[3])
+                elif kind == "table":
+                    fresh = self._value_table(subset, key[2], key[3])
+                else:
+                    fresh = self.kmer_table(key[1], subset, key[3], key[4], key[5])
+            except ValueError:
+                #NA values now present under the "raise" policy, raised again on next access
+                continue
+            array = cache[key].copy()
+            if kind in ("table", "kmer"):
+                array[:, rows] = fresh
+            else:
+                array[rows] = fresh
+            array.flags.writeable = False
+            kept[key] = array
+        self._array_cache = kept
+
     def parse_categories(self, aaindex_category_file: str = 'aaindex_to_category.txt') -> Dict:
         """Parse category file mapping each AAi record to one of 8 categories.
 
@@ -308,7 +542,11 @@ class AAIndex1():
         Returns:
             Sorted list of amino acid codes including ``-``.
         """
-        #return pre-computed cache from __init__
+        #compute once and cache to avoid re-sorting on every call
+        if self._amino_acids_cache is None:
+            self._amino_acids_cache = sorted(
+                self.aaindex_json[next(iter(self.aaindex_json))]["values"].keys()
+            )
         return self._amino_acids_cache
 
     def record_codes(self) -> List[str]:
@@ -354,6 +592,617 @@ class AAIndex1():
         """
         return self[record_code]['values']
 
+    def to_array(self, record_codes: Optional[List[str]] = None, na_policy: str = "zero"):
+        """Return the amino acid values of many records as a dense 2D numpy array.
+
+        Row i holds the values of record_codes[i]; columns follow
+        :data:`aaindex.encoding.ALPHABET` (the 20 canonical amino acids in
+        AAindex order followed by the ``-`` gap, which is always 0), so the
+        codes returned by :func:`aaindex.encode` index the columns directly.
+        NA values in the source data are replaced according to na_policy and
+        their positions are given by na_mask(). Arrays are built once per set
+        of records and policy, cached and returned read-only.
+
+        Args:
+            record_codes: Accession numbers of the rows, in the desired order.
+                          Defaults to all records, ordered as record_codes().
+            na_policy: How NA values are replaced, one of "zero" (default,
+                       matching values()), "nan", "mean" (mean of the index
+                       over the amino acids with values) or "raise" (raise a
+                       ValueError if any are present).
+
+        Returns:
+            Read-only float64 numpy array of shape (n_records, 21).
+
+        Raises:
+            ValueError: If a record code is not found in the database, na_policy
+                        is invalid, or na_policy is "raise" and NA values are present.
+        """
+        key = (self._cache_codes(record_codes), na_policy)
+        array = self._array_cache.get(key)
+        if array is not None:
+            return array
+
+        np = _require_numpy()
+        _check_na_policy(na_policy, ("zero", "nan", "mean", "raise"))
+        codes = self._resolve_codes(record_codes)
+        array = np.empty((len(codes), len(ALPHABET)))
+        for row, code in enumerate(codes):
+            record = self.aaindex_json[code]
+            array[row] = [record["values"].get(aa, 0) for aa in ALPHABET]
+        mask = self._na_mask(codes)
+
+        if na_policy == "raise" and mask.any():
+            na_codes = [codes[row] for row in np.flatnonzero(mask.any(axis=1))]
+            raise ValueError(f"NA values found in record(s): {na_codes}.")
+        if na_policy == "nan":
+            array[mask] = np.nan
+        elif na_policy == "mean":
+            counts = (~mask[:, :len(AMINO_ACIDS)]).sum(axis=1)
+            sums = array[:, :len(AMINO_ACIDS)].sum(axis=1)
+            means = np.divide(sums, counts, out=np.zeros(len(codes)), where=counts > 0)
+            array = np.where(mask, means[:, np.newaxis], array)
+
+        array.flags.writeable = False
+        self._array_cache[key] = array
+        return array
+
+    def na_mask(self, record_codes: Optional[List[str]] = None):
+        """Return a boolean mask of the NA values in the dense value array.
+
+        Args:
+            record_codes: Accession numbers of the rows, in the desired order.
+                          Defaults to all records, ordered as record_codes().
+
+        Returns:
+            bool numpy array of shape (n_records, 21), True where the record
+            has no value for the amino acid, in the same layout as to_array().
+
+        Raises:
+            ValueError: If a record code is not found in the database.
+        """
+        return self._na_mask(self._resolve_codes(record_codes))
+
+    def normalised(self, method: str = "zscore", record_codes: Optional[List[str]] = None,
+                   na_policy: str = "zero"):
+        """Return a normalised variant of the dense value array.
+
+        Each index is scaled across the 20 amino acids independently:
+
+        * ``zscore`` - subtract the mean and divide by the (population) standard deviation.
+        * ``minmax`` - scale linearly onto [0, 1].
+        * ``rank`` - replace each value by its rank, ties sharing their average
+          rank, scaled onto [0, 1].
+
+        NA values are first replaced according to na_policy; under the "nan"
+        policy they are excluded from the statistics and remain NaN. Indices with
+        no spread normalise to 0, and the ``-`` gap column is always 0. Variants
+        are computed once per set of records, method and policy, cached and
+        returned read-only.
+
+        Args:
+            method: Normalisation method, one of "zscore", "minmax" or "rank".
+            record_codes: Accession numbers of the rows, in the desired order.
+                          Defaults to all records, ordered as record_codes().
+            na_policy: How NA values are replaced before normalising, see to_array().
+
+        Returns:
+            Read-only float64 numpy array of shape (n_records, 21).
+
+        Raises:
+            ValueError: If method or na_policy is invalid, or a record code is
+                        not found in the database.
+        """
+        key = ("normalised", method, self._cache_codes(record_codes), na_policy)
+        array = self._array_cache.get(key)
+        if array is not None:
+            return array
+
+        np = _require_numpy()
+        if method not in ("zscore", "minmax", "rank"):
+            raise ValueError(f"method must be one of ['zscore', 'minmax', 'rank'], got {method!r}.")
+        values = self.to_array(record_codes, na_policy)[:, :len(AMINO_ACIDS)]
+        valid = ~np.isnan(values)
+        n_valid = valid.sum(axis=1, keepdims=True)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            if method == "zscore":
+                mean = np.where(valid, values, 0).sum(axis=1, keepdims=True) / np.maximum(n_valid, 1)
+                centred = values - mean
+                std = np.sqrt(np.where(valid, centred ** 2, 0).sum(axis=1, keepdims=True) / np.maximum(n_valid, 1))
+                scaled = np.where(std > 0, centred / std, 0)
+            elif method == "minmax":
+                low = np.where(valid, values, np.inf).min(axis=1, keepdims=True)
+                high = np.where(valid, values, -np.inf).max(axis=1, keepdims=True)
+                spread = high - low
+                scaled = np.where(spread > 0, (values - low) / spread, 0)
+            else:
+                #average rank of ties: 1 + number of smaller values + (number of other equal values) / 2
+                smaller = (values[:, :, np.newaxis] > values[:, np.newaxis, :]).sum(axis=2)
+                equal = (values[:, :, np.newaxis] == values[:, np.newaxis, :]).sum(axis=2)
+                rank = smaller + (equal - 1) / 2
+                scaled = np.where(n_valid > 1, rank / (n_valid - 1), 0)
+
+        array = np.zeros((values.shape[0], len(ALPHABET)))
+        array[:, :len(AMINO_ACIDS)] = np.where(valid, scaled, np.nan)
+        array.flags.writeable = False
+        self._array_cache[key] = array
+        return array
+
+    def quantised(self, dtype: str = "int8", record_codes: Optional[List[str]] = None,
+                  normalisation: Optional[str] = None, na_policy: str = "zero") -> QuantisedArray:
+        """Return the dense value array stored at reduced precision.
+
+        The (n_records, 21) array of to_array(), or of a normalised() variant,
+        is stored as float32, float16 or int8 with a scale and offset per
+        record, see :class:`aaindex.quantisation.QuantisedArray`, taking a half,
+        a quarter or an eighth of the float64 memory. dequantise() restores
+        float values in one vectorised pass, and quantisation_report() gives
+        the error each format introduces. Results are cached.
+
+        Args:
+            dtype: Storage format, one of "float32", "float16" or "int8".
+            record_codes: Accession numbers of the rows, in the desired order.
+                          Defaults to all records, ordered as record_codes().
+            normalisation: Optional normalisation method applied to each index
+                           first, see normalised().
+            na_policy: How NA values are replaced, see to_array().
+
+        Returns:
+            QuantisedArray of shape (n_records, 21).
+
+        Raises:
+            ValueError: If dtype is not a supported storage format, or a record
+                        code, normalisation or na_policy is invalid.
+        """
+        key = (dtype, self._cache_codes(record_codes), normalisation, na_policy)
+        quantised = self._quantised_cache.get(key)
+        if quantised is None:
+            if normalisation is None:
+                array = self.to_array(record_codes, na_policy)
+            else:
+                array = self.normalised(normalisation, record_codes, na_policy)
+            quantised = quantise(array, dtype)
+            self._quantised_cache[key] = quantised
+        return quantised
+
+    def quantisation_report(self, record_codes: Optional[List[str]] = None, normalisation: Optional[str] = None,
+                            na_policy: str = "zero", dtypes: Optional[List[str]] = None) -> Map:
+        """Return the memory use and error of each reduced precision storage format.
+
+        Args:
+            record_codes: Accession numbers of the records to report on.
+                          Defaults to all records, ordered as record_codes().
+            normalisation: Optional normalisation method applied to each index
+                           first, see normalised().
+            na_policy: How NA values are replaced, see to_array().
+            dtypes: Storage formats to report on. Defaults to all of QUANTISED_DTYPES.
+
+        Returns:
+            Map keyed by storage format of Maps with the ``nbytes`` of the
+            stored arrays, their ``compression`` against float64 and, as arrays
+            of shape (n_records,), the ``max_abs_error`` and ``rmse`` of each
+            record's values, see QuantisedArray.error().
+
+        Raises:
+            ValueError: If a dtype is not a supported storage format, or a
+                        record code, normalisation or na_policy is invalid.
+        """
+        if normalisation is None:
+            reference = self.to_array(record_codes, na_policy)
+        else:
+            reference = self.normalised(normalisation, record_codes, na_policy)
+        report = Map()
+        for dtype in (QUANTISED_DTYPES if dtypes is None else dtypes):
+            quantised = self.quantised(dtype, record_codes, normalisation, na_policy)
+            report[dtype] = Map(quantised.error(reference), nbytes=quantised.nbytes,
+                                compression=reference.nbytes / max(quantised.nbytes, 1))
+        return report
+
+    def encode(self, sequence: str):
+        """Encode an amino acid sequence into integer codes indexing the to_array() columns.
+
+        Args:
+            sequence: Amino acid sequence of single-letter codes.
+
+        Returns:
+            1D numpy uint8 array of codes indexing :data:`aaindex.encoding.ALPHABET`.
+
+        Raises:
+            TypeError: If sequence is not a string.
+            ValueError: If sequence contains characters outside the alphabet.
+        """
+        return encode(sequence)
+
+    def encode_values(self, sequences: Union[str, List[str]], record_codes: Optional[List[str]] = None,
+                      normalisation: Optional[str] = None, na_policy: str = "zero",
+                      max_len: Optional[int] = None, ragged: bool = False):
+        """Encode sequences into per-residue arrays of amino acid index values.
+
+        Each residue is replaced by its value for every requested index, read
+        from a cached residue-major copy of to_array() (or of a normalised()
+        variant) in a single gather per call. With ragged=True the batch is
+        not padded: the residues of all sequences are encoded back to back
+        into one (total_residues, n_indices) array, with offsets marking where
+        each sequence starts, which for batches of very different lengths
+        takes a fraction of the padded memory. The ragged layout can be
+        reduced per sequence with :func:`aaindex.encoding.ragged_reduce` or
+        padded with :func:`aaindex.encoding.ragged_to_padded`.
+
+        Args:
+            sequences: A single sequence, or a list of sequences to encode as a batch.
+            record_codes: Accession numbers of the indices, in the desired
+                          feature order. Defaults to all records, ordered as
+                          record_codes().
+            normalisation: Optional normalisation method applied to each index,
+                           one of "zscore", "minmax" or "rank", see normalised().
+            na_policy: How NA values are replaced, see to_array().
+            max_len: Length that batched sequences are padded or truncated to.
+                     Defaults to the length of the longest sequence. Ragged
+                     sequences are only truncated.
+            ragged: Whether to return the ragged (values, offsets) layout.
+
+        Returns:
+            float64 numpy array of shape (L, n_indices) for a single sequence, or
+            (n_sequences, max_len, n_indices) for a batch. Padding positions
+            hold the value of the ``-`` gap, which is 0. If ragged, a tuple of
+            the (total_residues, n_indices) values and the int64 offsets of
+            shape (n_sequences + 1,), sequence i being rows
+            ``offsets[i]:offsets[i + 1]``; a single sequence is a batch of one.
+
+        Raises:
+            TypeError: If sequences is not a string or list of strings.
+            ValueError: If a sequence contains invalid characters, max_len is
+                        negative, or a record code, normalisation or na_policy
+                        is invalid.
+        """
+        np = _require_numpy()
+        if max_len is not None and max_len < 0:
+            raise ValueError(f"max_len must not be negative, got {max_len}.")
+        table = self._value_table(record_codes, normalisation, na_policy)
+        if isinstance(sequences, str) and not ragged:
+            return table[encode(sequences)]
+        if isinstance(sequences, str):
+            sequences = [sequences]
+        if not isinstance(sequences, (list, tuple)):
+            raise TypeError(f"sequences must be a str or list of str, got {type(sequences)}.")
+
+        encoded = [encode(sequence) for sequence in sequences]
+        if ragged:
+            encoded = [seq_codes[:max_len] for seq_codes in encoded]
+            offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+            np.cumsum([len(seq_codes) for seq_codes in encoded], out=offsets[1:])
+            codes = np.concatenate(encoded) if encoded else np.empty(0, dtype=np.uint8)
+            return table[codes], offsets
+        if max_len is None:
+            max_len = max((len(codes) for codes in encoded), default=0)
+        codes = np.full((len(encoded), max_len), GAP_CODE, dtype=np.uint8)
+        for row, seq_codes in enumerate(encoded):
+            seq_codes = seq_codes[:max_len]
+            codes[row, :len(seq_codes)] = seq_codes
+        return table[codes]
+
+    def profile(self, sequence: str, record_codes: Union[str, List[str]], window: Union[int, List[int]] = 9,
+                normalisation: Optional[str] = None, na_policy: str = "zero"):
+        """Return sliding-window property profiles of a sequence, e.g. a hydropathy plot.
+
+        Each position holds the mean index value over the window centred on it
+        (for even windows, the residue just right of the centre). Means are
+        computed from cumulative sums, so the cost is independent of window size.
+
+        Args:
+            sequence: Amino acid sequence.
+            record_codes: Accession number of an index, e.g. KYTJ820101 for the
+                          Kyte-Doolittle hydropathy, or a list of them.
+            window: Window size, or a list of window sizes. Defaults to 9.
+            normalisation: Optional normalisation method applied to each index
+                           first, see normalised().
+            na_policy: How NA values are replaced, see to_array().
+
+        Returns:
+            float64 numpy array of shape (n_windows, L, n_indices), without the
+            window axis if window is an int and without the index axis if
+            record_codes is a str. Positions whose window does not fit within
+            the sequence are NaN.
+
+        Raises:
+            TypeError: If sequence is not a string.
+            ValueError: If the sequence contains invalid characters, a record
+                        code is not found, or a window is not a positive integer.
+        """
+        if not isinstance(sequence, str):
+            raise TypeError(f"sequence must be a string, got {type(sequence)}.")
+        return self.profiles([sequence], record_codes, window, normalisation, na_policy)[0]
+
+    def profiles(self, sequences: List[str], record_codes: Union[str, List[str]], window: Union[int, List[int]] = 9,
+                 normalisation: Optional[str] = None, na_policy: str = "zero", max_len: Optional[int] = None):
+        """Return sliding-window property profiles of a batch of sequences.
+
+        Batch version of profile(): sequences are padded to a common length
+        and every profile is computed from one cumulative sum per sequence and
+        index, with one subtraction per window size.
+
+        Args:
+            sequences: List of amino acid sequences.
+            record_codes: Accession number of an index, or a list of them.
+            window: Window size, or a list of window sizes. Defaults to 9.
+            normalisation: Optional normalisation method applied to each index
+                           first, see normalised().
+            na_policy: How NA values are replaced, see to_array().
+            max_len: Length that sequences are padded or truncated to. Defaults
+                     to the length of the longest sequence.
+
+        Returns:
+            float64 numpy array of shape (n_sequences, n_windows, max_len,
+            n_indices), without the window axis if window is an int and without
+            the index axis if record_codes is a str. Positions whose window does
+            not fit within the sequence, and padding, are NaN.
+
+        Raises:
+            TypeError: If sequences is not a list of strings.
+            ValueError: If a sequence contains invalid characters, a record
+                        code is not found, or a window is not a positive integer.
+        """
+        np = _require_numpy()
+        if not isinstance(sequences, (list, tuple)):
+            raise TypeError(f"sequences must be a list of str, got {type(sequences)}.")
+        windows = [window] if isinstance(window, int) else [int(w) for w in window]
+        if not windows or min(windows) < 1:
+            raise ValueError(f"window must be a positive integer or list of them, got {window}.")
+        codes = [record_codes] if isinstance(record_codes, str) else record_codes
+
+        values = self.encode_values(list(sequences), codes, normalisation, na_policy, max_len)
+        n_seq, length, n_indices = values.shape
+        lengths = np.array([min(len(sequence.strip()), length) for sequence in sequences], dtype=np.int64)
+
+        #cumulative sums with a leading zero: the sum of values[i:i + w] is cumulative[i + w] - cumulative[i];
+        #NaN values are summed as 0 and counted separately, so they only blank the windows containing them
+        missing = np.isnan(values)
+        cumulative = np.zeros((n_seq, length + 1, n_indices))
+        np.cumsum(np.where(missing, 0, values), axis=1, out=cumulative[:, 1:])
+        missing_counts = np.zeros((n_seq, length + 1, n_indices), dtype=np.int64)
+        np.cumsum(missing, axis=1, out=missing_counts[:, 1:])
+
+        out = np.full((n_seq, len(windows), length, n_indices), np.nan)
+        for col, w in enumerate(windows):
+            if w > length:
+                continue
+            means = (cumulative[:, w:] - cumulative[:, :-w]) / w
+            means[missing_counts[:, w:] - missing_counts[:, :-w] > 0] = np.nan
+            #window starting at i is assigned to its centre, and only fits if i + w <= L
+            fits = np.arange(length - w + 1)[np.newaxis, :] <= (lengths - w)[:, np.newaxis]
+            out[:, col, w // 2:w // 2 + length - w + 1] = np.where(fits[:, :, np.newaxis], means, np.nan)
+
+        if isinstance(window, int):
+            out = out[:, 0]
+        if isinstance(record_codes, str):
+            out = out[..., 0]
+        return out
+
+    def kmer_table(self, k: int, record_codes: Optional[List[str]] = None, reduction: str = "sum",
+                   normalisation: Optional[str] = None, na_policy: str = "zero",
+                   max_bytes: int = MAX_TABLE_BYTES):
+        """Return a lookup table of the summed or averaged index values of every k-mer.
+
+        Row c holds the values of the k-mer whose code is c, as returned by
+        :func:`aaindex.encoding.encode_kmers`, so scoring peptides is a single
+        gather (see score_kmers()). All len(ALPHABET) ** k k-mers are covered,
+        including those containing the ``-`` gap, whose value is 0. Tables are
+        built once per set of arguments, cached and returned read-only. The
+        table takes 21 ** k * n_indices * 8 bytes, e.g. 33MB per index for k=5,
+        so tables larger than max_bytes are refused rather than built; select
+        the indices needed for large k.
+
+        Args:
+            k: k-mer length, from 1 to MAX_KMER (5).
+            record_codes: Accession numbers of the indices, in the desired
+                          column order. Defaults to all records.
+            reduction: "sum" or "mean" of the residue values of each k-mer.
+            normalisation: Optional normalisation method applied to each index
+                           first, see normalised().
+            na_policy: How NA values are replaced, see to_array().
+            max_bytes: Largest table that may be built, in bytes. Defaults to
+                       MAX_TABLE_BYTES (256 MiB), which all records fit for k <= 3.
+
+        Returns:
+            Read-only float64 numpy array of shape (21 ** k, n_indices).
+
+        Raises:
+            ValueError: If k or reduction is invalid, a record code,
+                        normalisation or na_policy is invalid, or the table
+                        would take more than max_bytes.
+        """
+        key = ("kmer", k, self._cache_codes(record_codes), reduction, normalisation, na_policy)
+        table = self._array_cache.get(key)
+        if table is not None:
+            return table
+
+        np = _require_numpy()
+        if not isinstance(k, int) or not 1 <= k <= MAX_KMER:
+            raise ValueError(f"k must be an integer between 1 and {MAX_KMER}, got {k}.")
+        if reduction not in ("sum", "mean"):
+            raise ValueError(f"reduction must be one of ['sum', 'mean'], got {reduction!r}.")
+        n_indices = len(self._resolve_codes(record_codes))
+        nbytes = len(ALPHABET) ** k * n_indices * np.dtype(np.float64).itemsize
+        if nbytes > max_bytes:
+            raise ValueError(f"The k={k} table of {n_indices} indices would take {nbytes / (1 << 20):.0f} MiB, "
+                             f"above max_bytes ({max_bytes / (1 << 20):.0f} MiB); select fewer indices "
+                             "with record_codes or raise max_bytes.")
+
+        values = self._value_table(record_codes, normalisation, na_policy)
+        #extend the k-mers one residue at a time: codes of (k+1)-mers are code * 21 + next residue
+        table = values
+        for _ in range(k - 1):
+            table = (table[:, np.newaxis, :] + values[np.newaxis, :, :]).reshape(-1, values.shape[1])
+        if reduction == "mean":
+            table = table / k
+        table = np.ascontiguousarray(table)
+        table.flags.writeable = False
+        self._array_cache[key] = table
+        return table
+
+    def score_kmers(self, peptides, record_codes: Optional[List[str]] = None, reduction: str = "sum",
+                    normalisation: Optional[str] = None, na_policy: str = "zero", k: Optional[int] = None,
+                    max_bytes: int = MAX_TABLE_BYTES):
+        """Score equal-length peptides by their summed or averaged index values.
+
+        Peptides are encoded with :func:`aaindex.encoding.encode_kmers` and
+        scored by a single gather from the cached kmer_table().
+
+        Args:
+            peptides: List of peptides, all of the same length k (at most 5),
+                      or an integer array of k-mer codes from encode_kmers().
+            record_codes: Accession numbers of the indices, in the desired
+                          column order. Defaults to all records.
+            reduction: "sum" or "mean" of the residue values of each peptide.
+            normalisation: Optional normalisation method applied to each index
+                           first, see normalised().
+            na_policy: How NA values are replaced, see to_array().
+            k: k-mer length, required when peptides is an array of k-mer codes.
+            max_bytes: Largest k-mer table that may be built, see kmer_table().
+
+        Returns:
+            float64 numpy array of shape (n_peptides, n_indices).
+
+        Raises:
+            TypeError: If peptides is not a list of strings or an integer array.
+            ValueError: If the peptides are invalid or differ in length, k is
+                        missing for, or inconsistent with, the peptides, or the
+                        k-mer table would take more than max_bytes.
+            IndexError: If a k-mer code is outside the table for k.
+        """
+        np = _require_numpy()
+        if isinstance(peptides, np.ndarray):
+            if not np.issubdtype(peptides.dtype, np.integer):
+                raise TypeError(f"k-mer code arrays must have an integer dtype, got {peptides.dtype}.")
+            if k is None:
+                raise ValueError("k must be given when scoring an array of k-mer codes.")
+            kmer_codes = peptides
+        else:
+            kmer_codes = encode_kmers(peptides)
+            if peptides and k is not None and len(peptides[0]) != k:
+                raise ValueError(f"peptides have length {len(peptides[0])}, expected k={k}.")
+            k = len(peptides[0]) if peptides else (k or 1)
+        table = self.kmer_table(k, record_codes, reduction, normalisation, na_policy, max_bytes)
+        if kmer_codes.size and (kmer_codes.min() < 0 or kmer_codes.max() >= len(table)):
+            raise IndexError(f"k-mer codes must be in the range 0-{len(table) - 1} for k={k}.")
+        return table[kmer_codes]
+
+    def _value_table(self, record_codes: Optional[List[str]], normalisation: Optional[str],
+                     na_policy: str):
+        """Return the cached residue-major (21, n_indices) lookup table used by the encoders."""
+        key = ("table", self._cache_codes(record_codes), normalisation, na_policy)
+        table = self._array_cache.get(key)
+        if table is None:
+            np = _require_numpy()
+            if normalisation is None:
+                array = self.to_array(record_codes, na_policy)
+            else:
+                array = self.normalised(normalisation, record_codes, na_policy)
+            table = np.ascontiguousarray(array.T)
+            table.flags.writeable = False
+            self._array_cache[key] = table
+        return table
+
+    def to_arrow(self, table: str = "values", form: str = "long",
+                 record_codes: Optional[List[str]] = None, na_policy: str = "nan"):
+        """Export the database as an Apache Arrow table.
+
+        The ``values`` table holds the dense value array: in ``long`` form one
+        row per (record_code, amino_acid) pair with a ``value`` column, in
+        ``wide`` form one row per record with a column per amino acid. Label
+        columns are dictionary encoded, so the table can be handed to pandas,
+        polars, DuckDB or Spark directly. In long form, a value column without
+        nulls wraps the numpy buffer without copying. The ``metadata`` table holds one row per
+        record with its description, references, pmid, notes, category and
+        correlation coefficients.
+
+        Args:
+            table: Which table to export, "values" or "metadata".
+            form: Layout of the values table, "long" or "wide".
+            record_codes: Accession numbers to export, in the desired order.
+                          Defaults to all records, ordered as record_codes().
+            na_policy: How NA values are replaced, see to_array(). Under the
+                       default "nan" policy they are exported as nulls.
+
+        Returns:
+            pyarrow.Table.
+
+        Raises:
+            ImportError: If pyarrow is not installed.
+            ValueError: If table, form or na_policy is invalid, or a record code
+                        is not found in the database.
+        """
+        codes = self._resolve_codes(record_codes)
+        if table == "values":
+            array = self.to_array(codes, na_policy)
+            mask = self._na_mask(codes) if na_policy == "nan" else None
+            return _dense_to_arrow(array, [codes, list(ALPHABET)], ["record_code", "amino_acid"],
+                                   form, mask=mask)
+        if table == "metadata":
+            return _metadata_to_arrow(self.aaindex_json, codes,
+                                      ["description", "references", "pmid", "notes", "category"])
+        raise ValueError(f"table must be one of ['values', 'metadata'], got {table!r}.")
+
+    def to_parquet(self, path: str, table: str = "values", form: str = "long",
+                   record_codes: Optional[List[str]] = None, na_policy: str = "nan", **kwargs) -> None:
+        """Write a table exported by to_arrow() to a Parquet file.
+
+        Args:
+            path: Output Parquet filepath.
+            table: Which table to export, "values" or "metadata".
+            form: Layout of the values table, "long" or "wide".
+            record_codes: Accession numbers to export, defaults to all records.
+            na_policy: How NA values are replaced, see to_arrow().
+            **kwargs: Passed through to ``pyarrow.parquet.write_table``.
+
+        Raises:
+            ImportError: If pyarrow is not installed.
+            ValueError: If table, form or na_policy is invalid, or a record code
+                        is not found in the database.
+        """
+        _write_parquet(self.to_arrow(table, form, record_codes, na_policy), path, **kwargs)
+
+    @staticmethod
+    def read_parquet(path: str, columns: Optional[List[str]] = None):
+        """Read a Parquet file written by to_parquet() into an Arrow table.
+
+        The file is memory-mapped, so numeric columns are not copied into memory
+        until accessed.
+
+        Args:
+            path: Parquet filepath.
+            columns: Optional subset of columns to read.
+
+        Returns:
+            pyarrow.Table.
+
+        Raises:
+            ImportError: If pyarrow is not installed.
+        """
+        return _read_parquet(path, columns)
+
+    def _na_mask(self, codes: List[str]):
+        """Build the NA mask for a list of normalised record codes."""
+        np = _require_numpy()
+        mask = np.zeros((len(codes), len(ALPHABET)), dtype=bool)
+        for row, code in enumerate(codes):
+            for aa in self.aaindex_json[code].get("na_values", []):
+                mask[row, ALPHABET.index(aa)] = True
+        return mask
+
+    def _cache_codes(self, record_codes: Optional[List[str]]) -> Optional[tuple]:
+        """Return the canonical record codes of an array cache key, None standing for all records."""
+        return None if record_codes is None else tuple(self._resolve_codes(record_codes))
+
+    def _resolve_codes(self, record_codes: Optional[List[str]]) -> List[str]:
+        """Return the normalised list of record codes, defaulting to all records."""
+        if record_codes is None:
+            return self.record_codes()
+        if isinstance(record_codes, str):
+            record_codes = [record_codes]
+        return [self._normalise_code(code) for code in record_codes]
+
     def get_record_by_category(self, category: str) -> Dict:
         """Return all records belonging to a given category.
 
@@ -384,12 +1233,53 @@ class AAIndex1():
                          leading/trailing whitespace is stripped).
 
         Returns:
-            Record data as a Map, accessible via dict or dot notation.
+            Record data as a Map, accessible via dict or dot notation. If the
+            database is frozen, a shared, immutable FrozenMap.
 
         Raises:
             TypeError: If record_code is not a string.
             ValueError: If record_code is not found in the database.
         """
+        if self._frozen:
+            return self._aaindex_json[self._normalise_code(record_code)]
+        return Map(self._lookup(record_code))
+
+    def _lookup(self, record_code: str) -> Dict:
+        """Return the stored record of an accession number.
+
+        Until the database is loaded, the record is read alone from its byte
+        offset in the raw file and parsed, rather than loading every record,
+        and kept in an LRU cache of the record_cache_size most recent records.
+        """
+        code = self._normalise_code(record_code)
+        if self._aaindex_json is not None:
+            return self._aaindex_json[code]
+        with self._load_lock:
+            record = self._record_cache.pop(code, None)
+            if record is None:
+                raw_path = os.path.join(self.aaindex_module_path, self.data_dir, self.aaindex_filename)
+                record = self._parse_lines(_read_record(raw_path, *self._offsets[code])).get(code)
+                if record is None:
+                    #the index no longer matches the raw file, fall back to loading the database
+                    return self.aaindex_json[code]
+            self._record_cache[code] = record
+            while len(self._record_cache) > self.record_cache_size:
+                self._record_cache.popitem(last=False)
+        return record
+
+    def _known_codes(self):
+        """Return the accession numbers of the loaded database, or of the raw file's offset index if not loaded."""
+        if self._aaindex_json is None and self._offsets is None:
+            with self._load_lock:
+                if self._aaindex_json is None and self._offsets is None:
+                    raw_path = os.path.join(self.aaindex_module_path, self.data_dir, self.aaindex_filename)
+                    self._offsets = _record_offsets(raw_path)
+        if self._aaindex_json is None and self._offsets is not None:
+            return self._offsets
+        return self.aaindex_json
+
+    def _normalise_code(self, record_code: str) -> str:
+        """Return the stripped, uppercased record code, validating it exists in the database."""
         try:
             record_code = record_code.strip().upper()
         except AttributeError:
@@ -397,10 +1287,10 @@ class AAIndex1():
                 f"Input parameter {record_code} is not of correct datatype string, got {type(record_code)}."
             )
 
-        if record_code not in self.aaindex_json:
+        if record_code not in self._known_codes():
             raise ValueError(f"Record Index ({record_code}) not found in AAindex1.")
 
-        return Map(self.aaindex_json[record_code])
+        return record_code
 
     def __sizeof__(self) -> int:
         """Return the on-disk size of the raw AAindex data file in bytes."""
@@ -426,13 +1316,48 @@ class AAIndex1():
 
 ######################          Getters & Setters          ######################
 
+    @property
+    def aaindex_json(self) -> Dict:
+        if self._aaindex_json is None:
+            with self._load_lock:
+                if self._aaindex_json is None:
+                    self._aaindex_json = self._load()
+        return self._aaindex_json
+
+    @aaindex_json.setter
+    def aaindex_json(self, value: Dict) -> None:
+        self._check_writable("aaindex_json")
+        self._aaindex_json = value
+        self._custom_json = value is not None
+        self._content_hash = None
+
+    @property
+    def content_hash(self) -> str:
+        """SHA-256 hex digest of the raw release file the records were parsed from.
+
+        For records assigned to aaindex_json in memory, the digest of their
+        canonical JSON serialisation instead.
+        """
+        if self._content_hash is None:
+            with self._load_lock:
+                if self._content_hash is None:
+                    raw_path = os.path.join(self.aaindex_module_path, self.data_dir, self.aaindex_filename)
+                    self._content_hash = _database_hash(raw_path, self.aaindex_json, self._custom_json)
+        return self._content_hash
+
     @property
     def categories(self) -> Dict:
+        if self._categories is None:
+            with self._load_lock:
+                if self._categories is None:
+                    self._categories = self.get_all_categories()
         return self._categories
 
     @categories.setter
     def categories(self, value: Dict) -> None:
+        self._check_writable("categories")
         self._categories = value
+        self._custom_categories = value is not None
 
     @property
     def data_dir(self) -> str:
@@ -440,7 +1365,10 @@ class AAIndex1():
 
     @data_dir.setter
     def data_dir(self, value: str) -> None:
+        self._check_writable("data_dir")
         self._data_dir = value
+        self._offsets = None
+        self._record_cache.clear()
 
     @property
     def aaindex_filename(self) -> str:
@@ -448,7 +1376,10 @@ class AAIndex1():
 
     @aaindex_filename.setter
     def aaindex_filename(self, value: str) -> None:
+        self._check_writable("aaindex_filename")
         self._aaindex_filename = value
+        self._offsets = None
+        self._record_cache.clear()
 
     @property
     def last_updated(self) -> str:
@@ -456,6 +1387,7 @@ class AAIndex1():
 
     @last_updated.setter
     def last_updated(self, value: str) -> None:
+        self._check_writable("last_updated")
         self._last_updated = value
 
 
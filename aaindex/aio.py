@@ -0,0 +1,185 @@
+################################################################################
+################             Asyncio Database Facade           #################
+################################################################################
+
+#importing required modules and dependencies
+import asyncio
+import functools
+from concurrent.futures import Executor
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from ._aaindex_matrix import Map
+from .aaindex1 import aaindex1
+from .aaindex2 import aaindex2
+from .aaindex3 import aaindex3
+
+__all__: List[str] = ['AsyncAAIndex', 'async_aaindex1', 'async_aaindex2', 'async_aaindex3', 'preload']
+
+
+class AsyncAAIndex:
+    """Asyncio facade over an AAindex database instance.
+
+    Loading a database reads and parses its JSON file, and search() and the
+    batch encoders are CPU bound; called directly from a coroutine they block
+    the event loop. This facade runs that work in an executor: the database is
+    loaded off-loop once, with concurrent callers awaiting the same load, after
+    which record lookups are plain dict reads that complete without switching
+    threads.
+
+    Args:
+        database: AAIndex1, AAIndex2 or AAIndex3 instance to wrap, defaults to
+                  the ``aaindex1`` module instance.
+        executor: concurrent.futures.Executor to run blocking work in, defaults
+                  to the event loop's default executor.
+
+    Attributes:
+        database: The wrapped database instance.
+        executor: Executor used for blocking work, or None for the loop default.
+    """
+    def __init__(self, database=None, executor: Optional[Executor] = None) -> None:
+        self.database = aaindex1 if database is None else database
+        self.executor = executor
+
+        #(event loop, future) of the in-flight load, shared by concurrent warm() calls
+        self._warming: Optional[tuple] = None
+
+    @property
+    def loaded(self) -> bool:
+        """True once the wrapped database has been loaded from disk."""
+        return self.database._aaindex_json is not None
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """Run a blocking callable in the executor and return its result.
+
+        Args:
+            func: Callable to run, e.g. a method of the wrapped database.
+            *args: Positional arguments for func.
+            **kwargs: Keyword arguments for func.
+
+        Returns:
+            The return value of func.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(func, *args, **kwargs))
+
+    async def warm(self, arrays: bool = False) -> None:
+        """Load the wrapped database in the executor if it is not loaded yet.
+
+        Concurrent callers share a single load. Cancelling one caller does not
+        cancel the load for the others.
+
+        Args:
+            arrays: Also build the dense arrays used by the array based APIs,
+                    see ``warm()`` on the database classes.
+        """
+        if not self.loaded:
+            loop = asyncio.get_running_loop()
+            if self._warming is None or self._warming[0] is not loop:
+                self._warming = (loop, asyncio.ensure_future(self.run(self.database.warm)))
+            future = self._warming[1]
+            try:
+                await asyncio.shield(future)
+            except Exception:
+                #allow a failed load to be retried by the next caller
+                if self._warming is not None and self._warming[1] is future:
+                    self._warming = None
+                raise
+        if arrays:
+            await self.run(self.database.warm, arrays=True)
+
+    async def record(self, record_code: str) -> Map:
+        """Return a record by accession number, loading the database off-loop if needed.
+
+        Args:
+            record_code: AAindex accession number.
+
+        Returns:
+            Record data as a Map.
+
+        Raises:
+            TypeError: If record_code is not a string.
+            ValueError: If record_code is not found in the database.
+        """
+        await self.warm()
+        return self.database[record_code]
+
+    async def values(self, record_code: str) -> Dict:
+        """Return the values (AAindex1) or matrix (AAindex2/3) dict of a record.
+
+        Args:
+            record_code: AAindex accession number.
+
+        Returns:
+            Dict of amino acid values or nested dict of pairwise scores.
+
+        Raises:
+            ValueError: If record_code is not found in the database.
+        """
+        await self.warm()
+        return self.database.values(record_code)
+
+    async def get(self, record_code: str, aa1: str, aa2: str) -> Optional[float]:
+        """Return the pairwise score of a matrix record, see ``AAIndex2.get()``.
+
+        Raises:
+            TypeError: If the wrapped database is AAindex1.
+            ValueError: If record_code or an amino acid is not found.
+        """
+        if not hasattr(self.database, "get"):
+            raise TypeError("get() requires an AAindex2 or AAindex3 database.")
+        await self.warm()
+        return self.database.get(record_code, aa1, aa2)
+
+    async def search(self, description: Union[str, List[str]]) -> Dict:
+        """Search records by keyword(s) in their description, in the executor.
+
+        Args:
+            description: Keyword string or list of keyword strings.
+
+        Returns:
+            Dict of matching records keyed by accession number.
+
+        Raises:
+            TypeError: If description is not a str or list.
+        """
+        await self.warm()
+        return await self.run(self.database.search, description)
+
+    async def encode_values(self, sequences: Union[str, List[str]], *args, **kwargs):
+        """Encode sequences into AAindex1 values in the executor.
+
+        Takes the same arguments as ``AAIndex1.encode_values()``.
+
+        Raises:
+            TypeError: If the wrapped database is not AAindex1.
+        """
+        if not hasattr(self.database, "encode_values"):
+            raise TypeError("encode_values() requires an AAindex1 database.")
+        await self.warm()
+        return await self.run(self.database.encode_values, sequences, *args, **kwargs)
+
+    def __repr__(self) -> str:
+        """Return a canonical string representation of this instance."""
+        return f"AsyncAAIndex(database={self.database.__class__.__name__}, loaded={self.loaded})"
+
+
+#facades over the module-level database instances
+async_aaindex1 = AsyncAAIndex(aaindex1)
+async_aaindex2 = AsyncAAIndex(aaindex2)
+async_aaindex3 = AsyncAAIndex(aaindex3)
+
+
+async def preload(*facades: AsyncAAIndex, arrays: bool = False) -> None:
+    """Load several databases concurrently off the event loop.
+
+    Intended to be awaited at service start up so that the first requests do
+    not pay for loading the databases.
+
+    Args:
+        *facades: AsyncAAIndex instances to warm, defaults to the facades over
+                  ``aaindex1``, ``aaindex2`` and ``aaindex3``.
+        arrays: Also build the dense arrays used by the array based APIs.
+    """
+    if not facades:
+        facades = (async_aaindex1, async_aaindex2, async_aaindex3)
+    await asyncio.gather(*(facade.warm(arrays=arrays) for facade in facades))
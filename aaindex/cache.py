@@ -0,0 +1,242 @@
+################################################################################
+################         Persistent Encoding Cache             #################
+################################################################################
+
+#importing required modules and dependencies
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Union
+
+from ._aaindex_matrix import Map
+from .aaindex1 import aaindex1
+from .encoding import _require_numpy
+
+__all__: List[str] = ['EncodingCache', 'DEFAULT_MAX_BYTES']
+
+#default bound on the stored encodings, 1 GiB
+DEFAULT_MAX_BYTES: int = 1 << 30
+
+#bumped whenever the layout of stored encodings changes, so old entries are never matched
+_KEY_VERSION: str = "1"
+
+#SQLite host parameter limit is 999 on older builds, so key lookups are batched below it
+_QUERY_BATCH: int = 500
+
+_SCHEMA: str = """
+PRAGMA journal_mode = WAL;
+PRAGMA synchronous = NORMAL;
+CREATE TABLE IF NOT EXISTS encodings (
+    key TEXT PRIMARY KEY,
+    data BLOB NOT NULL,
+    nbytes INTEGER NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS encodings_accessed ON encodings (accessed);
+"""
+
+
+class EncodingCache:
+    """Persistent, content-addressed cache of AAIndex1.encode_values() results.
+
+    Each sequence's (L, n_indices) encoding is stored under the SHA-256 of the
+    sequence, the resolved index set, the normalisation, the NA policy and the
+    database's content_hash, so entries are shared by every run encoding the
+    same sequence against the same indices and release, and never served for
+    a different release. Entries live in a single SQLite file, which is safe
+    to share between threads and processes. When the stored encodings exceed
+    max_bytes, the least recently used entries are evicted.
+
+    Args:
+        path: Path of the SQLite cache file, created if missing.
+        max_bytes: Upper bound on the bytes of stored encodings. Defaults to 1 GiB.
+        database: AAIndex1 instance to encode with. Defaults to aaindex1.
+
+    Attributes:
+        hits: Number of sequences served from the cache by this instance.
+        misses: Number of sequences encoded and stored by this instance.
+        evictions: Number of entries evicted by this instance.
+
+    Raises:
+        ValueError: If max_bytes is not positive.
+        sqlite3.Error: If the cache file cannot be opened.
+    """
+    def __init__(self, path: str, max_bytes: int = DEFAULT_MAX_BYTES, database=None) -> None:
+        if max_bytes <= 0:
+            raise ValueError(f"max_bytes must be positive, got {max_bytes}.")
+        self.path = path
+        self.max_bytes = max_bytes
+        self.database = aaindex1 if database is None else database
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(path, timeout=60, check_same_thread=False, isolation_level=None)
+        self._connection.executescript(_SCHEMA)
+
+    def _keys(self, sequences: List[str], record_codes: List[str], normalisation: Optional[str],
+              na_policy: str) -> List[str]:
+        """Return the content address of each sequence's encoding."""
+        prefix = "\x1f".join([_KEY_VERSION, self.database.content_hash, normalisation or "", na_policy,
+                              ",".join(record_codes)])
+        return [hashlib.sha256(f"{prefix}\x1f{sequence}".encode()).hexdigest() for sequence in sequences]
+
+    def encode_values(self, sequences: Union[str, List[str]], record_codes: Optional[List[str]] = None,
+                      normalisation: Optional[str] = None, na_policy: str = "zero",
+                      max_len: Optional[int] = None, ragged: bool = False):
+        """Encode sequences as AAIndex1.encode_values(), serving previously encoded sequences from the cache.
+
+        Distinct sequences of the call are looked up in one pass; only the
+        missing ones are encoded, in a single batch, and stored.
+
+        Args:
+            sequences: A single sequence, or a list of sequences to encode as a batch.
+            record_codes: Accession numbers of the indices, in the desired
+                          feature order. Defaults to all records.
+            normalisation: Optional normalisation method applied to each index.
+            na_policy: How NA values are replaced, see ``AAIndex1.to_array()``.
+            max_len: Length that batched sequences are padded or truncated to.
+                     Defaults to the length of the longest sequence.
+            ragged: Whether to return the ragged (values, offsets) layout.
+
+        Returns:
+            The output of ``AAIndex1.encode_values()`` for the same arguments.
+
+        Raises:
+            TypeError: If sequences is not a string or list of strings.
+            ValueError: If a sequence contains invalid characters, max_len is
+                        negative, or a record code, normalisation or na_policy
+                        is invalid.
+        """
+        np = _require_numpy()
+        if max_len is not None and max_len < 0:
+            raise ValueError(f"max_len must not be negative, got {max_len}.")
+        single = isinstance(sequences, str)
+        if not single and not isinstance(sequences, (list, tuple)):
+            raise TypeError(f"sequences must be a str or list of str, got {type(sequences)}.")
+        if not all(isinstance(sequence, str) for sequence in ([sequences] if single else sequences)):
+            raise TypeError("sequences must be a str or list of str.")
+        record_codes = self.database._resolve_codes(record_codes)
+        canonical = [sequence.strip().upper() for sequence in ([sequences] if single else sequences)]
+        distinct = list(dict.fromkeys(canonical))
+        keys = self._keys(distinct, record_codes, normalisation, na_policy)
+
+        found = self._fetch(keys, len(record_codes))
+        missing = [i for i, key in enumerate(keys) if key not in found]
+        if missing:
+            values, offsets = self.database.encode_values([distinct[i] for i in missing], record_codes,
+                                                          normalisation, na_policy, ragged=True)
+            fresh = {keys[i]: values[offsets[row]:offsets[row + 1]] for row, i in enumerate(missing)}
+            self._store(fresh)
+            found.update(fresh)
+        with self._lock:
+            self.hits += len(distinct) - len(missing)
+            self.misses += len(missing)
+
+        lookup = dict(zip(distinct, (found[key] for key in keys)))
+        if single and not ragged:
+            #as in AAIndex1.encode_values(), max_len only applies to batches and ragged output
+            return lookup[canonical[0]].copy()
+        rows = [lookup[sequence][:max_len] for sequence in canonical]
+        if ragged:
+            offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+            np.cumsum([len(row) for row in rows], out=offsets[1:])
+            return (np.concatenate(rows) if rows else np.empty((0, len(record_codes)))), offsets
+
+        #padded with the gap value 0, copied straight from the stored buffers
+        if max_len is None:
+            max_len = max((len(row) for row in rows), default=0)
+        out = np.zeros((len(rows), max_len, len(record_codes)))
+        for i, row in enumerate(rows):
+            out[i, :len(row)] = row
+        return out
+
+    def _fetch(self, keys: List[str], n_indices: int) -> Dict:
+        """Return the stored encodings of the given keys, marking them as recently used."""
+        np = _require_numpy()
+        found: Dict = {}
+        with self._lock:
+            for start in range(0, len(keys), _QUERY_BATCH):
+                batch = keys[start:start + _QUERY_BATCH]
+                rows = self._connection.execute(
+                    f"SELECT key, data FROM encodings WHERE key IN ({','.join('?' * len(batch))})", batch)
+                for key, data in rows:
+                    found[key] = np.frombuffer(data, dtype=np.float64).reshape(-1, n_indices)
+            if found:
+                now = time.time()
+                with self._connection:
+                    self._connection.execute("BEGIN")
+                    self._connection.executemany("UPDATE encodings SET accessed = ? WHERE key = ?",
+                                                 [(now, key) for key in found])
+        return found
+
+    def _store(self, encodings: Dict) -> None:
+        """Store new encodings, then evict the least recently used entries beyond max_bytes."""
+        now = time.time()
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                self._connection.executemany(
+                    "INSERT OR REPLACE INTO encodings (key, data, nbytes, accessed) VALUES (?, ?, ?, ?)",
+                    [(key, array.tobytes(), array.nbytes, now) for key, array in encodings.items()])
+                total = self._connection.execute("SELECT COALESCE(SUM(nbytes), 0) FROM encodings").fetchone()[0]
+                evicted = []
+                if total > self.max_bytes:
+                    for key, nbytes in self._connection.execute(
+                            "SELECT key, nbytes FROM encodings ORDER BY accessed"):
+                        if total <= self.max_bytes:
+                            break
+                        evicted.append((key, ))
+                        total -= nbytes
+                    self._connection.executemany("DELETE FROM encodings WHERE key = ?", evicted)
+                self._connection.execute("COMMIT")
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+            self.evictions += len(evicted)
+
+    def stats(self) -> Map:
+        """Return the hit, miss and eviction counts of this instance and the size of the cache.
+
+        Returns:
+            Map with ``hits``, ``misses``, ``evictions``, ``hit_rate`` (hits over
+            lookups, 0 before any), and the ``entries`` and ``nbytes`` stored in
+            the cache file along with ``max_bytes``.
+        """
+        with self._lock:
+            entries, nbytes = self._connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(nbytes), 0) FROM encodings").fetchone()
+            lookups = self.hits + self.misses
+            return Map(hits=self.hits, misses=self.misses, evictions=self.evictions,
+                       hit_rate=self.hits / lookups if lookups else 0.0, entries=entries, nbytes=nbytes,
+                       max_bytes=self.max_bytes)
+
+    def clear(self) -> None:
+        """Remove every stored encoding and reset the statistics."""
+        with self._lock:
+            self._connection.execute("DELETE FROM encodings")
+            self.hits = self.misses = self.evictions = 0
+
+    def close(self) -> None:
+        """Close the cache file."""
+        with self._lock:
+            self._connection.close()
+
+    def __enter__(self) -> "EncodingCache":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        """Return the number of stored encodings."""
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM encodings").fetchone()[0]
+
+    def __repr__(self) -> str:
+        """Return a canonical string representation of this instance."""
+        return f"EncodingCache(path={self.path!r}, max_bytes={self.max_bytes})"
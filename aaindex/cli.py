@@ -0,0 +1,314 @@
+################################################################################
+################             aaindex Command-Line Tool         #################
+################################################################################
+
+#importing required modules and dependencies
+import argparse
+import json
+import os
+import sys
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+__all__: List[str] = ['main']
+
+#databases are imported inside each command so only the one needed is loaded
+_DATABASES: Tuple[str, ...] = ("1", "2", "3")
+
+
+def _database(db: str):
+    """Return the module-level instance of the AAindex database with the given number."""
+    if db == "1":
+        from .aaindex1 import aaindex1
+        return aaindex1
+    if db == "2":
+        from .aaindex2 import aaindex2
+        return aaindex2
+    from .aaindex3 import aaindex3
+    return aaindex3
+
+
+def _find_database(record_code: str, db: Optional[str]):
+    """Return the database holding record_code, searching AAindex1, 2 then 3 if db is not given."""
+    if db is not None:
+        return _database(db)
+    for candidate in _DATABASES:
+        database = _database(candidate)
+        #checked against the record offsets index, so the JSON is only loaded for the match
+        if record_code.strip().upper() in database._known_codes():
+            return database
+    raise ValueError(f"Record ({record_code}) not found in AAindex1, AAindex2 or AAindex3.")
+
+
+def read_fasta(path: str) -> Iterator[Tuple[str, str]]:
+    """Stream (identifier, sequence) pairs from a FASTA file.
+
+    Args:
+        path: FASTA filepath, or "-" to read from stdin.
+
+    Yields:
+        Tuple of the record identifier (header up to the first whitespace) and
+        its sequence with line breaks removed.
+
+    Raises:
+        ValueError: If sequence data is found before the first header.
+    """
+    if path == "-":
+        yield from _parse_fasta(sys.stdin, path)
+    else:
+        with open(path) as handle:
+            yield from _parse_fasta(handle, path)
+
+
+def _parse_fasta(lines: Iterable[str], path: str) -> Iterator[Tuple[str, str]]:
+    """Yield the (identifier, sequence) pairs of the lines of a FASTA file, see read_fasta()."""
+    identifier: Optional[str] = None
+    chunks: List[str] = []
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith(">"):
+            if identifier is not None:
+                yield identifier, "".join(chunks)
+            identifier = line[1:].split(maxsplit=1)[0] if len(line) > 1 else ""
+            chunks = []
+        elif identifier is None:
+            raise ValueError(f"Invalid FASTA file {path}, sequence found before the first '>' header.")
+        else:
+            chunks.append(line)
+    if identifier is not None:
+        yield identifier, "".join(chunks)
+
+
+def _batches(records: Iterator[Tuple[str, str]], batch_size: int) -> Iterator[List[Tuple[str, str]]]:
+    """Group a stream of FASTA records into lists of at most batch_size records."""
+    batch: List[Tuple[str, str]] = []
+    for record in records:
+        batch.append(record)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _encode_batch(batch: List[Tuple[str, str]], record_codes: List[str], normalisation: Optional[str],
+                  na_policy: str, max_len: Optional[int]):
+    """Encode a batch of FASTA records, run in the main process or a worker process."""
+    from .aaindex1 import aaindex1
+    sequences = [sequence for _, sequence in batch]
+    return aaindex1.encode_values(sequences, record_codes, normalisation, na_policy, max_len)
+
+
+def _ordered_results(batches: Iterator[List[Tuple[str, str]]], args: Tuple, jobs: int) -> Iterator:
+    """Yield (batch, encoded) pairs in input order, encoding up to 2 * jobs batches concurrently."""
+    if jobs <= 1:
+        for batch in batches:
+            yield batch, _encode_batch(batch, *args)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        pending: List = []
+        for batch in batches:
+            pending.append((batch, executor.submit(_encode_batch, batch, *args)))
+            if len(pending) >= 2 * jobs:
+                done_batch, future = pending.pop(0)
+                yield done_batch, future.result()
+        for done_batch, future in pending:
+            yield done_batch, future.result()
+
+
+def _index_codes(args: argparse.Namespace) -> List[str]:
+    """Return the AAindex1 record codes selected by --indices/--indices-file, defaulting to all."""
+    from .aaindex1 import aaindex1
+    codes: List[str] = list(args.indices or [])
+    if args.indices_file:
+        with open(args.indices_file) as f:
+            codes.extend(line.strip() for line in f if line.strip() and not line.startswith("#"))
+    if not codes:
+        return aaindex1.record_codes()
+    return aaindex1._resolve_codes(codes)
+
+
+def _command_encode(args: argparse.Namespace) -> int:
+    """Encode every sequence of a FASTA file into AAindex1 values, writing .npy or .parquet output."""
+    from .encoding import _require_numpy
+    np = _require_numpy()
+    record_codes = _index_codes(args)
+    extension = os.path.splitext(args.output)[1].lower()
+    if extension not in (".npy", ".parquet"):
+        raise ValueError(f"Output file must have a .npy or .parquet extension, got {args.output}.")
+
+    if extension == ".npy":
+        #first pass: count sequences and find the padded length, so the output can be
+        #written batch by batch into a memory-mapped .npy file; stdin can only be read
+        #once, so its records are held in memory for the second pass
+        records = list(read_fasta(args.fasta)) if args.fasta == "-" else None
+        n_sequences = 0
+        max_len = args.max_len or 0
+        for _, sequence in (records if records is not None else read_fasta(args.fasta)):
+            n_sequences += 1
+            if args.max_len is None:
+                max_len = max(max_len, len(sequence.strip()))
+        output = np.lib.format.open_memmap(
+            args.output, mode="w+", dtype=np.dtype(args.dtype),
+            shape=(n_sequences, max_len, len(record_codes)),
+        )
+        row = 0
+        encode_args = (record_codes, args.normalisation, args.na_policy, max_len)
+        second_pass = iter(records) if records is not None else read_fasta(args.fasta)
+        for batch, encoded in _ordered_results(_batches(second_pass, args.batch_size), encode_args, args.jobs):
+            output[row:row + len(batch)] = encoded
+            row += len(batch)
+        output.flush()
+        del output
+        return 0
+
+    #parquet: one row per residue, streamed one row group per batch
+    from ._arrow import _require_pyarrow
+    pa = _require_pyarrow()
+    import pyarrow.parquet as pq
+    schema = pa.schema(
+        [("sequence_id", pa.string()), ("position", pa.int32()), ("residue", pa.string())]
+        + [(code, pa.from_numpy_dtype(np.dtype(args.dtype))) for code in record_codes]
+    )
+    encode_args = (record_codes, args.normalisation, args.na_policy, args.max_len)
+    with pq.ParquetWriter(args.output, schema) as writer:
+        for batch, encoded in _ordered_results(_batches(read_fasta(args.fasta), args.batch_size),
+                                               encode_args, args.jobs):
+            lengths = [min(len(sequence.strip()), encoded.shape[1]) for _, sequence in batch]
+            valid = np.arange(encoded.shape[1])[np.newaxis, :] < np.array(lengths)[:, np.newaxis]
+            values = encoded[valid].astype(args.dtype, copy=False)
+            columns: Dict = {
+                "sequence_id": pa.array([identifier for (identifier, _), n in zip(batch, lengths)
+                                         for _ in range(n)], pa.string()),
+                "position": pa.array(np.concatenate([np.arange(n, dtype=np.int32) for n in lengths])
+                                     if lengths else np.empty(0, np.int32)),
+                "residue": pa.array([aa for (_, sequence), n in zip(batch, lengths)
+                                     for aa in sequence.strip().upper()[:n]], pa.string()),
+            }
+            for col, code in enumerate(record_codes):
+                columns[code] = pa.array(np.ascontiguousarray(values[:, col]))
+            writer.write_table(pa.table(columns, schema=schema))
+    return 0
+
+
+def _command_search(args: argparse.Namespace) -> int:
+    """Print the accession number and description of every record matching the keywords."""
+    database = _database(args.db)
+    for code, record in database.search(args.keywords).items():
+        print(f"{code}\t{record['description']}")
+    return 0
+
+
+def _command_get(args: argparse.Namespace) -> int:
+    """Print a record as JSON, or a single value when amino acids are given."""
+    database = _find_database(args.record_code, args.db)
+    if not args.amino_acids:
+        print(json.dumps(dict(database[args.record_code]), indent=2))
+    elif len(args.amino_acids) == 1 and hasattr(database, "categories"):
+        aa = args.amino_acids[0].strip().upper()
+        values = database.values(args.record_code)
+        if aa not in values:
+            raise ValueError(f"Amino acid {aa} not found in record {args.record_code}.")
+        print(values[aa])
+    elif len(args.amino_acids) == 2 and not hasattr(database, "categories"):
+        print(database.get(args.record_code, *args.amino_acids))
+    else:
+        raise ValueError("get takes one amino acid for AAindex1 records and two for AAindex2/AAindex3 records.")
+    return 0
+
+
+def _command_export(args: argparse.Namespace) -> int:
+    """Export a database to .parquet, .npy or .json."""
+    database = _database(args.db)
+    extension = os.path.splitext(args.output)[1].lower()
+    if extension == ".parquet":
+        table = args.table or ("values" if args.db == "1" else "matrices")
+        database.to_parquet(args.output, table=table, form=args.form, na_policy=args.na_policy)
+    elif extension == ".npy":
+        from .encoding import _require_numpy
+        np = _require_numpy()
+        if args.db == "1":
+            np.save(args.output, database.to_array(na_policy=args.na_policy))
+        else:
+            np.save(args.output, database.to_tensor(na_policy=args.na_policy))
+    elif extension == ".json":
+        with open(args.output, "w") as f:
+            json.dump(database.aaindex_json, f, indent=4, sort_keys=True)
+    else:
+        raise ValueError(f"Output file must have a .parquet, .npy or .json extension, got {args.output}.")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for the aaindex command-line tool.
+
+    Returns:
+        Configured argparse.ArgumentParser.
+    """
+    parser = argparse.ArgumentParser(
+        prog="aaindex",
+        description="Query, export and encode sequences with the AAindex databases.",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    encode = subparsers.add_parser("encode", help="encode FASTA sequences into AAindex1 values")
+    encode.add_argument("fasta", help="input FASTA file, or - for stdin")
+    encode.add_argument("-o", "--output", required=True, help="output .npy or .parquet file")
+    encode.add_argument("-i", "--indices", nargs="+", metavar="CODE", help="AAindex1 record codes to encode")
+    encode.add_argument("--indices-file", help="file of AAindex1 record codes, one per line")
+    encode.add_argument("--normalisation", choices=["zscore", "minmax", "rank"], help="normalise each index")
+    encode.add_argument("--na-policy", default="zero", choices=["zero", "nan", "mean", "raise"],
+                        help="replacement for NA values (default: zero)")
+    encode.add_argument("--max-len", type=int, help="pad or truncate sequences to this length")
+    encode.add_argument("--dtype", default="float32", choices=["float16", "float32", "float64"],
+                        help="output dtype (default: float32)")
+    encode.add_argument("--batch-size", type=int, default=1000, help="sequences encoded per batch (default: 1000)")
+    encode.add_argument("-j", "--jobs", type=int, default=1, help="number of worker processes (default: 1)")
+    encode.set_defaults(func=_command_encode)
+
+    search = subparsers.add_parser("search", help="search records by keywords in their description")
+    search.add_argument("keywords", nargs="+", help="case-insensitive keywords")
+    search.add_argument("--db", default="1", choices=_DATABASES, help="database to search (default: 1)")
+    search.set_defaults(func=_command_search)
+
+    get = subparsers.add_parser("get", help="print a record, or the value for one or two amino acids")
+    get.add_argument("record_code", help="AAindex accession number")
+    get.add_argument("amino_acids", nargs="*", help="one amino acid (AAindex1) or two (AAindex2/AAindex3)")
+    get.add_argument("--db", choices=_DATABASES, help="database of the record (default: searched in order)")
+    get.set_defaults(func=_command_get)
+
+    export = subparsers.add_parser("export", help="export a database to .parquet, .npy or .json")
+    export.add_argument("output", help="output .parquet, .npy or .json file")
+    export.add_argument("--db", default="1", choices=_DATABASES, help="database to export (default: 1)")
+    export.add_argument("--table", choices=["values", "matrices", "metadata"],
+                        help="table to export to Parquet (default: values or matrices)")
+    export.add_argument("--form", default="long", choices=["long", "wide"], help="Parquet table layout")
+    export.add_argument("--na-policy", default="nan", choices=["zero", "nan", "mean", "raise"],
+                        help="replacement for NA values (default: nan)")
+    export.set_defaults(func=_command_export)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the aaindex command-line tool.
+
+    Args:
+        argv: Command-line arguments, defaults to sys.argv[1:].
+
+    Returns:
+        Process exit code, 0 on success and 1 on error.
+    """
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except (ValueError, TypeError, OSError, ImportError) as e:
+        print(f"aaindex: error: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
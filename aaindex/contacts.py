@@ -0,0 +1,387 @@
+################################################################################
+################          Structure-Based Contact Scoring      #################
+################################################################################
+
+#importing required modules and dependencies
+from itertools import product
+from typing import List, Optional, Sequence, Union
+
+from .aaindex3 import aaindex3
+from .encoding import ALPHABET, AMINO_ACIDS, _require_numpy, encode
+
+__all__: List[str] = ['ContactEnergy', 'find_contacts', 'DEFAULT_POTENTIAL', 'DEFAULT_CUTOFF']
+
+#Miyazawa-Jernigan contact energies in an average buried environment (1996), the default potential
+DEFAULT_POTENTIAL: str = "MIYS960102"
+
+#distance cutoff in Angstroms, typical for contacts between C-alpha or C-beta atoms
+DEFAULT_CUTOFF: float = 8.0
+
+
+def _model_contacts(coordinates, cutoff: float, min_separation: int, chain_ids, chunk_size: int):
+    """Return the sorted (n_contacts, 2) contacts of a single (N, 3) model using a cell list.
+
+    Atoms are binned into cubic cells of side cutoff, so every contact lies
+    between atoms in the same or adjacent cells; candidate pairs are expanded
+    from the 27 cells around each atom in chunks of about chunk_size pairs.
+    Atoms with non-finite coordinates, e.g. unresolved residues, are skipped.
+    """
+    np = _require_numpy()
+    valid = np.flatnonzero(np.isfinite(coordinates).all(axis=1))
+    points = coordinates[valid]
+    if len(points) < 2:
+        return np.empty((0, 2), dtype=np.intp)
+
+    #cell keys, with a border of empty cells so that neighbouring keys never wrap around an axis
+    cells = np.floor((points - points.min(axis=0)) / cutoff).astype(np.int64) + 1
+    dims = cells.max(axis=0) + 2
+    keys = (cells[:, 0] * dims[1] + cells[:, 1]) * dims[2] + cells[:, 2]
+    order = np.argsort(keys, kind="stable")
+    occupied, starts, counts = np.unique(keys[order], return_index=True, return_counts=True)
+    shifts = np.array([(dx * dims[1] + dy) * dims[2] + dz for dx, dy, dz in product((-1, 0, 1), repeat=3)])
+    neighbours = keys[:, np.newaxis] + shifts
+    slots = np.minimum(np.searchsorted(occupied, neighbours), len(occupied) - 1)
+    n_candidates = np.where(occupied[slots] == neighbours, counts[slots], 0)
+
+    pairs = []
+    step = max(1, chunk_size // max(int(n_candidates.sum()) // len(points), 1))
+    for start in range(0, len(points), step):
+        block = n_candidates[start:start + step].ravel()
+        atoms = np.repeat(np.repeat(np.arange(start, start + len(block) // len(shifts)), len(shifts)), block)
+        offsets = np.arange(int(block.sum())) - np.repeat(np.cumsum(block) - block, block)
+        partners = order[np.repeat(starts[slots[start:start + step].ravel()], block) + offsets]
+        keep = atoms < partners
+        atoms, partners = atoms[keep], partners[keep]
+        keep = ((points[atoms] - points[partners]) ** 2).sum(axis=1) <= cutoff * cutoff
+        pairs.append(np.stack([valid[atoms[keep]], valid[partners[keep]]], axis=1))
+
+    #sequence separation only applies within a chain, contacts across chains are always kept
+    contacts = np.concatenate(pairs).astype(np.intp)
+    contacts.sort(axis=1)
+    separated = contacts[:, 1] - contacts[:, 0] >= min_separation
+    if chain_ids is not None:
+        separated |= chain_ids[contacts[:, 0]] != chain_ids[contacts[:, 1]]
+    contacts = contacts[separated]
+    return contacts[np.lexsort((contacts[:, 1], contacts[:, 0]))]
+
+
+def find_contacts(coordinates, cutoff: float = DEFAULT_CUTOFF, min_separation: int = 3,
+                  chain_ids: Optional[Sequence] = None, chunk_size: int = 1 << 22):
+    """Return the residue contacts of one or many structure models.
+
+    Two residues are in contact when their representative atoms, e.g. C-alpha
+    or C-beta, are within cutoff of each other and, if they are in the same
+    chain, at least min_separation positions apart. Contacts are found with a
+    cell list rather than all-pairs distances, so the cost grows linearly with
+    the number of residues, and are returned as 0-based position pairs that
+    can be passed directly to :class:`ContactEnergy`.
+
+    Args:
+        coordinates: float array-like of shape (N, 3) for a single model, or
+                     (n_models, N, 3) for an ensemble, e.g. NMR models or
+                     trajectory frames. Residues with NaN coordinates are skipped.
+        cutoff: Distance cutoff, in the units of the coordinates. Defaults to 8.0.
+        min_separation: Minimum sequence separation |i - j| of contacts within
+                        a chain. Defaults to 3, excluding the contacts that
+                        every chain makes with its close backbone neighbours.
+        chain_ids: Optional array-like of N chain identifiers. Contacts between
+                   residues of different chains are kept whatever their
+                   separation. Defaults to a single chain.
+        chunk_size: Approximate number of candidate pairs evaluated at once,
+                    bounding memory for large complexes.
+
+    Returns:
+        intp numpy array of shape (n_contacts, 2) with i < j in each row, sorted
+        by i then j, for a single model, or a list of such arrays for an ensemble.
+
+    Raises:
+        ValueError: If coordinates is not of shape (N, 3) or (n_models, N, 3),
+                    cutoff is not positive, min_separation is below 1 or
+                    chain_ids is not of length N.
+    """
+    np = _require_numpy()
+    coordinates = np.asarray(coordinates, dtype=np.float64)
+    if coordinates.ndim not in (2, 3) or coordinates.shape[-1] != 3:
+        raise ValueError(f"coordinates must be of shape (N, 3) or (n_models, N, 3), got {coordinates.shape}.")
+    if not cutoff > 0:
+        raise ValueError(f"cutoff must be positive, got {cutoff}.")
+    if min_separation < 1:
+        raise ValueError(f"min_separation must be at least 1, got {min_separation}.")
+    if chain_ids is not None:
+        chain_ids = np.asarray(chain_ids)
+        if chain_ids.shape != coordinates.shape[-2:-1]:
+            raise ValueError(f"chain_ids must have one entry per residue ({coordinates.shape[-2]}), "
+                             f"got shape {chain_ids.shape}.")
+
+    if coordinates.ndim == 2:
+        return _model_contacts(coordinates, cutoff, min_separation, chain_ids, chunk_size)
+    return [_model_contacts(model, cutoff, min_separation, chain_ids, chunk_size) for model in coordinates]
+
+
+def _encode_sequences(sequences, length: int):
+    """Return the (n_seq, length) uint8 codes of one or many sequences of the given length.
+
+    Returns:
+        Tuple of the codes and whether a single sequence was given.
+
+    Raises:
+        TypeError: If sequences is not a string, list of strings or integer array.
+        ValueError: If a sequence contains invalid characters or is not of the given length.
+    """
+    np = _require_numpy()
+    single = isinstance(sequences, str)
+    if isinstance(sequences, np.ndarray):
+        if not np.issubdtype(sequences.dtype, np.integer):
+            raise TypeError(f"Code arrays must have an integer dtype, got {sequences.dtype}.")
+        single = sequences.ndim == 1
+        codes = np.atleast_2d(sequences)
+    elif single or isinstance(sequences, (list, tuple)):
+        encoded = [encode(sequence) for sequence in ([sequences] if single else sequences)]
+        codes = np.empty((len(encoded), length), dtype=np.uint8)
+        for row, seq_codes in enumerate(encoded):
+            if len(seq_codes) != length:
+                raise ValueError(f"Sequences must have the structure's length {length}, got {len(seq_codes)}.")
+            codes[row] = seq_codes
+    else:
+        raise TypeError(f"sequences must be a str, list of str or code array, got {type(sequences)}.")
+    if codes.shape[1] != length:
+        raise ValueError(f"Sequences must have the structure's length {length}, got {codes.shape[1]}.")
+    return codes, single
+
+
+class ContactEnergy:
+    """Contact energy of sequences threaded onto a fixed structure, from AAindex3 potentials.
+
+    The energy of a sequence s is the sum, over the residue contacts (i, j) of
+    the structure, of the potential M[s_i, s_j]. The contact list is turned
+    once into per-position neighbour lists (compressed sparse rows, padded to
+    the largest number of contacts of a position), and the potentials into a
+    flat (441, n_matrices) pair table including the ``-`` gap, which scores 0.
+    score() evaluates every contact for a batch of sequences; delta() scores
+    mutants of a parent sequence by visiting only the contacts of the
+    mutated positions, so screening candidates that differ from the parent at
+    a few positions costs O(n_mutated * max_contacts) rather than O(n_contacts).
+
+    Args:
+        contacts: Integer array-like of shape (n_contacts, 2) of the 0-based
+                  positions of the residues in each contact, e.g. from a
+                  distance cutoff on the structure's coordinates.
+        length: Number of residues of the structure.
+        matrices: Accession number, or list of accession numbers, of the
+                  AAindex3 potentials. Defaults to the Miyazawa-Jernigan
+                  contact energies, MIYS960102.
+        na_policy: How NA values in the potentials are replaced, see
+                   ``AAIndex3.to_array()``. Defaults to zero.
+
+    Attributes:
+        contacts: Read-only intp array of shape (n_contacts, 2).
+        length: Number of residues of the structure.
+        matrices: Accession numbers of the potentials.
+
+    Raises:
+        ValueError: If contacts is not of shape (n_contacts, 2), holds a
+                    position outside the structure or a self contact, or a
+                    matrix code or na_policy is invalid.
+    """
+    def __init__(self, contacts, length: int, matrices: Union[str, List[str]] = DEFAULT_POTENTIAL,
+                 na_policy: str = "zero") -> None:
+        np = _require_numpy()
+        contacts = np.array(contacts, dtype=np.intp)
+        if contacts.size == 0:
+            contacts = contacts.reshape(0, 2)
+        if contacts.ndim != 2 or contacts.shape[1] != 2:
+            raise ValueError(f"contacts must be an array of shape (n_contacts, 2), got {contacts.shape}.")
+        if contacts.size and (contacts.min() < 0 or contacts.max() >= length):
+            raise ValueError(f"Contact positions must be in the range 0-{length - 1}.")
+        if (contacts[:, 0] == contacts[:, 1]).any():
+            raise ValueError("Contacts must be between two different positions.")
+        contacts.flags.writeable = False
+        self.contacts = contacts
+        self.length = length
+        self._single_matrix = isinstance(matrices, str)
+        self.matrices = [matrices] if self._single_matrix else list(matrices)
+
+        #pair table indexed by code_i * 21 + code_j, zero for pairs with the gap
+        n_codes = len(ALPHABET)
+        tensor = aaindex3.to_tensor([aaindex3._normalise_code(code) for code in self.matrices], na_policy)
+        table = np.zeros((n_codes, n_codes, len(self.matrices)))
+        table[:len(AMINO_ACIDS), :len(AMINO_ACIDS)] = tensor.transpose(1, 2, 0)
+        self._table = table.reshape(n_codes * n_codes, len(self.matrices))
+
+        #neighbour lists: each contact is listed under both of its positions, with the partner
+        #position and whether the position is the first (row) member of the pair
+        ends = np.concatenate([contacts[:, 0], contacts[:, 1]])
+        order = np.argsort(ends, kind="stable")
+        partners = np.concatenate([contacts[:, 1], contacts[:, 0]])[order]
+        first = np.concatenate([np.ones(len(contacts), bool), np.zeros(len(contacts), bool)])[order]
+        counts = np.bincount(ends, minlength=length)
+        indptr = np.concatenate([[0], np.cumsum(counts)])
+        width = max(int(counts.max(initial=0)), 1)
+        slots = np.arange(len(ends)) - np.repeat(indptr[:-1], counts)
+        self._partners = np.zeros((length, width), dtype=np.intp)
+        self._first = np.zeros((length, width), dtype=bool)
+        self._valid = np.zeros((length, width), dtype=bool)
+        self._partners[ends[order], slots] = partners
+        self._first[ends[order], slots] = first
+        self._valid[ends[order], slots] = True
+
+    @classmethod
+    def from_coordinates(cls, coordinates, cutoff: float = DEFAULT_CUTOFF, min_separation: int = 3,
+                         chain_ids: Optional[Sequence] = None, matrices: Union[str, List[str]] = DEFAULT_POTENTIAL,
+                         na_policy: str = "zero") -> "ContactEnergy":
+        """Return a scorer over the contacts of a single (N, 3) structure model, see :func:`find_contacts`.
+
+        Raises:
+            ValueError: If coordinates is not of shape (N, 3), or see :func:`find_contacts`.
+        """
+        np = _require_numpy()
+        coordinates = np.asarray(coordinates, dtype=np.float64)
+        if coordinates.ndim != 2:
+            raise ValueError(f"coordinates must be a single model of shape (N, 3), got {coordinates.shape}.")
+        contacts = find_contacts(coordinates, cutoff, min_separation, chain_ids)
+        return cls(contacts, len(coordinates), matrices, na_policy)
+
+    def score(self, sequences, chunk_size: int = 1 << 22):
+        """Return the total contact energy of one or many sequences.
+
+        Args:
+            sequences: A sequence, a list of sequences, or an integer array of
+                       shape (n_seq, length) of codes from :func:`aaindex.encode`,
+                       each of the structure's length.
+            chunk_size: Approximate number of contact scores evaluated at once,
+                        bounding memory for large batches.
+
+        Returns:
+            float64 energy for a single sequence, or numpy array of shape
+            (n_seq,) for a batch, with a trailing n_matrices axis if a list of
+            matrices was given.
+
+        Raises:
+            TypeError: If sequences is not a string, list of strings or integer array.
+            ValueError: If a sequence contains invalid characters or is not of
+                        the structure's length.
+        """
+        np = _require_numpy()
+        codes, single = _encode_sequences(sequences, self.length)
+        out = np.empty((len(codes), len(self.matrices)))
+        step = max(1, chunk_size // max(len(self.contacts) * len(self.matrices), 1))
+        for start in range(0, len(codes), step):
+            block = codes[start:start + step].astype(np.intp)
+            pairs = block[:, self.contacts[:, 0]] * len(ALPHABET) + block[:, self.contacts[:, 1]]
+            out[start:start + step] = self._table[pairs].sum(axis=1)
+        return self._shape(out, single)
+
+    def delta(self, sequence: str, positions, residues, chunk_size: int = 1 << 22):
+        """Return the change in contact energy of mutants of a parent sequence.
+
+        Only the contacts of the mutated positions are visited. A contact
+        between two mutated positions is scored once, with both residues mutated.
+
+        Args:
+            sequence: Parent sequence, of the structure's length.
+            positions: 0-based mutated positions: an int or 1D array-like of k
+                       positions for a single mutant, or an array-like of shape
+                       (n_mutants, k) for a batch of mutants each mutated at k
+                       distinct positions.
+            residues: The residues at the mutated positions: a string of k
+                      residues for a single mutant, or a list of n_mutants
+                      such strings or a (n_mutants, k) integer code array for
+                      a batch.
+            chunk_size: Approximate number of contact scores evaluated at once,
+                        bounding memory for large batches.
+
+        Returns:
+            float64 energy change for a single mutant, or numpy array of shape
+            (n_mutants,) for a batch, with a trailing n_matrices axis if a list
+            of matrices was given.
+
+        Raises:
+            TypeError: If sequence is not a string.
+            ValueError: If a sequence or residue is invalid, the parent is not of
+                        the structure's length, positions and residues differ in
+                        shape, or a mutant repeats a position.
+            IndexError: If a position is outside the structure.
+        """
+        np = _require_numpy()
+        parent = _encode_sequences(sequence, self.length)[0][0].astype(np.intp)
+        positions = np.asarray(positions, dtype=np.intp)
+        single = positions.ndim < 2
+        positions = positions.reshape(1, -1) if single else positions
+        if isinstance(residues, (str, np.ndarray)) and single:
+            residues = [residues]
+        residues = np.array([encode(mutant) if isinstance(mutant, str) else mutant for mutant in residues],
+                            dtype=np.intp).reshape(len(residues), -1)
+        if positions.shape != residues.shape:
+            raise ValueError(f"positions and residues must have the same shape, got {positions.shape} "
+                             f"and {residues.shape}.")
+        if positions.size and (positions.min() < 0 or positions.max() >= self.length):
+            raise IndexError(f"Positions must be in the range 0-{self.length - 1}.")
+        if (np.diff(np.sort(positions, axis=1), axis=1) == 0).any():
+            raise ValueError("Mutants must not repeat a position.")
+
+        out = np.empty((len(positions), len(self.matrices)))
+        n_slots = max(positions.shape[1] * self._partners.shape[1] * len(self.matrices), 1)
+        step = max(1, chunk_size // n_slots)
+        for start in range(0, len(positions), step):
+            out[start:start + step] = self._delta(parent, positions[start:start + step],
+                                                  residues[start:start + step])
+        return self._shape(out, single)
+
+    def _delta(self, parent, positions, residues):
+        """Return the (n_mutants, n_matrices) energy changes of a chunk of mutants."""
+        np = _require_numpy()
+        n_mutants, k = positions.shape
+        n_codes = len(ALPHABET)
+        partners = self._partners[positions]
+        first = self._first[positions]
+
+        #partners mutated in the same mutant take their new residue, and their contact is
+        #seen from both ends, so each end contributes half of its change
+        same = partners[..., np.newaxis] == positions[:, np.newaxis, np.newaxis, :]
+        mutated = same.any(axis=-1)
+        partner_new = np.take_along_axis(residues, same.argmax(axis=-1).reshape(n_mutants, -1),
+                                         axis=1).reshape(partners.shape)
+        partner_old = parent[partners]
+        partner_new = np.where(mutated, partner_new, partner_old)
+
+        new, old = residues[..., np.newaxis], parent[positions][..., np.newaxis]
+        new_pairs = np.where(first, new * n_codes + partner_new, partner_new * n_codes + new)
+        old_pairs = np.where(first, old * n_codes + partner_old, partner_old * n_codes + old)
+        weights = np.where(self._valid[positions], np.where(mutated, 0.5, 1.0), 0.0)
+        changes = self._table[new_pairs] - self._table[old_pairs]
+        return np.einsum("nkd,nkdm->nm", weights, changes)
+
+    def single_mutant_deltas(self, sequence: str):
+        """Return the change in contact energy of every single-point mutant of a sequence.
+
+        Args:
+            sequence: Parent sequence, of the structure's length.
+
+        Returns:
+            float64 numpy array of shape (L, 20), mutant amino acids ordered as
+            :data:`aaindex.encoding.AMINO_ACIDS`, with a trailing n_matrices
+            axis if a list of matrices was given. The wild-type residue's entry is 0.
+
+        Raises:
+            ValueError: If the sequence is invalid or not of the structure's length.
+        """
+        np = _require_numpy()
+        n_aa = len(AMINO_ACIDS)
+        positions = np.repeat(np.arange(self.length), n_aa)[:, np.newaxis]
+        residues = np.tile(np.arange(n_aa), self.length)[:, np.newaxis]
+        deltas = self.delta(sequence, positions, residues)
+        return deltas.reshape((self.length, n_aa) + deltas.shape[1:])
+
+    def _shape(self, out, single: bool):
+        """Drop the batch and matrix axes of a result as requested by the inputs."""
+        if self._single_matrix:
+            out = out[:, 0]
+        return out[0] if single else out
+
+    def __len__(self) -> int:
+        """Return the number of contacts."""
+        return len(self.contacts)
+
+    def __repr__(self) -> str:
+        """Return a canonical string representation of this instance."""
+        return f"ContactEnergy(length={self.length}, contacts={len(self.contacts)}, matrices={self.matrices})"
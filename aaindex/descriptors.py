@@ -0,0 +1,719 @@
+################################################################################
+################            Sequence-Level Descriptors         #################
+################################################################################
+
+#importing required modules and dependencies
+import copy
+from typing import Iterable, List, Optional, Union
+
+from .aaindex1 import aaindex1
+from .aaindex2 import aaindex2
+from .aaindex3 import aaindex3
+from .encoding import ALPHABET, AMINO_ACIDS, GAP_CODE, MAX_TABLE_BYTES, _require_numpy, encode
+
+__all__: List[str] = ['moreau_broto', 'moran', 'geary', 'pseaac', 'sequence_order_coupling',
+                      'quasi_sequence_order', 'IncrementalDescriptors', 'PSEAAC_RECORDS']
+
+#AAindex1 records standing in for the hydrophobicity, hydrophilicity and side chain
+#mass used by Chou's original PseAAC; masses differ from molecular weights by a
+#constant, which standardisation removes
+PSEAAC_RECORDS: List[str] = ['EISD840101', 'HOPT810101', 'FASG760101']
+
+
+def _lags(lags: Union[int, Iterable[int]]) -> List[int]:
+    """Return the list of lags, an int n meaning lags 1 to n."""
+    if isinstance(lags, int):
+        lags = range(1, lags + 1)
+    lags = [int(lag) for lag in lags]
+    if not lags or min(lags) < 1:
+        raise ValueError(f"lags must be positive integers, got {lags}.")
+    return lags
+
+
+def _encode_batch(sequences: Union[str, List[str]]):
+    """Return the integer codes of a batch padded with the gap code.
+
+    Returns:
+        Tuple of the uint8 codes of shape (n_seq, max_len), the int64 sequence
+        lengths, and whether a single sequence was given.
+
+    Raises:
+        TypeError: If sequences is not a string or list of strings.
+        ValueError: If a sequence contains invalid characters.
+    """
+    np = _require_numpy()
+    single = isinstance(sequences, str)
+    if not single and not isinstance(sequences, (list, tuple)):
+        raise TypeError(f"sequences must be a str or list of str, got {type(sequences)}.")
+    encoded = [encode(sequence) for sequence in ([sequences] if single else sequences)]
+    lengths = np.array([len(seq_codes) for seq_codes in encoded], dtype=np.int64)
+    codes = np.full((len(encoded), max(int(lengths.max(initial=0)), 1)), GAP_CODE, dtype=np.uint8)
+    for row, seq_codes in enumerate(encoded):
+        codes[row, :len(seq_codes)] = seq_codes
+    return codes, lengths, single
+
+
+def _chunks(lengths, width: int, target: int = 1 << 20):
+    """Yield (rows, max_len) chunks of a batch for processing piecewise.
+
+    Sequences are grouped in order of length, each chunk holding about target
+    residue values (width values per residue) once trimmed to the longest
+    sequence in it. This bounds memory and, for batches of mixed lengths,
+    avoids computing over most of the padding.
+    """
+    np = _require_numpy()
+    order = np.argsort(lengths, kind="stable")
+    sorted_lengths = np.maximum(lengths[order], 1)
+    start = 0
+    while start < len(order):
+        stop = min(len(order), start + max(1, target // (width * int(sorted_lengths[start]))))
+        #shrink until the chunk, padded to its longest sequence, fits the target
+        while stop > start + 1 and (stop - start) * width * int(sorted_lengths[stop - 1]) > target:
+            stop = start + max(1, target // (width * int(sorted_lengths[stop - 1])))
+        yield order[start:stop], int(sorted_lengths[stop - 1])
+        start = stop
+
+
+def _property_batch(codes, lengths, record_codes: Optional[List[str]], normalisation: Optional[str],
+                    na_policy: str):
+    """Return the per-residue property values of an encoded batch and its validity mask.
+
+    Returns:
+        Tuple of the float64 values of shape (n_seq, n_indices, max_len), residues
+        last so that lagged products reduce over contiguous memory, with padding
+        set to 0; and the bool mask of shape (n_seq, max_len) of residue positions.
+    """
+    np = _require_numpy()
+    table = aaindex1._value_table(record_codes, normalisation, na_policy)
+    mask = np.arange(codes.shape[1])[np.newaxis, :] < lengths[:, np.newaxis]
+    values = np.take(table.T, codes, axis=1).transpose(1, 0, 2)
+    values = np.where(mask[:, np.newaxis, :], values, 0.0)
+    return values, mask
+
+
+def _centred(values, mask, lengths):
+    """Return the deviations of each property from its per-sequence mean, and their sum of squares."""
+    np = _require_numpy()
+    mean = values.sum(axis=2) / np.maximum(lengths, 1)[:, np.newaxis]
+    centred = np.where(mask[:, np.newaxis, :], values - mean[:, :, np.newaxis], 0.0)
+    return centred, np.einsum("nkl,nkl->nk", centred, centred)
+
+
+def _squared_differences(centred, sum_squares, cumulative, lengths, lag: int):
+    """Return the sum of (P_i - P_{i+lag})^2 over the pairs of each sequence, per property.
+
+    The sum is expanded into the squares of the first pair members (residues
+    0..L-lag-1), read from the running sums in cumulative, of the second
+    members (residues lag..L-1) and their cross product, so no per-lag
+    difference array is built. Deviations from the mean limit cancellation.
+    """
+    np = _require_numpy()
+    first_end = np.clip(lengths - lag - 1, 0, None)[:, np.newaxis, np.newaxis]
+    first = np.take_along_axis(cumulative, first_end, axis=2)[..., 0]
+    second = sum_squares - cumulative[..., lag - 1] if lag <= cumulative.shape[2] else 0.0
+    cross = np.einsum("nkl,nkl->nk", centred[..., :-lag], centred[..., lag:])
+    return np.maximum(first + second - 2 * cross, 0.0)
+
+
+def _composition(codes, lengths):
+    """Return the (n_seq, 20) frequencies of the canonical amino acids in an encoded batch."""
+    np = _require_numpy()
+    n_seq = codes.shape[0]
+    offsets = (np.arange(n_seq, dtype=np.int64) * (len(AMINO_ACIDS) + 1))[:, np.newaxis]
+    counts = np.bincount((codes + offsets).ravel(), minlength=n_seq * (len(AMINO_ACIDS) + 1))
+    counts = counts.reshape(n_seq, len(AMINO_ACIDS) + 1)[:, :len(AMINO_ACIDS)]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return counts / lengths[:, np.newaxis]
+
+
+def _autocorrelation(method: str, sequences, record_codes, lags, normalisation, na_policy):
+    """Compute the autocorrelation method for every lag over chunks of the batch."""
+    np = _require_numpy()
+    lags = _lags(lags)
+    codes, lengths, single = _encode_batch(sequences)
+    n_indices = aaindex1._value_table(record_codes, normalisation, na_policy).shape[1]
+    out = np.empty((len(lengths), len(lags), n_indices))
+    for rows, max_len in _chunks(lengths, n_indices):
+        values, mask = _property_batch(codes[rows, :max_len], lengths[rows], record_codes, normalisation, na_policy)
+        out[rows] = _autocorrelation_chunk(method, values, mask, lengths[rows], lags)
+    return out[0] if single else out
+
+
+def _autocorrelation_chunk(method: str, values, mask, lengths, lags: List[int]):
+    """Compute the autocorrelation method for every lag, one vectorised reduction per lag."""
+    np = _require_numpy()
+    n_seq, n_indices, _ = values.shape
+    out = np.full((n_seq, len(lags), n_indices), np.nan)
+
+    lengths_f = lengths[:, np.newaxis].astype(np.float64)
+    if method != "moreau_broto":
+        centred, sum_squares = _centred(values, mask, lengths)
+    if method == "geary":
+        cumulative = np.cumsum(centred ** 2, axis=2)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for col, lag in enumerate(lags):
+            n_pairs = lengths_f - lag
+            valid = n_pairs > 0
+            if method == "moreau_broto":
+                total = np.einsum("nkl,nkl->nk", values[..., :-lag], values[..., lag:])
+                result = total / n_pairs
+            elif method == "moran":
+                total = np.einsum("nkl,nkl->nk", centred[..., :-lag], centred[..., lag:])
+                result = (total / n_pairs) / (sum_squares / lengths_f)
+                valid = valid & (sum_squares > 0)
+            else:
+                total = _squared_differences(centred, sum_squares, cumulative, lengths, lag)
+                result = ((lengths_f - 1) / (2 * n_pairs)) * total / sum_squares
+                valid = valid & (sum_squares > 0)
+            out[:, col] = np.where(valid, result, np.nan)
+    return out
+
+
+def moreau_broto(sequences: Union[str, List[str]], record_codes: Optional[List[str]] = None,
+                 lags: Union[int, Iterable[int]] = 30, normalisation: Optional[str] = "zscore",
+                 na_policy: str = "zero"):
+    """Return the normalised Moreau-Broto autocorrelation of AAindex1 properties.
+
+    For lag d and a sequence of length L with property values P_i:
+
+        ATS(d) = sum_{i=1}^{L-d} P_i * P_{i+d} / (L - d)
+
+    Computed for every sequence, lag and index at once over the padded dense
+    property values, instead of per-residue lookups in Python loops.
+
+    Args:
+        sequences: A single sequence, or a list of sequences to compute as a batch.
+        record_codes: Accession numbers of the AAindex1 properties. Defaults to
+                      all records, ordered as record_codes().
+        lags: Maximum lag, computing lags 1 to lags, or an iterable of lags.
+              Defaults to 30.
+        normalisation: Normalisation applied to each property across the 20
+                       amino acids before computing, see ``AAIndex1.normalised()``.
+                       Defaults to "zscore"; None uses the raw values.
+        na_policy: How NA values are replaced, see ``AAIndex1.to_array()``.
+
+    Returns:
+        float64 numpy array of shape (n_lags, n_indices) for a single sequence,
+        or (n_seq, n_lags, n_indices) for a batch. Lags not shorter than the
+        sequence are NaN.
+
+    Raises:
+        ValueError: If a sequence contains invalid characters, a record code is
+                    not found, or a lag is not a positive integer.
+    """
+    return _autocorrelation("moreau_broto", sequences, record_codes, lags, normalisation, na_policy)
+
+
+def moran(sequences: Union[str, List[str]], record_codes: Optional[List[str]] = None,
+          lags: Union[int, Iterable[int]] = 30, normalisation: Optional[str] = "zscore",
+          na_policy: str = "zero"):
+    """Return the Moran autocorrelation of AAindex1 properties.
+
+    For lag d and a sequence of length L with property values P_i and mean P':
+
+        I(d) = [sum_{i=1}^{L-d} (P_i - P')(P_{i+d} - P') / (L - d)]
+               / [sum_{i=1}^{L} (P_i - P')^2 / L]
+
+    Args:
+        sequences: A single sequence, or a list of sequences to compute as a batch.
+        record_codes: Accession numbers of the AAindex1 properties. Defaults to
+                      all records, ordered as record_codes().
+        lags: Maximum lag, computing lags 1 to lags, or an iterable of lags.
+              Defaults to 30.
+        normalisation: Normalisation applied to each property before computing,
+                       see moreau_broto(). Defaults to "zscore".
+        na_policy: How NA values are replaced, see ``AAIndex1.to_array()``.
+
+    Returns:
+        float64 numpy array of shape (n_lags, n_indices) for a single sequence,
+        or (n_seq, n_lags, n_indices) for a batch. Lags not shorter than the
+        sequence, and properties constant along the sequence, are NaN.
+
+    Raises:
+        ValueError: If a sequence contains invalid characters, a record code is
+                    not found, or a lag is not a positive integer.
+    """
+    return _autocorrelation("moran", sequences, record_codes, lags, normalisation, na_policy)
+
+
+def geary(sequences: Union[str, List[str]], record_codes: Optional[List[str]] = None,
+          lags: Union[int, Iterable[int]] = 30, normalisation: Optional[str] = "zscore",
+          na_policy: str = "zero"):
+    """Return the Geary autocorrelation of AAindex1 properties.
+
+    For lag d and a sequence of length L with property values P_i and mean P':
+
+        C(d) = [(L - 1) / (2 (L - d))] * sum_{i=1}^{L-d} (P_i - P_{i+d})^2
+               / sum_{i=1}^{L} (P_i - P')^2
+
+    Args:
+        sequences: A single sequence, or a list of sequences to compute as a batch.
+        record_codes: Accession numbers of the AAindex1 properties. Defaults to
+                      all records, ordered as record_codes().
+        lags: Maximum lag, computing lags 1 to lags, or an iterable of lags.
+              Defaults to 30.
+        normalisation: Normalisation applied to each property before computing,
+                       see moreau_broto(). Defaults to "zscore".
+        na_policy: How NA values are replaced, see ``AAIndex1.to_array()``.
+
+    Returns:
+        float64 numpy array of shape (n_lags, n_indices) for a single sequence,
+        or (n_seq, n_lags, n_indices) for a batch. Lags not shorter than the
+        sequence, and properties constant along the sequence, are NaN.
+
+    Raises:
+        ValueError: If a sequence contains invalid characters, a record code is
+                    not found, or a lag is not a positive integer.
+    """
+    return _autocorrelation("geary", sequences, record_codes, lags, normalisation, na_policy)
+
+
+def _coupled_composition(codes, lengths, coupling, weight: float, single: bool):
+    """Return the 20 amino acid frequencies followed by the weighted coupling terms, normalised to sum to 1."""
+    np = _require_numpy()
+    frequencies = _composition(codes, lengths)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        denominator = frequencies.sum(axis=1, keepdims=True) + weight * coupling.sum(axis=1, keepdims=True)
+        out = np.concatenate([frequencies, weight * coupling], axis=1) / denominator
+    return out[0] if single else out
+
+
+def pseaac(sequences: Union[str, List[str]], record_codes: Optional[List[str]] = None,
+           lambda_: int = 30, weight: float = 0.05, na_policy: str = "zero"):
+    """Return Chou's (type 1) pseudo amino acid composition of sequences.
+
+    The first 20 components are the amino acid frequencies and the following
+    lambda_ are the sequence-order correlation factors
+
+        theta_j = 1 / (L - j) * sum_{i=1}^{L-j} Theta(R_i, R_{i+j})
+        Theta(R_i, R_k) = 1 / n * sum_{p=1}^{n} (H_p(R_k) - H_p(R_i))^2
+
+    over n AAindex1 properties H_p, each z-score standardised across the 20
+    amino acids. Frequencies f_u and factors are normalised together:
+
+        X_u = f_u / (sum f + weight * sum theta)         for u = 1..20
+        X_{20+j} = weight * theta_j / (sum f + weight * sum theta)
+
+    Args:
+        sequences: A single sequence, or a list of sequences to compute as a batch.
+        record_codes: Accession numbers of the AAindex1 properties. Defaults to
+                      PSEAAC_RECORDS: hydrophobicity (EISD840101), hydrophilicity
+                      (HOPT810101) and molecular weight (FASG760101).
+        lambda_: Number of sequence-order correlation factors. Defaults to 30.
+        weight: Weight of the correlation factors. Defaults to 0.05.
+        na_policy: How NA values are replaced, see ``AAIndex1.to_array()``.
+
+    Returns:
+        float64 numpy array of shape (20 + lambda_,) for a single sequence, or
+        (n_seq, 20 + lambda_) for a batch, amino acids ordered as
+        :data:`aaindex.encoding.AMINO_ACIDS`. Rows of sequences not longer than
+        lambda_ are NaN.
+
+    Raises:
+        ValueError: If a sequence contains invalid characters, a record code is
+                    not found, or lambda_ is not a positive integer.
+    """
+    np = _require_numpy()
+    lags = _lags(lambda_)
+    record_codes = record_codes or PSEAAC_RECORDS
+    codes, lengths, single = _encode_batch(sequences)
+    theta = np.empty((len(lengths), len(lags)))
+    for rows, max_len in _chunks(lengths, len(record_codes)):
+        chunk_lengths = lengths[rows]
+        values, mask = _property_batch(codes[rows, :max_len], chunk_lengths, record_codes, "zscore", na_policy)
+        centred, sum_squares = _centred(values, mask, chunk_lengths)
+        cumulative = np.cumsum(centred ** 2, axis=2)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            for col, lag in enumerate(lags):
+                total = _squared_differences(centred, sum_squares, cumulative, chunk_lengths, lag).mean(axis=1)
+                theta[rows, col] = np.where(chunk_lengths > lag, total / (chunk_lengths - lag), np.nan)
+    return _coupled_composition(codes, lengths, theta, weight, single)
+
+
+def _distance_matrix(matrix: str, na_policy: str):
+    """Return the (21, 21) dense matrix of an AAindex2 or AAindex3 record, zero in the gap row and column."""
+    np = _require_numpy()
+    code = matrix.strip().upper() if isinstance(matrix, str) else matrix
+    database = aaindex3 if code in aaindex3 else aaindex2
+    dense = database.to_array(matrix, na_policy)
+    padded = np.zeros((GAP_CODE + 1, GAP_CODE + 1))
+    padded[:len(AMINO_ACIDS), :len(AMINO_ACIDS)] = dense
+    return padded
+
+
+def sequence_order_coupling(sequences: Union[str, List[str]], matrix: str = "GRAR740104",
+                            lags: Union[int, Iterable[int]] = 30, na_policy: str = "zero"):
+    """Return the sequence-order coupling numbers of sequences under a distance matrix.
+
+    For lag d and a sequence R_1..R_L:
+
+        tau_d = sum_{i=1}^{L-d} dist(R_i, R_{i+d})^2
+
+    where dist is read from an AAindex2 or AAindex3 matrix, e.g. the Grantham
+    (GRAR740104) or Miyata (MIYT790101) amino acid distances, by gathering all
+    residue pairs of a lag at once.
+
+    Args:
+        sequences: A single sequence, or a list of sequences to compute as a batch.
+        matrix: Accession number of an AAindex2 or AAindex3 record. Defaults
+                to the Grantham chemical distance, GRAR740104.
+        lags: Maximum lag, computing lags 1 to lags, or an iterable of lags.
+              Defaults to 30.
+        na_policy: How NA values in the matrix are replaced, see
+                   ``AAIndex2.to_array()``. Defaults to zero.
+
+    Returns:
+        float64 numpy array of shape (n_lags,) for a single sequence, or
+        (n_seq, n_lags) for a batch. Lags not shorter than the sequence are NaN.
+        Gap characters contribute 0.
+
+    Raises:
+        ValueError: If a sequence contains invalid characters, the matrix
+                    record is not found, or a lag is not a positive integer.
+    """
+    lags = _lags(lags)
+    codes, lengths, single = _encode_batch(sequences)
+    out = _coupling(codes, lengths, lags, _distance_matrix(matrix, na_policy))
+    return out[0] if single else out
+
+
+def _coupling(codes, lengths, lags: List[int], distances):
+    """Return the (n_seq, n_lags) coupling numbers of an encoded batch for a (21, 21) distance matrix."""
+    np = _require_numpy()
+    squared = (distances ** 2).ravel()
+    out = np.empty((codes.shape[0], len(lags)))
+    for rows, max_len in _chunks(lengths, 1):
+        chunk = codes[rows, :max_len]
+        flat = chunk.astype(np.intp) * distances.shape[1]
+        for col, lag in enumerate(lags):
+            #padding uses the gap code, whose distances are 0
+            total = np.take(squared, flat[:, :-lag] + chunk[:, lag:]).sum(axis=1)
+            out[rows, col] = np.where(lengths[rows] > lag, total, np.nan)
+    return out
+
+
+def quasi_sequence_order(sequences: Union[str, List[str]], matrix: str = "GRAR740104",
+                         maxlag: int = 30, weight: float = 0.1, na_policy: str = "zero"):
+    """Return Chou's quasi-sequence-order descriptors of sequences.
+
+    The amino acid frequencies f_r and the sequence-order coupling numbers
+    tau_d (see sequence_order_coupling()) are normalised together:
+
+        X_r = f_r / (sum f + weight * sum tau)         for r = 1..20
+        X_{20+d} = weight * tau_d / (sum f + weight * sum tau)   for d = 1..maxlag
+
+    Args:
+        sequences: A single sequence, or a list of sequences to compute as a batch.
+        matrix: Accession number of the AAindex2 or AAindex3 distance matrix.
+                Defaults to the Grantham chemical distance, GRAR740104.
+        maxlag: Maximum lag of the coupling numbers. Defaults to 30.
+        weight: Weight of the coupling numbers. Defaults to 0.1.
+        na_policy: How NA values in the matrix are replaced. Defaults to zero.
+
+    Returns:
+        float64 numpy array of shape (20 + maxlag,) for a single sequence, or
+        (n_seq, 20 + maxlag) for a batch, amino acids ordered as
+        :data:`aaindex.encoding.AMINO_ACIDS`. Rows of sequences not longer than
+        maxlag are NaN.
+
+    Raises:
+        ValueError: If a sequence contains invalid characters, the matrix
+                    record is not found, or maxlag is not a positive integer.
+    """
+    lags = _lags(maxlag)
+    codes, lengths, single = _encode_batch(sequences)
+    tau = _coupling(codes, lengths, lags, _distance_matrix(matrix, na_policy))
+    return _coupled_composition(codes, lengths, tau, weight, single)
+
+
+def _sum_tree_build(tree, size: int) -> None:
+    """Fill the inner nodes of sum trees of shape (n_trees, 2 * size, n) from their leaves, level by level."""
+    width = size
+    while width > 1:
+        half = width // 2
+        tree[:, half:width] = tree[:, width:2 * width:2] + tree[:, width + 1:2 * width:2]
+        width = half
+
+
+def _sum_tree_update(tree, trees, leaves, size: int) -> None:
+    """Recompute the ancestors of changed (tree, leaf) pairs of sum trees, level by level.
+
+    Every node is recomputed as the sum of its two children, exactly as by
+    _sum_tree_build(), so updated trees are bit-identical to rebuilt ones.
+    """
+    np = _require_numpy()
+    nodes = leaves + size
+    while len(nodes) and nodes[0] > 1:
+        keys = np.unique(trees * (2 * size) + nodes // 2)
+        trees, nodes = keys // (2 * size), keys % (2 * size)
+        tree[trees, nodes] = tree[trees, 2 * nodes] + tree[trees, 2 * nodes + 1]
+
+
+def _sum_tree_range(tree, start: int, stop: int, size: int):
+    """Return the sum of leaves start to stop - 1 of a sum tree of shape (2 * size, n)."""
+    np = _require_numpy()
+    left = np.zeros(tree.shape[1])
+    right = np.zeros(tree.shape[1])
+    start, stop = start + size, stop + size
+    while start < stop:
+        if start & 1:
+            left = left + tree[start]
+            start += 1
+        if stop & 1:
+            stop -= 1
+            right = tree[stop] + right
+        start, stop = start // 2, stop // 2
+    return left + right
+
+
+#relative size of the variance, computed from sums of squares, below which a property is taken
+#to be constant along the sequence
+_CONSTANT_TOLERANCE: float = 1e-12
+
+
+def _window_sums(values, starts, window: int):
+    """Return the sums of values[s:s + window] for each start s, added left to right."""
+    sums = values[starts]
+    for offset in range(1, window):
+        sums = sums + values[starts + offset]
+    return sums
+
+
+class IncrementalDescriptors:
+    """Descriptors of a sequence kept up to date under residue substitutions.
+
+    Holds the per-residue AAindex1 property values of a sequence with the
+    aggregates behind its property means, sliding-window profiles and
+    Moreau-Broto, Moran and Geary autocorrelations. substitute() updates
+    them in O(window + n_lags * log L) per edited residue rather than O(L):
+    sums are kept in binary sum trees, with only the path from each edited
+    leaf to the root recomputed, and the sums of the windows overlapping an
+    edit are re-added. As every aggregate is reduced in a fixed order, the
+    descriptors after any sequence of edits are bit-identical to those of a
+    new instance built from the edited sequence. They agree with
+    ``AAIndex1.profiles()``, moreau_broto(), moran() and geary() to within
+    floating point rounding.
+
+    Edits are substitutions only; for insertions or deletions build a new
+    instance. Memory grows with n_lags * L * n_indices, so sum trees larger
+    than max_bytes are refused rather than built; select the indices needed
+    for long sequences.
+
+    Args:
+        sequence: Amino acid sequence.
+        record_codes: Accession numbers of the AAindex1 properties. Defaults to
+                      all records, ordered as record_codes().
+        windows: Window size or list of window sizes of the profiles.
+                 Defaults to 9.
+        lags: Maximum lag, tracking lags 1 to lags, or an iterable of lags.
+              Defaults to 30.
+        normalisation: Optional normalisation applied to each property first,
+                       see ``AAIndex1.normalised()``.
+        na_policy: How NA values are replaced, see ``AAIndex1.to_array()``.
+        max_bytes: Largest size of the sum trees, in bytes. Defaults to
+                   ``aaindex.encoding.MAX_TABLE_BYTES`` (256 MiB).
+
+    Raises:
+        TypeError: If sequence is not a string.
+        ValueError: If the sequence contains invalid characters, a record
+                    code is not found, a window or lag is not a positive
+                    integer, or the sum trees would take more than max_bytes.
+    """
+    def __init__(self, sequence: str, record_codes: Optional[List[str]] = None,
+                 windows: Union[int, List[int]] = 9, lags: Union[int, Iterable[int]] = 30,
+                 normalisation: Optional[str] = None, na_policy: str = "zero",
+                 max_bytes: int = MAX_TABLE_BYTES) -> None:
+        np = _require_numpy()
+        self.windows = [windows] if isinstance(windows, int) else [int(w) for w in windows]
+        if not self.windows or min(self.windows) < 1:
+            raise ValueError(f"windows must be a positive integer or list of them, got {windows}.")
+        self.lags = _lags(lags)
+        self._table = aaindex1._value_table(record_codes, normalisation, na_policy)
+        self._codes = encode(sequence).copy()
+        length, n_indices = len(self._codes), self._table.shape[1]
+        self._values = self._table[self._codes]
+
+        #sum trees of the values, their squares and, per lag d, the products P_i * P_{i+d}
+        self._size = 1 << max(length - 1, 0).bit_length()
+        nbytes = (2 + len(self.lags)) * 2 * self._size * n_indices * np.dtype(np.float64).itemsize
+        if nbytes > max_bytes:
+            raise ValueError(f"The sum trees of {n_indices} indices over {length} residues would take "
+                             f"{nbytes / (1 << 20):.0f} MiB, above max_bytes ({max_bytes / (1 << 20):.0f} MiB); "
+                             "select fewer indices with record_codes or raise max_bytes.")
+        self._trees = np.zeros((2 + len(self.lags), 2 * self._size, n_indices))
+        for tree in range(len(self._trees)):
+            positions = np.arange(length - (self.lags[tree - 2] if tree >= 2 else 0))
+            self._trees[tree, self._size:self._size + len(positions)] = self._leaves(tree, positions)
+        _sum_tree_build(self._trees, self._size)
+
+        #window sums, per window size, of each window that fits in the sequence
+        self._window_sums = [_window_sums(self._values, np.arange(max(length - w + 1, 0)), w)
+                             for w in self.windows]
+
+    def _leaves(self, tree: int, positions):
+        """Return the leaves of a sum tree at the given positions, which must be within its lag of the end."""
+        values = self._values
+        if tree == 0:
+            return values[positions]
+        if tree == 1:
+            return values[positions] * values[positions]
+        return values[positions] * values[positions + self.lags[tree - 2]]
+
+    @property
+    def sequence(self) -> str:
+        """The current sequence."""
+        return "".join(ALPHABET[code] for code in self._codes)
+
+    def substitute(self, position: int, residues: str) -> None:
+        """Substitute residues in place, starting at a 0-based position, and update the descriptors.
+
+        Args:
+            position: 0-based position of the first substituted residue.
+            residues: One or more replacement residues.
+
+        Raises:
+            TypeError: If residues is not a string.
+            ValueError: If residues contains invalid characters.
+            IndexError: If the substitution extends outside the sequence.
+        """
+        np = _require_numpy()
+        codes = encode(residues)
+        length = len(self._codes)
+        if position < 0 or position + len(codes) > length:
+            raise IndexError(f"Substitution of {len(codes)} residue(s) at position {position} is outside "
+                             f"the sequence of length {length}.")
+        if not len(codes):
+            return
+        stop = position + len(codes)
+        self._codes[position:stop] = codes
+        self._values[position:stop] = self._table[codes]
+
+        #changed leaves: the values and squares at the edit, and the products starting at
+        #or lag residues before an edited residue
+        edited = np.arange(position, stop)
+        trees, leaves = [0, 1], [edited, edited]
+        for tree, lag in enumerate(self.lags, start=2):
+            positions = np.union1d(edited[edited >= lag] - lag, edited)
+            trees.append(tree)
+            leaves.append(positions[positions < length - lag])
+        for tree, positions in zip(trees, leaves):
+            self._trees[tree, self._size + positions] = self._leaves(tree, positions)
+        tree_index = np.concatenate([np.full(len(positions), tree) for tree, positions in zip(trees, leaves)])
+        _sum_tree_update(self._trees, tree_index, np.concatenate(leaves), self._size)
+
+        for sums, w in zip(self._window_sums, self.windows):
+            starts = np.arange(max(position - w + 1, 0), min(stop, length - w + 1))
+            if len(starts):
+                sums[starts] = _window_sums(self._values, starts, w)
+
+    def copy(self) -> "IncrementalDescriptors":
+        """Return an independent copy, e.g. to branch a sequence into several variants."""
+        clone = copy.copy(self)
+        clone._codes = self._codes.copy()
+        clone._values = self._values.copy()
+        clone._trees = self._trees.copy()
+        clone._window_sums = [sums.copy() for sums in self._window_sums]
+        return clone
+
+    def mean(self):
+        """Return the mean of each property over the sequence, as an array of shape (n_indices,)."""
+        np = _require_numpy()
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return self._trees[0, 1] / len(self._codes)
+
+    def profiles(self):
+        """Return the sliding-window means of each property.
+
+        Laid out as ``AAIndex1.profiles()``: the mean of each window is placed
+        at its centre position, and positions where a window does not fit are NaN.
+
+        Returns:
+            float64 numpy array of shape (n_windows, L, n_indices).
+        """
+        np = _require_numpy()
+        length = len(self._codes)
+        out = np.full((len(self.windows), length, self._table.shape[1]), np.nan)
+        for row, (sums, w) in enumerate(zip(self._window_sums, self.windows)):
+            out[row, w // 2:w // 2 + len(sums)] = sums / w
+        return out
+
+    def _lag_sums(self):
+        """Yield, per lag, the lag, the product sum and the sums and sums of squares of both pair members."""
+        length, size = len(self._codes), self._size
+        for tree, lag in enumerate(self.lags, start=2):
+            if lag >= length:
+                yield lag, None, None, None
+                continue
+            first = (_sum_tree_range(self._trees[0], 0, length - lag, size),
+                     _sum_tree_range(self._trees[1], 0, length - lag, size))
+            second = (_sum_tree_range(self._trees[0], lag, length, size),
+                      _sum_tree_range(self._trees[1], lag, length, size))
+            yield lag, self._trees[tree, 1], first, second
+
+    def moreau_broto(self):
+        """Return the Moreau-Broto autocorrelation, see moreau_broto().
+
+        Returns:
+            float64 numpy array of shape (n_lags, n_indices), NaN for lags not
+            shorter than the sequence.
+        """
+        np = _require_numpy()
+        length = len(self._codes)
+        out = np.full((len(self.lags), self._table.shape[1]), np.nan)
+        for row, lag in enumerate(self.lags):
+            if lag < length:
+                out[row] = self._trees[2 + row, 1] / (length - lag)
+        return out
+
+    def moran(self):
+        """Return the Moran autocorrelation, see moran().
+
+        Returns:
+            float64 numpy array of shape (n_lags, n_indices), NaN for lags not
+            shorter than the sequence and for properties constant along it.
+        """
+        np = _require_numpy()
+        length = len(self._codes)
+        mean = self.mean()
+        variance = self._trees[1, 1] / length - mean * mean
+        constant = variance <= _CONSTANT_TOLERANCE * self._trees[1, 1] / length
+        out = np.full((len(self.lags), self._table.shape[1]), np.nan)
+        for row, (lag, products, first, second) in enumerate(self._lag_sums()):
+            if products is None:
+                continue
+            covariance = (products - mean * (first[0] + second[0])) / (length - lag) + mean * mean
+            with np.errstate(invalid="ignore", divide="ignore"):
+                out[row] = np.where(constant, np.nan, covariance / variance)
+        return out
+
+    def geary(self):
+        """Return the Geary autocorrelation, see geary().
+
+        Returns:
+            float64 numpy array of shape (n_lags, n_indices), NaN for lags not
+            shorter than the sequence and for properties constant along it.
+        """
+        np = _require_numpy()
+        length = len(self._codes)
+        mean = self.mean()
+        sum_squares = self._trees[1, 1] - length * mean * mean
+        constant = sum_squares <= _CONSTANT_TOLERANCE * self._trees[1, 1]
+        out = np.full((len(self.lags), self._table.shape[1]), np.nan)
+        for row, (lag, products, first, second) in enumerate(self._lag_sums()):
+            if products is None:
+                continue
+            differences = np.maximum(first[1] + second[1] - 2 * products, 0.0)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                out[row] = np.where(constant, np.nan,
+                                    (length - 1) / (2 * (length - lag)) * differences / sum_squares)
+        return out
+
+    def __len__(self) -> int:
+        """Return the length of the sequence."""
+        return len(self._codes)
+
+    def __repr__(self) -> str:
+        """Return a canonical string representation of this instance."""
+        return (f"IncrementalDescriptors(length={len(self._codes)}, indices={self._table.shape[1]}, "
+                f"windows={self.windows}, lags={len(self.lags)})")
@@ -0,0 +1,265 @@
+################################################################################
+################          Amino Acid Integer Encoding          #################
+################################################################################
+
+#importing required modules and dependencies
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+__all__: List[str] = ['AMINO_ACIDS', 'ALPHABET', 'GAP', 'GAP_CODE', 'AA_TO_INT', 'NA_POLICIES', 'MAX_KMER',
+                      'MAX_TABLE_BYTES', 'RAGGED_REDUCTIONS', 'encode', 'encode_kmers', 'ragged_reduce',
+                      'ragged_to_padded']
+
+#canonical residue ordering used in the row/col headers of AAindex2 and AAindex3
+AMINO_ACIDS: str = "ARNDCQEGHILKMFPSTWYV"
+
+#gap/absent amino acid placeholder, given a value of 0 in AAindex1
+GAP: str = "-"
+
+#full encoding alphabet: 20 canonical amino acids (codes 0-19) followed by the gap (code 20)
+ALPHABET: str = AMINO_ACIDS + GAP
+GAP_CODE: int = ALPHABET.index(GAP)
+
+#amino acid -> integer code lookup table
+AA_TO_INT: Dict[str, int] = {aa: i for i, aa in enumerate(ALPHABET)}
+
+#policies for replacing NA values when dense arrays are built:
+#  zero          - replace with 0
+#  nan           - replace with NaN
+#  mean          - replace with the mean of the index (AAindex1) or matrix column (AAindex2/3)
+#  diagonal_mean - replace with the mean of the matrix diagonal (AAindex2/3 only)
+#  raise         - raise a ValueError if any NA value is present
+NA_POLICIES: Tuple[str, ...] = ("zero", "nan", "mean", "diagonal_mean", "raise")
+
+#longest k-mer supported by the k-mer lookup tables, which have len(ALPHABET) ** k rows
+MAX_KMER: int = 5
+
+#default bound on the bytes of the k-mer tables and incremental descriptor sum trees, 256 MiB;
+#their size grows with the number of indices, so selecting all records can exhaust memory
+MAX_TABLE_BYTES: int = 1 << 28
+
+#per-sequence reductions supported on ragged (values, offsets) arrays
+RAGGED_REDUCTIONS: Tuple[str, ...] = ("sum", "mean", "min", "max", "std")
+
+#sentinel marking bytes that are not part of the alphabet in the byte lookup table
+_INVALID: int = 255
+
+
+def _require_numpy():
+    """Import and return numpy, raising an informative error if it is unavailable.
+
+    numpy is an optional dependency of aaindex, only needed for the array based
+    APIs; the dict based lookups continue to work without it.
+
+    Returns:
+        The numpy module.
+
+    Raises:
+        ImportError: If numpy is not installed.
+    """
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError(
+            "numpy is required for the array based aaindex APIs, "
+            "install it with: pip install aaindex[numpy]."
+        ) from e
+    return numpy
+
+
+def _check_na_policy(na_policy: str, allowed: Tuple[str, ...] = NA_POLICIES) -> None:
+    """Raise a ValueError if na_policy is not one of the allowed NA policies."""
+    if na_policy not in allowed:
+        raise ValueError(f"na_policy must be one of {list(allowed)}, got {na_policy!r}.")
+
+
+@lru_cache(maxsize=None)
+def _byte_table():
+    """Return a read-only 256-entry uint8 array mapping ASCII bytes to alphabet codes."""
+    np = _require_numpy()
+    table = np.full(256, _INVALID, dtype=np.uint8)
+    for aa, code in AA_TO_INT.items():
+        table[ord(aa)] = code
+        table[ord(aa.lower())] = code
+    table.flags.writeable = False
+    return table
+
+
+def encode(sequence: str):
+    """Encode an amino acid sequence into an array of integer codes.
+
+    Each residue is mapped to its index in :data:`ALPHABET` (the 20 canonical
+    amino acids in AAindex order, followed by the ``-`` gap at code 20).
+    Lowercase letters are accepted and leading/trailing whitespace is stripped.
+    The encoded array can be passed directly to the vectorised lookup methods,
+    e.g. ``AAIndex2.get_many``, avoiding per-residue string normalisation.
+
+    Args:
+        sequence: Amino acid sequence of single-letter codes.
+
+    Returns:
+        1D numpy uint8 array of integer codes, one per residue.
+
+    Raises:
+        TypeError: If sequence is not a string.
+        ValueError: If sequence contains characters outside the alphabet.
+    """
+    np = _require_numpy()
+    if not isinstance(sequence, str):
+        raise TypeError(f"sequence must be a string, got {type(sequence)}.")
+    try:
+        raw = sequence.strip().encode("ascii")
+    except UnicodeEncodeError as e:
+        raise ValueError("sequence contains non-ASCII characters.") from e
+
+    codes = _byte_table()[np.frombuffer(raw, dtype=np.uint8)]
+    if (codes == _INVALID).any():
+        invalid = sorted({chr(b) for b, c in zip(raw, codes.tolist()) if c == _INVALID})
+        raise ValueError(f"Invalid amino acid(s) found in sequence: {invalid}.")
+    return codes
+
+
+def encode_kmers(peptides: List[str]):
+    """Encode equal-length peptides into single integers indexing k-mer lookup tables.
+
+    Each peptide of length k is read as a base-21 number whose digits are the
+    :data:`ALPHABET` codes of its residues, first residue most significant, so
+    that ``AAIndex1.kmer_table(k)`` can be indexed with the result directly.
+    All peptides are converted in one pass over a single concatenated buffer.
+
+    Args:
+        peptides: List of peptides, all of the same length k, at most MAX_KMER.
+                  Lowercase letters are accepted.
+
+    Returns:
+        1D numpy intp array of k-mer codes, one per peptide.
+
+    Raises:
+        TypeError: If peptides is not a list of strings.
+        ValueError: If the peptides differ in length, are empty or longer than
+                    MAX_KMER, or contain characters outside the alphabet.
+    """
+    np = _require_numpy()
+    if isinstance(peptides, str) or not isinstance(peptides, (list, tuple)):
+        raise TypeError(f"peptides must be a list of str, got {type(peptides)}.")
+    if not peptides:
+        return np.empty(0, dtype=np.intp)
+    try:
+        lengths = set(map(len, peptides))
+        raw = "".join(peptides).encode("ascii")
+    except TypeError as e:
+        raise TypeError("peptides must be a list of str.") from e
+    except UnicodeEncodeError as e:
+        raise ValueError("peptides contain non-ASCII characters.") from e
+    if len(lengths) != 1:
+        raise ValueError(f"peptides must all have the same length, got lengths {sorted(lengths)}.")
+    k = lengths.pop()
+    if not 1 <= k <= MAX_KMER:
+        raise ValueError(f"peptide length must be between 1 and {MAX_KMER}, got {k}.")
+
+    codes = _byte_table()[np.frombuffer(raw, dtype=np.uint8)]
+    if (codes == _INVALID).any():
+        invalid = sorted({chr(b) for b, c in zip(raw, codes.tolist()) if c == _INVALID})
+        raise ValueError(f"Invalid amino acid(s) found in peptides: {invalid}.")
+    powers = len(ALPHABET) ** np.arange(k - 1, -1, -1, dtype=np.intp)
+    return codes.reshape(len(peptides), k).astype(np.intp) @ powers
+
+
+def _check_offsets(values, offsets):
+    """Return offsets as a validated intp array delimiting the rows of values.
+
+    Raises:
+        ValueError: If offsets is not a non-decreasing 1D array running from 0
+                    to the number of rows of values.
+    """
+    np = _require_numpy()
+    offsets = np.asarray(offsets, dtype=np.intp)
+    if offsets.ndim != 1 or len(offsets) == 0 or offsets[0] != 0 or offsets[-1] != len(values) \
+            or (np.diff(offsets) < 0).any():
+        raise ValueError(f"offsets must be a non-decreasing 1D array from 0 to the number of rows "
+                         f"({len(values)}).")
+    return offsets
+
+
+def ragged_reduce(values, offsets, reduction: str = "mean"):
+    """Reduce each sequence of a ragged array without unpacking it.
+
+    A ragged array stores the per-residue rows of a batch of sequences back to
+    back, sequence i occupying ``values[offsets[i]:offsets[i + 1]]``, as
+    returned by ``AAIndex1.encode_values(..., ragged=True)``. Reductions are
+    computed with ``ufunc.reduceat`` over the segment boundaries in a single
+    pass.
+
+    Args:
+        values: numpy array of shape (total_residues, ...).
+        offsets: Integer array of shape (n_sequences + 1,) of segment boundaries.
+        reduction: One of "sum", "mean", "min", "max" or "std" (population
+                   standard deviation).
+
+    Returns:
+        float64 numpy array of shape (n_sequences, ...). Empty sequences have a
+        sum of 0 and NaN for the other reductions.
+
+    Raises:
+        ValueError: If offsets does not delimit the rows of values, or the
+                    reduction is unknown.
+    """
+    np = _require_numpy()
+    values = np.asarray(values)
+    offsets = _check_offsets(values, offsets)
+    if reduction not in RAGGED_REDUCTIONS:
+        raise ValueError(f"Invalid reduction {reduction!r}, expected one of {RAGGED_REDUCTIONS}.")
+    lengths = np.diff(offsets)
+    nonempty = lengths > 0
+    #reduceat over the starts of non-empty segments only, as it would return a row for empty ones
+    starts = offsets[:-1][nonempty]
+    counts = lengths[nonempty].reshape((-1, ) + (1, ) * (values.ndim - 1))
+
+    out = np.full((len(lengths), ) + values.shape[1:], 0.0 if reduction == "sum" else np.nan)
+    if not len(starts):
+        return out
+    if reduction in ("min", "max"):
+        ufunc = np.minimum if reduction == "min" else np.maximum
+        out[nonempty] = ufunc.reduceat(values, starts, axis=0)
+        return out
+    sums = np.add.reduceat(values, starts, axis=0, dtype=np.float64)
+    if reduction == "sum":
+        out[nonempty] = sums
+        return out
+    means = sums / counts
+    if reduction == "mean":
+        out[nonempty] = means
+        return out
+    centred = values[offsets[0]:offsets[-1]] - np.repeat(means, lengths[nonempty], axis=0)
+    out[nonempty] = np.sqrt(np.add.reduceat(centred * centred, starts, axis=0) / counts)
+    return out
+
+
+def ragged_to_padded(values, offsets, max_len: Optional[int] = None, fill_value: float = 0.0):
+    """Unpack a ragged array into a padded batch.
+
+    Args:
+        values: numpy array of shape (total_residues, ...).
+        offsets: Integer array of shape (n_sequences + 1,) of segment boundaries.
+        max_len: Length that sequences are padded or truncated to. Defaults to
+                 the length of the longest sequence.
+        fill_value: Value of the padding positions. Defaults to 0, the value of
+                    the ``-`` gap in AAIndex1.encode_values().
+
+    Returns:
+        numpy array of shape (n_sequences, max_len, ...) of the dtype of values.
+
+    Raises:
+        ValueError: If offsets does not delimit the rows of values.
+    """
+    np = _require_numpy()
+    values = np.asarray(values)
+    offsets = _check_offsets(values, offsets)
+    lengths = np.diff(offsets)
+    if max_len is None:
+        max_len = int(lengths.max(initial=0))
+    out = np.full((len(lengths), max_len) + values.shape[1:], fill_value, dtype=values.dtype)
+    positions = np.arange(len(values)) - np.repeat(offsets[:-1], lengths)
+    keep = positions < max_len
+    out[np.repeat(np.arange(len(lengths)), lengths)[keep], positions[keep]] = values[keep]
+    return out
@@ -0,0 +1,53 @@
+################################################################################
+################              Pair Feature Generation          #################
+################################################################################
+
+#importing required modules and dependencies
+from typing import List
+
+from .aaindex2 import aaindex2
+from .aaindex3 import aaindex3
+from .encoding import _require_numpy
+
+__all__: List[str] = ['pair_features', 'pair_feature_codes']
+
+
+def pair_feature_codes() -> List[str]:
+    """Return the accession numbers labelling the columns of pair_features().
+
+    Returns:
+        List of all AAindex2 record codes followed by all AAindex3 record codes,
+        each in sorted order.
+    """
+    return aaindex2.record_codes() + aaindex3.record_codes()
+
+
+def pair_features(aa_i, aa_j, na_policy: str = "nan"):
+    """Return the score from every AAindex2 and AAindex3 matrix for each residue pair.
+
+    Gathers from the cached stacked tensors of both databases in one vectorised
+    call per database, replacing one get() call per matrix per pair.
+
+    Args:
+        aa_i: Amino acid sequence string or integer code array (from
+              :func:`aaindex.encode`) for the first residue of each pair.
+        aa_j: Sequence string or integer code array of the same length for the
+              second residue of each pair.
+        na_policy: How NA values are replaced, see ``AAIndex2.to_array()``.
+                   Defaults to NaN.
+
+    Returns:
+        float64 numpy array of shape (n_pairs, 141): the 94 AAindex2 scores
+        followed by the 47 AAindex3 scores, in the column order given by
+        pair_feature_codes().
+
+    Raises:
+        ValueError: If aa_i and aa_j differ in length or na_policy is invalid.
+        IndexError: If a code is outside the range of the 20 amino acids.
+    """
+    np = _require_numpy()
+    return np.concatenate(
+        [aaindex2.pair_features(aa_i, aa_j, na_policy=na_policy),
+         aaindex3.pair_features(aa_i, aa_j, na_policy=na_policy)],
+        axis=-1,
+    )
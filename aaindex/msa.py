@@ -0,0 +1,311 @@
+################################################################################
+################          Multiple Sequence Alignment Scoring  #################
+################################################################################
+
+#importing required modules and dependencies
+from typing import Iterator, List, Optional, Union
+
+from ._aaindex_matrix import Map
+from .aaindex1 import aaindex1
+from .aaindex2 import aaindex2
+from .encoding import ALPHABET, AMINO_ACIDS, GAP_CODE, _require_numpy, encode
+from .mutations import DEFAULT_MATRIX
+
+__all__: List[str] = ['column_counts', 'henikoff_weights', 'column_scores', 'sum_of_pairs', 'column_properties',
+                       'iter_column_properties']
+
+#how gaps enter column property statistics
+GAP_HANDLING: List[str] = ["ignore", "value"]
+
+
+def _encode_alignment(alignment):
+    """Return the (n_seq, n_columns) uint8 codes of an alignment.
+
+    Raises:
+        TypeError: If alignment is not a list of strings or an integer array.
+        ValueError: If the aligned sequences differ in length or contain invalid characters.
+    """
+    np = _require_numpy()
+    if isinstance(alignment, np.ndarray):
+        if alignment.ndim != 2 or not np.issubdtype(alignment.dtype, np.integer):
+            raise TypeError(f"Alignment arrays must be 2D integer code arrays, got {alignment.dtype} "
+                            f"of shape {alignment.shape}.")
+        if alignment.size and (alignment.min() < 0 or alignment.max() > GAP_CODE):
+            raise ValueError(f"Alignment codes must be in the range 0-{GAP_CODE}.")
+        return alignment
+    if not isinstance(alignment, (list, tuple)):
+        raise TypeError(f"alignment must be a list of str or a code array, got {type(alignment)}.")
+    n_columns = len(alignment[0]) if alignment else 0
+    codes = np.empty((len(alignment), n_columns), dtype=np.uint8)
+    for row, sequence in enumerate(alignment):
+        if len(sequence) != n_columns:
+            raise ValueError(f"Aligned sequences must all have length {n_columns}, got {len(sequence)} "
+                             f"for sequence {row}.")
+        codes[row] = encode(sequence)
+    return codes
+
+
+def _sequence_weights(codes, weights):
+    """Return the float64 (n_seq,) weights of an alignment from None, "henikoff" or an array-like.
+
+    Raises:
+        ValueError: If weights is an unknown string or not of length n_seq.
+    """
+    np = _require_numpy()
+    if weights is None:
+        return np.ones(len(codes))
+    if isinstance(weights, str):
+        if weights != "henikoff":
+            raise ValueError(f"Unknown weighting scheme {weights!r}, expected 'henikoff' or an array of weights.")
+        return henikoff_weights(codes)
+    weights = np.asarray(weights, dtype=np.float64)
+    if weights.shape != (len(codes), ):
+        raise ValueError(f"weights must have one entry per sequence ({len(codes)}), got shape {weights.shape}.")
+    return weights
+
+
+def column_counts(alignment, weights=None, chunk_size: int = 1 << 22):
+    """Return the (weighted) number of each residue and the gap in every alignment column.
+
+    Args:
+        alignment: List of aligned sequences of equal length, or an integer
+                   array of shape (n_seq, n_columns) of codes from
+                   :func:`aaindex.encode`.
+        weights: Optional float array-like of n_seq sequence weights.
+                 Defaults to 1 for every sequence.
+        chunk_size: Approximate number of alignment cells counted at once,
+                    bounding memory for large alignments.
+
+    Returns:
+        float64 numpy array of shape (n_columns, 21), columns of the second axis
+        ordered as :data:`aaindex.encoding.ALPHABET` with the gap last.
+
+    Raises:
+        TypeError: If alignment is not a list of strings or an integer array.
+        ValueError: If the aligned sequences differ in length or contain
+                    invalid characters, or weights is not of length n_seq.
+    """
+    np = _require_numpy()
+    codes = _encode_alignment(alignment)
+    weights = _sequence_weights(codes, weights)
+    n_seq, n_columns = codes.shape
+    n_codes = len(ALPHABET)
+
+    #each cell is binned at column * 21 + code, a block of sequences at a time
+    column_offsets = np.arange(n_columns, dtype=np.intp) * n_codes
+    counts = np.zeros(n_columns * n_codes)
+    step = max(1, chunk_size // max(n_columns, 1))
+    for start in range(0, n_seq, step):
+        block = codes[start:start + step]
+        bins = (block + column_offsets).ravel()
+        counts += np.bincount(bins, weights=np.repeat(weights[start:start + step], n_columns),
+                              minlength=len(counts))
+    return counts.reshape(n_columns, n_codes)
+
+
+def henikoff_weights(alignment, chunk_size: int = 1 << 22):
+    """Return the position-based sequence weights of Henikoff and Henikoff (1994).
+
+    In a column with r distinct symbols, a sequence whose symbol occurs n
+    times receives 1 / (r * n); the weight of a sequence is the sum over all
+    columns, so sequences from over-represented subfamilies are down-weighted.
+    The gap is counted as a symbol. Weights are scaled to a mean of 1, so
+    weighted scores stay on the scale of unweighted ones.
+
+    Args:
+        alignment: List of aligned sequences of equal length, or an integer
+                   array of shape (n_seq, n_columns) of codes from
+                   :func:`aaindex.encode`.
+        chunk_size: Approximate number of alignment cells processed at once,
+                    bounding memory for large alignments.
+
+    Returns:
+        float64 numpy array of shape (n_seq,).
+
+    Raises:
+        TypeError: If alignment is not a list of strings or an integer array.
+        ValueError: If the aligned sequences differ in length or contain invalid characters.
+    """
+    np = _require_numpy()
+    codes = _encode_alignment(alignment)
+    counts = column_counts(codes, chunk_size=chunk_size)
+    n_seq, n_columns = codes.shape
+    if n_seq == 0:
+        return np.empty(0)
+
+    #share of each symbol in each column, 1 / (r * n), gathered per sequence
+    with np.errstate(divide="ignore"):
+        shares = 1.0 / (counts * (counts > 0).sum(axis=1, keepdims=True))
+    weights = np.empty(n_seq)
+    columns = np.arange(n_columns)
+    step = max(1, chunk_size // max(n_columns, 1))
+    for start in range(0, n_seq, step):
+        weights[start:start + step] = shares[columns, codes[start:start + step]].sum(axis=1)
+    total = weights.sum()
+    return weights * (n_seq / total) if total > 0 else np.ones(n_seq)
+
+
+def column_scores(alignment, matrices: Union[str, List[str]] = DEFAULT_MATRIX, weights=None,
+                  gap_score: float = 0.0, gap_gap_score: float = 0.0, na_policy: str = "zero",
+                  chunk_size: int = 1 << 22):
+    """Return the sum-of-pairs score of every column of an alignment under AAindex2 matrices.
+
+    The score of a column is the sum, over all pairs of sequences s < t, of
+    w_s * w_t * S[a_s, a_t], where S is the substitution matrix extended with
+    gap_score for residue-gap pairs and gap_gap_score for gap-gap pairs.
+    Rather than visiting the O(n_seq^2) pairs, it is computed from the
+    weighted residue counts c of the column and the per-residue sums of
+    squared weights q as (c^T S c - q . diag(S)) / 2, so the cost is linear
+    in the number of sequences. Asymmetric matrices score each pair with the
+    mean of both orientations.
+
+    Args:
+        alignment: List of aligned sequences of equal length, or an integer
+                   array of shape (n_seq, n_columns) of codes from
+                   :func:`aaindex.encode`.
+        matrices: Accession number, or list of accession numbers, of the
+                  AAindex2 matrices. Defaults to BLOSUM62 (HENS920102).
+        weights: Sequence weights: None for uniform weights, "henikoff" for
+                 henikoff_weights(), or a float array-like of n_seq weights.
+        gap_score: Score of a pair of a residue and a gap. Defaults to 0.
+        gap_gap_score: Score of a pair of gaps. Defaults to 0.
+        na_policy: How NA values in the matrices are replaced, see
+                   ``AAIndex2.to_array()``. Defaults to zero.
+        chunk_size: Approximate number of alignment cells counted at once,
+                    bounding memory for large alignments.
+
+    Returns:
+        float64 numpy array of shape (n_columns,), with a trailing n_matrices
+        axis if a list of matrices was given.
+
+    Raises:
+        TypeError: If alignment is not a list of strings or an integer array.
+        ValueError: If the aligned sequences differ in length or contain invalid
+                    characters, weights is invalid, or a matrix code or
+                    na_policy is invalid.
+    """
+    np = _require_numpy()
+    codes = _encode_alignment(alignment)
+    weights = _sequence_weights(codes, weights)
+    record_codes = [matrices] if isinstance(matrices, str) else list(matrices)
+    tensor = aaindex2.to_tensor([aaindex2._normalise_code(code) for code in record_codes], na_policy)
+
+    #(n_matrices, 21, 21) score tables with the gap mapped explicitly
+    n_aa = len(AMINO_ACIDS)
+    table = np.full((len(record_codes), len(ALPHABET), len(ALPHABET)), float(gap_score))
+    table[:, :n_aa, :n_aa] = tensor
+    table[:, GAP_CODE, GAP_CODE] = gap_gap_score
+
+    counts = column_counts(codes, weights, chunk_size)
+    squares = column_counts(codes, weights * weights, chunk_size)
+    pairs = np.einsum("la,mab,lb->lm", counts, table, counts)
+    self_pairs = squares @ np.diagonal(table, axis1=1, axis2=2).T
+    out = (pairs - self_pairs) / 2
+    return out[:, 0] if isinstance(matrices, str) else out
+
+
+def sum_of_pairs(alignment, matrices: Union[str, List[str]] = DEFAULT_MATRIX, weights=None,
+                 gap_score: float = 0.0, gap_gap_score: float = 0.0, na_policy: str = "zero",
+                 chunk_size: int = 1 << 22):
+    """Return the total sum-of-pairs score of an alignment, the sum of its column_scores().
+
+    Returns:
+        float64 score, or numpy array of shape (n_matrices,) if a list of matrices was given.
+
+    Raises:
+        TypeError: If alignment is not a list of strings or an integer array.
+        ValueError: See column_scores().
+    """
+    return column_scores(alignment, matrices, weights, gap_score, gap_gap_score, na_policy,
+                         chunk_size).sum(axis=0)
+
+
+def iter_column_properties(alignment, record_codes: Optional[Union[str, List[str]]] = None,
+                           normalisation: Optional[str] = None, na_policy: str = "zero", gaps: str = "ignore",
+                           weights=None, block_size: int = 1024) -> Iterator[Map]:
+    """Yield the AAindex1 property mean and variance of alignment columns, a block of columns at a time.
+
+    Each block is reduced to its weighted (block_size, 21) residue counts in
+    a single pass over the sequences, and the statistics follow from the
+    counts and the cached (21, n_indices) value table, without materialising
+    the per-residue property values. Only one block of columns is read at a
+    time, so huge alignments can be streamed from a memory-mapped code array
+    (e.g. ``numpy.load(path, mmap_mode="r")``) and the results written out
+    block by block.
+
+    Args:
+        alignment: List of aligned sequences of equal length, or an integer
+                   array of shape (n_seq, n_columns) of codes from
+                   :func:`aaindex.encode`.
+        record_codes: Accession number, or list of accession numbers, of the
+                      AAindex1 properties. Defaults to all records, ordered as
+                      record_codes().
+        normalisation: Optional normalisation method applied to each property,
+                       see ``AAIndex1.normalised()``.
+        na_policy: How NA values are replaced, see ``AAIndex1.to_array()``.
+        gaps: "ignore" to compute the statistics over the residues of each
+              column only, or "value" to count gaps with the ``-`` value of 0.
+        weights: Sequence weights: None for uniform weights, "henikoff" for
+                 henikoff_weights(), or a float array-like of n_seq weights.
+        block_size: Number of columns per block.
+
+    Yields:
+        Map with the ``start`` and ``stop`` columns of the block and float64
+        ``mean`` and ``variance`` (weighted, population) arrays of shape
+        (stop - start, n_indices), the last axis dropped if record_codes is a
+        str. Columns without residues are NaN when gaps are ignored.
+
+    Raises:
+        TypeError: If alignment is not a list of strings or an integer array.
+        ValueError: If the aligned sequences differ in length or contain
+                    invalid characters, or weights, gaps, block_size, a record
+                    code, normalisation or na_policy is invalid.
+    """
+    np = _require_numpy()
+    if gaps not in GAP_HANDLING:
+        raise ValueError(f"Invalid gap handling {gaps!r}, expected one of {GAP_HANDLING}.")
+    if block_size < 1:
+        raise ValueError(f"block_size must be at least 1, got {block_size}.")
+    codes = _encode_alignment(alignment)
+    weights = _sequence_weights(codes, weights)
+    table = aaindex1._value_table([record_codes] if isinstance(record_codes, str) else record_codes,
+                                  normalisation, na_policy)
+
+    for start in range(0, codes.shape[1], block_size):
+        stop = min(start + block_size, codes.shape[1])
+        counts = column_counts(codes[:, start:stop], weights)
+        if gaps == "ignore":
+            counts[:, GAP_CODE] = 0
+        totals = counts.sum(axis=1, keepdims=True)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = (counts @ table) / totals
+            variance = np.einsum("la,lan->ln", counts, (table - mean[:, np.newaxis, :]) ** 2) / totals
+        if isinstance(record_codes, str):
+            mean, variance = mean[:, 0], variance[:, 0]
+        yield Map(start=start, stop=stop, mean=mean, variance=variance)
+
+
+def column_properties(alignment, record_codes: Optional[Union[str, List[str]]] = None,
+                      normalisation: Optional[str] = None, na_policy: str = "zero", gaps: str = "ignore",
+                      weights=None, block_size: int = 1024) -> Map:
+    """Return the AAindex1 property mean and variance of every alignment column.
+
+    Collects the blocks of iter_column_properties(), see there for the arguments.
+
+    Returns:
+        Map of float64 ``mean`` and ``variance`` arrays of shape
+        (n_columns, n_indices), the last axis dropped if record_codes is a str.
+
+    Raises:
+        TypeError: If alignment is not a list of strings or an integer array.
+        ValueError: See iter_column_properties().
+    """
+    np = _require_numpy()
+    blocks = list(iter_column_properties(alignment, record_codes, normalisation, na_policy, gaps, weights,
+                                         block_size))
+    if not blocks:
+        n_indices = () if isinstance(record_codes, str) else \
+            (aaindex1._value_table(record_codes, normalisation, na_policy).shape[1], )
+        return Map(mean=np.empty((0, ) + n_indices), variance=np.empty((0, ) + n_indices))
+    return Map(mean=np.concatenate([block.mean for block in blocks]),
+               variance=np.concatenate([block.variance for block in blocks]))
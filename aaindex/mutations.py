@@ -0,0 +1,141 @@
+################################################################################
+################             Mutational Scan Scoring           #################
+################################################################################
+
+#importing required modules and dependencies
+from typing import List, Optional, Union
+
+from .aaindex1 import aaindex1
+from .aaindex2 import aaindex2
+from .encoding import AMINO_ACIDS, GAP_CODE, _require_numpy, encode
+
+__all__: List[str] = ['property_deltas', 'substitution_scores', 'DEFAULT_MATRIX']
+
+#BLOSUM62 (Henikoff and Henikoff, 1992), the default substitution matrix
+DEFAULT_MATRIX: str = "HENS920102"
+
+
+def _encode_padded(sequences: Union[str, List[str]], max_len: Optional[int]):
+    """Return the integer codes of one or a batch of sequences, padded with the gap code.
+
+    Returns:
+        Tuple of the uint8 codes of shape (n_seq, max_len) and whether a single
+        sequence was given.
+
+    Raises:
+        TypeError: If sequences is not a string or list of strings.
+        ValueError: If a sequence contains invalid characters.
+    """
+    np = _require_numpy()
+    single = isinstance(sequences, str)
+    if single:
+        return encode(sequences)[np.newaxis, :], True
+    if not isinstance(sequences, (list, tuple)):
+        raise TypeError(f"sequences must be a str or list of str, got {type(sequences)}.")
+    encoded = [encode(sequence) for sequence in sequences]
+    if max_len is None:
+        max_len = max((len(seq_codes) for seq_codes in encoded), default=0)
+    codes = np.full((len(encoded), max_len), GAP_CODE, dtype=np.uint8)
+    for row, seq_codes in enumerate(encoded):
+        seq_codes = seq_codes[:max_len]
+        codes[row, :len(seq_codes)] = seq_codes
+    return codes, False
+
+
+def property_deltas(sequences: Union[str, List[str]], record_codes: Optional[Union[str, List[str]]] = None,
+                    normalisation: Optional[str] = None, na_policy: str = "zero",
+                    max_len: Optional[int] = None):
+    """Return the change in AAindex1 properties of every single-point mutant.
+
+    For position i of a sequence s, mutant amino acid a and property P:
+
+        delta[i, a] = P(a) - P(s_i)
+
+    Mutant amino acids follow :data:`aaindex.encoding.AMINO_ACIDS`, so the
+    slice at the wild-type residue is 0 and the other 19 hold the point
+    mutants. The whole scan is a single broadcast subtraction over a gather
+    from the cached AAindex1 value table, for one or a batch of parent
+    sequences.
+
+    Args:
+        sequences: A single sequence, or a list of parent sequences to scan as a batch.
+        record_codes: Accession number, or list of accession numbers, of the
+                      AAindex1 properties. Defaults to all records, ordered as
+                      record_codes().
+        normalisation: Optional normalisation method applied to each property,
+                       see ``AAIndex1.normalised()``.
+        na_policy: How NA values are replaced, see ``AAIndex1.to_array()``.
+        max_len: Length that batched sequences are padded or truncated to.
+                 Defaults to the length of the longest sequence.
+
+    Returns:
+        float64 numpy array of shape (L, 20, n_indices) for a single sequence,
+        or (n_seq, max_len, 20, n_indices) for a batch. Padding and ``-`` gap
+        positions are NaN. The last axis is dropped if record_codes is a str.
+
+    Raises:
+        TypeError: If sequences is not a string or list of strings.
+        ValueError: If a sequence contains invalid characters, or a record
+                    code, normalisation or na_policy is invalid.
+    """
+    np = _require_numpy()
+    codes, single = _encode_padded(sequences, max_len)
+    table = aaindex1._value_table([record_codes] if isinstance(record_codes, str) else record_codes,
+                                  normalisation, na_policy)
+
+    out = np.empty(codes.shape + table[:len(AMINO_ACIDS)].shape)
+    np.subtract(table[np.newaxis, np.newaxis, :len(AMINO_ACIDS)], table[codes][:, :, np.newaxis, :], out=out)
+    out[codes == GAP_CODE] = np.nan
+
+    if single:
+        out = out[0]
+    if isinstance(record_codes, str):
+        out = out[..., 0]
+    return out
+
+
+def substitution_scores(sequences: Union[str, List[str]], matrices: Union[str, List[str]] = DEFAULT_MATRIX,
+                        na_policy: str = "nan", max_len: Optional[int] = None):
+    """Return the AAindex2 substitution score of every single-point mutant.
+
+    For position i of a sequence s, mutant amino acid a and matrix M, the
+    score is M[s_i, a], the matrix row being the wild-type residue. Mutant
+    amino acids follow :data:`aaindex.encoding.AMINO_ACIDS`, so the slice at
+    the wild-type residue holds the matrix diagonal. Scores are gathered in
+    one call from a (21, 20, n_matrices) table laid out from the cached
+    to_tensor() stack, for one or a batch of parent sequences.
+
+    Args:
+        sequences: A single sequence, or a list of parent sequences to scan as a batch.
+        matrices: Accession number, or list of accession numbers, of the
+                  AAindex2 matrices. Defaults to BLOSUM62 (HENS920102).
+        na_policy: How NA values in the matrices are replaced, see
+                   ``AAIndex2.to_array()``. Defaults to NaN.
+        max_len: Length that batched sequences are padded or truncated to.
+                 Defaults to the length of the longest sequence.
+
+    Returns:
+        float64 numpy array of shape (L, 20, n_matrices) for a single sequence,
+        or (n_seq, max_len, 20, n_matrices) for a batch. Padding and ``-`` gap
+        positions are NaN. The last axis is dropped if matrices is a str.
+
+    Raises:
+        TypeError: If sequences is not a string or list of strings.
+        ValueError: If a sequence contains invalid characters, or a matrix
+                    code or na_policy is invalid.
+    """
+    np = _require_numpy()
+    codes, single = _encode_padded(sequences, max_len)
+    record_codes = [matrices] if isinstance(matrices, str) else list(matrices)
+    tensor = aaindex2.to_tensor([aaindex2._normalise_code(code) for code in record_codes], na_policy)
+
+    #wild-type-major table, with a NaN row for the gap code
+    table = np.full((GAP_CODE + 1, len(AMINO_ACIDS), len(record_codes)), np.nan)
+    table[:len(AMINO_ACIDS)] = tensor.transpose(1, 2, 0)
+    out = table[codes]
+
+    if single:
+        out = out[0]
+    if isinstance(matrices, str):
+        out = out[..., 0]
+    return out
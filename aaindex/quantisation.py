@@ -0,0 +1,156 @@
+################################################################################
+################        Reduced Precision Array Storage        #################
+################################################################################
+
+#importing required modules and dependencies
+from typing import List, Tuple
+
+from ._aaindex_matrix import Map
+from .encoding import _require_numpy
+
+__all__: List[str] = ['QUANTISED_DTYPES', 'QuantisedArray', 'quantise']
+
+#storage formats, from the most to the least precise
+QUANTISED_DTYPES: Tuple[str, ...] = ("float32", "float16", "int8")
+
+#int8 codes: values are mapped onto -127..127, -128 marks NaN
+_INT8_LIMIT: int = 127
+_INT8_NAN: int = -128
+
+
+class QuantisedArray:
+    """A float array stored at reduced precision, with a scale and offset per index.
+
+    The first axis runs over the indices (AAindex1 records or AAindex2/3
+    matrices). float32 and float16 storage are plain casts. int8 storage is
+    affine per index: values are mapped linearly from the index's finite
+    [min, max] range onto the codes -127..127, so each value is reproduced to
+    within half of its index's scale, and NaN is stored as -128.
+
+    Attributes:
+        data: Read-only stored array, of the storage dtype.
+        scale: Read-only float64 array of shape (n_indices,), 1 for float storage.
+        offset: Read-only float64 array of shape (n_indices,), 0 for float storage.
+    """
+    def __init__(self, data, scale, offset) -> None:
+        for array in (data, scale, offset):
+            array.flags.writeable = False
+        self.data = data
+        self.scale = scale
+        self.offset = offset
+
+    @property
+    def dtype(self) -> str:
+        """Name of the storage dtype."""
+        return self.data.dtype.name
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        """Shape of the stored array."""
+        return self.data.shape
+
+    @property
+    def nbytes(self) -> int:
+        """Number of bytes of the stored array and its scales and offsets."""
+        return self.data.nbytes + self.scale.nbytes + self.offset.nbytes
+
+    def dequantise(self, dtype: str = "float64"):
+        """Return the stored values as a float array, in one vectorised pass.
+
+        Args:
+            dtype: Float dtype of the output. Defaults to float64.
+
+        Returns:
+            numpy array of the stored array's shape.
+        """
+        np = _require_numpy()
+        out = self.data.astype(dtype)
+        if self.dtype == "int8":
+            broadcast = (-1, ) + (1, ) * (self.data.ndim - 1)
+            out *= self.scale.reshape(broadcast).astype(dtype)
+            out += self.offset.reshape(broadcast).astype(dtype)
+            out[self.data == _INT8_NAN] = np.nan
+        return out
+
+    def error(self, reference) -> Map:
+        """Return the error of the stored values against the full precision array, per index.
+
+        Args:
+            reference: float array the QuantisedArray was built from.
+
+        Returns:
+            Map of float64 arrays of shape (n_indices,): ``max_abs_error`` and
+            ``rmse`` (root mean square error). Positions that are NaN in both
+            arrays are ignored; a value lost to NaN or overflowed to infinity
+            gives an infinite error.
+
+        Raises:
+            ValueError: If reference is not of the stored array's shape.
+        """
+        np = _require_numpy()
+        reference = np.asarray(reference, dtype=np.float64)
+        if reference.shape != self.shape:
+            raise ValueError(f"reference must be of shape {self.shape}, got {reference.shape}.")
+        with np.errstate(invalid="ignore", over="ignore"):
+            errors = np.abs(self.dequantise() - reference)
+        both_nan = np.isnan(reference) & np.isnan(errors)
+        errors[both_nan] = 0
+        errors[np.isnan(errors)] = np.inf
+        #explicit row length, as -1 cannot be inferred for zero indices
+        row_length = int(np.prod(self.shape[1:]))
+        errors = errors.reshape(len(errors), row_length)
+        counts = np.maximum((~both_nan).reshape(len(errors), row_length).sum(axis=1), 1)
+        with np.errstate(over="ignore"):
+            return Map(max_abs_error=errors.max(axis=1, initial=0),
+                       rmse=np.sqrt((errors * errors).sum(axis=1) / counts))
+
+    def __len__(self) -> int:
+        """Return the number of indices."""
+        return len(self.data)
+
+    def __repr__(self) -> str:
+        """Return a canonical string representation of this instance."""
+        return f"QuantisedArray(dtype={self.dtype}, shape={self.shape}, nbytes={self.nbytes})"
+
+
+def quantise(array, dtype: str = "int8") -> QuantisedArray:
+    """Store a float array, whose first axis runs over indices, at reduced precision.
+
+    Args:
+        array: float array-like of shape (n_indices, ...).
+        dtype: Storage format, one of "float32", "float16" or "int8"
+               (per-index affine quantisation, see :class:`QuantisedArray`).
+
+    Returns:
+        QuantisedArray.
+
+    Raises:
+        ValueError: If dtype is not a supported storage format.
+    """
+    np = _require_numpy()
+    if dtype not in QUANTISED_DTYPES:
+        raise ValueError(f"Invalid dtype {dtype!r}, expected one of {QUANTISED_DTYPES}.")
+    array = np.asarray(array, dtype=np.float64)
+    n_indices = len(array)
+    if dtype != "int8":
+        with np.errstate(over="ignore"):
+            data = array.astype(dtype)
+        return QuantisedArray(data, np.ones(n_indices), np.zeros(n_indices))
+
+    #per-index finite range, mapped symmetrically around its midpoint
+    flat = array.reshape(n_indices, int(np.prod(array.shape[1:])))
+    finite = np.isfinite(flat)
+    low = np.where(finite, flat, np.inf).min(axis=1, initial=np.inf)
+    high = np.where(finite, flat, -np.inf).max(axis=1, initial=-np.inf)
+    empty = ~np.isfinite(low)
+    low[empty], high[empty] = 0, 0
+    offset = (high + low) / 2
+    scale = (high - low) / (2 * _INT8_LIMIT)
+    scale[scale == 0] = 1
+
+    broadcast = (-1, ) + (1, ) * (array.ndim - 1)
+    with np.errstate(invalid="ignore"):
+        codes = np.rint((array - offset.reshape(broadcast)) / scale.reshape(broadcast))
+    data = np.clip(np.nan_to_num(codes, nan=_INT8_NAN), _INT8_NAN, _INT8_LIMIT).astype(np.int8)
+    data[~np.isfinite(array)] = _INT8_NAN
+    return QuantisedArray(data, scale, offset)
@@ -0,0 +1,105 @@
+################################################################################
+################        Multi-Threaded Lookup Benchmark        #################
+################################################################################
+
+"""Benchmark batch lookups from a shared aaindex instance across threads.
+
+Each worker thread runs the same batch of record lookups or sequence
+encodings against one shared database instance, mutable or frozen via
+``freeze()``. On a free-threaded (no-GIL) build of Python 3.13+ throughput
+of the frozen instance should scale with the number of threads; on a
+standard build the GIL serialises the pure Python lookups.
+
+Usage:
+    python benchmarks/threaded_lookups.py --threads 1 2 4 8 --repeats 200
+"""
+
+#importing required modules and dependencies
+import argparse
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List
+
+from aaindex import AAIndex1, AAIndex2, encoding
+
+
+def _record_lookups(database, codes: List[str], repeats: int) -> Callable[[], int]:
+    """Return a workload reading a field from every record, repeats times."""
+    def run() -> int:
+        for _ in range(repeats):
+            for code in codes:
+                _ = database[code].description
+        return repeats * len(codes)
+    return run
+
+
+def _pair_lookups(database, codes: List[str], repeats: int) -> Callable[[], int]:
+    """Return a workload of single pairwise get() calls from matrix records."""
+    pairs = [(random.choice(encoding.AMINO_ACIDS), random.choice(encoding.AMINO_ACIDS)) for _ in range(100)]
+    def run() -> int:
+        for _ in range(repeats):
+            for code in codes[:10]:
+                for aa1, aa2 in pairs:
+                    database.get(code, aa1, aa2)
+        return repeats * 10 * len(pairs)
+    return run
+
+
+def _batch_encode(database, sequences: List[str], repeats: int) -> Callable[[], int]:
+    """Return a workload encoding a padded batch of sequences into all AAindex1 values."""
+    def run() -> int:
+        for _ in range(max(1, repeats // 20)):
+            database.encode_values(sequences)
+        return max(1, repeats // 20) * len(sequences)
+    return run
+
+
+def _measure(workload: Callable[[], int], n_threads: int) -> float:
+    """Run the workload once per thread concurrently, returning operations per second."""
+    with ThreadPoolExecutor(max_workers=n_threads) as executor:
+        start = time.perf_counter()
+        total = sum(executor.map(lambda _: workload(), range(n_threads)))
+        elapsed = time.perf_counter() - start
+    return total / elapsed
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8], help="thread counts to run")
+    parser.add_argument("--repeats", type=int, default=100, help="workload repeats per thread")
+    args = parser.parse_args(argv)
+
+    gil_enabled = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"Python {sys.version.split()[0]}, GIL {'enabled' if gil_enabled else 'disabled'}")
+
+    random.seed(0)
+    sequences = ["".join(random.choices(encoding.AMINO_ACIDS, k=random.randint(50, 300))) for _ in range(64)]
+    workloads = []
+    for frozen in (False, True):
+        aaindex1, aaindex2 = AAIndex1(), AAIndex2()
+        if frozen:
+            aaindex1.freeze(arrays=True)
+            aaindex2.freeze()
+        else:
+            aaindex1.warm(arrays=True)
+            aaindex2.warm()
+        label = "frozen" if frozen else "mutable"
+        workloads += [
+            (f"AAindex1 record lookups ({label})", _record_lookups(aaindex1, aaindex1.record_codes(), args.repeats)),
+            (f"AAindex2 pair lookups ({label})", _pair_lookups(aaindex2, aaindex2.record_codes(), args.repeats)),
+        ]
+    workloads.append(("AAindex1 batch encode_values", _batch_encode(aaindex1, sequences, args.repeats)))
+
+    for name, workload in workloads:
+        print(f"\n{name}")
+        baseline = None
+        for n_threads in args.threads:
+            rate = _measure(workload, n_threads)
+            baseline = baseline or rate
+            print(f"  {n_threads:>3} threads: {rate:>14,.0f} ops/s  ({rate / baseline:.2f}x of first)")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,10 +2,16 @@
 ################             AAindex1 Module Tests             #################
 ################################################################################
 
+import os
+import tempfile
 import unittest
 from unittest.mock import patch
 from importlib.metadata import metadata
-from aaindex import aaindex1, __version__
+import numpy as np
+import pickle
+import threading
+from aaindex import AAIndex1, aaindex1, encode, __version__
+from aaindex.encoding import encode_kmers
 
 class AAIndex1_Tests(unittest.TestCase):
     """
@@ -45,6 +51,26 @@ class AAIndex1_Tests(unittest.TestCase):
         testing __len__, __contains__, __iter__, and __repr__ dunder methods.
     test_repr_format:
         testing __repr__ returns the expected format string.
+    test_to_array:
+        testing the dense, cached, read-only value array built for many records.
+    test_na_policy:
+        testing the NA replacement policies and NA mask of the dense value array.
+    test_normalised:
+        testing the cached z-score, min-max and rank normalised variants of the value array.
+    test_encode_values:
+        testing sequences are encoded into per-residue index values, singly and in batches.
+    test_profile:
+        testing sliding-window property profiles of single sequences and batches.
+    test_record_offsets:
+        testing single records are parsed from their byte offset in the raw file without loading the database.
+    test_refresh:
+        testing a new release is diffed against the loaded records and the cached arrays are updated.
+    test_kmer_table:
+        testing k-mer lookup tables and scoring peptides against summed residue values.
+    test_freeze:
+        testing the immutable, thread-safe read-only mode of a frozen database.
+    test_pickle:
+        testing instances pickle to a small reference to the database files, or a blob if assigned in memory.
     """
     def test_aaindex_metadata(self):
         """ Testing correct aaindex version and metadata. """
@@ -655,6 +681,421 @@ class AAIndex1_Tests(unittest.TestCase):
         self.assertEqual(len(cats), aaindex1.num_records(),
             f'Number of category entries should equal num_records(), got {len(cats)}.')
 
+    def test_to_array(self):
+        """ Test Case for to_array(), the dense value array of many records. """
+        index_codes = ['AURR980103', 'FINA770101']
+#1.)
+        array = aaindex1.to_array()
+        self.assertEqual(array.shape, (566, 21),
+            f'Expected array of shape (566, 21), got {array.shape}.')
+        self.assertIs(aaindex1.to_array(), array,
+            'Expected to_array() to return the cached array.')
+        with self.assertRaises(ValueError):
+            array[0, 0] = 1.0
+#2.)
+        #rows follow the requested record codes, columns follow the encoding alphabet
+        array = aaindex1.to_array(index_codes)
+        codes = encode('ARNDCQEGHILKMFPSTWYV-')
+        for row, code in enumerate(index_codes):
+            for col, aa in zip(codes, 'ARNDCQEGHILKMFPSTWYV-'):
+                self.assertEqual(array[row, col], aaindex1.values(code)[aa],
+                    f'Array value for {code} {aa} does not match values().')
+#3.)
+        with self.assertRaises(ValueError):
+            aaindex1.to_array(['BLAH999999'])
+
+    def test_na_policy(self):
+        """ Test Case for the NA policies and NA mask of the dense value array. """
+        index_codes = ['ROSM880104', 'AURR980103']
+        proline = encode('P')[0]
+        arginine = encode('R')[0]
+#1.)
+        mask = aaindex1.na_mask(index_codes)
+        self.assertEqual(mask.sum(), 2,
+            f'Expected 2 NA values in ROSM880104 and AURR980103, got {mask.sum()}.')
+        self.assertTrue(mask[0, proline] and mask[0, arginine],
+            'Expected R and P to be NA in ROSM880104.')
+#2.)
+        #zero policy matches values(), NaN policy exposes the NA values
+        self.assertEqual(aaindex1.to_array(index_codes)[0, proline], 0,
+            'Expected NA value to be 0 under the zero policy.')
+        nan_array = aaindex1.to_array(index_codes, na_policy='nan')
+        self.assertTrue(np.array_equal(np.isnan(nan_array), mask),
+            'Expected NaN values exactly where the NA mask is set.')
+#3.)
+        #mean policy replaces NA values with the mean of the index's known values
+        mean_array = aaindex1.to_array(index_codes, na_policy='mean')
+        expected_mean = np.nanmean(nan_array[0, :20])
+        self.assertAlmostEqual(mean_array[0, proline], expected_mean,
+            msg=f'Expected NA value to be the index mean {expected_mean}, got {mean_array[0, proline]}.')
+        self.assertEqual(mean_array[0, 20], 0,
+            'Expected the gap value to remain 0 under the mean policy.')
+#4.)
+        with self.assertRaises(ValueError):
+            aaindex1.to_array(index_codes, na_policy='raise')
+        self.assertEqual(aaindex1.to_array(['AURR980103'], na_policy='raise').shape, (1, 21),
+            'Expected raise policy to succeed for a record without NA values.')
+        with self.assertRaises(ValueError):
+            aaindex1.to_array(index_codes, na_policy='diagonal_mean')
+        with self.assertRaises(ValueError):
+            aaindex1.to_array(index_codes, na_policy='blah')
+
+    def test_normalised(self):
+        """ Test Case for normalised(), the z-score, min-max and rank variants of the value array. """
+        index_codes = ['AURR980103', 'FINA770101']
+        values = aaindex1.to_array(index_codes)[:, :20]
+#1.)
+        zscore = aaindex1.normalised('zscore', index_codes)
+        self.assertEqual(zscore.shape, (2, 21),
+            f'Expected z-score array of shape (2, 21), got {zscore.shape}.')
+        expected = (values - values.mean(axis=1, keepdims=True)) / values.std(axis=1, keepdims=True)
+        self.assertTrue(np.allclose(zscore[:, :20], expected),
+            'Expected z-scores to match the mean and standard deviation of each index.')
+        self.assertTrue((zscore[:, 20] == 0).all(),
+            'Expected the gap column to remain 0.')
+        self.assertIs(aaindex1.normalised('zscore', index_codes), zscore,
+            'Expected normalised() to return the cached array.')
+#2.)
+        minmax = aaindex1.normalised('minmax', index_codes)
+        self.assertTrue(np.allclose(minmax[:, :20].min(axis=1), 0) and np.allclose(minmax[:, :20].max(axis=1), 1),
+            'Expected min-max values to span [0, 1].')
+#3.)
+        #tied values share their average rank, e.g. C, Q and V are all 0.95 in FINA770101
+        rank = aaindex1.normalised('rank', index_codes)
+        self.assertTrue(np.allclose(rank[:, :20].min(axis=1), 0) and np.allclose(rank[:, :20].max(axis=1), 1),
+            'Expected ranks to span [0, 1].')
+        ties = values[1] == values[1, 4]
+        self.assertGreater(ties.sum(), 1,
+            'Expected tied values in FINA770101.')
+        self.assertEqual(len(set(rank[1, :20][ties])), 1,
+            'Expected tied values to share the same rank.')
+#4.)
+        #under the NaN policy NA values are excluded from the statistics
+        rank_nan = aaindex1.normalised('rank', ['ROSM880104'], na_policy='nan')
+        self.assertEqual(int(np.isnan(rank_nan).sum()), 2,
+            'Expected the 2 NA values of ROSM880104 to remain NaN.')
+        self.assertEqual(np.nanmax(rank_nan), 1,
+            'Expected ranks of known values to span [0, 1].')
+#5.)
+        with self.assertRaises(ValueError):
+            aaindex1.normalised('blah')
+
+    def test_encode_values(self):
+        """ Test Case for encode_values(), encoding sequences into per-residue index values. """
+        index_codes = ['AURR980103', 'FINA770101']
+#1.)
+        encoded = aaindex1.encode_values('ACDW', index_codes)
+        self.assertEqual(encoded.shape, (4, 2),
+            f'Expected encoding of shape (4, 2), got {encoded.shape}.')
+        for row, aa in enumerate('ACDW'):
+            for col, code in enumerate(index_codes):
+                self.assertEqual(encoded[row, col], aaindex1.values(code)[aa],
+                    f'Encoded value for {code} {aa} does not match values().')
+#2.)
+        #batches are padded with the gap value to the longest sequence or max_len
+        batch = aaindex1.encode_values(['ACDW', 'AC'], index_codes)
+        self.assertEqual(batch.shape, (2, 4, 2),
+            f'Expected batch of shape (2, 4, 2), got {batch.shape}.')
+        self.assertTrue(np.array_equal(batch[0], encoded),
+            'Expected batch encoding to match single sequence encoding.')
+        self.assertTrue((batch[1, 2:] == 0).all(),
+            'Expected padding positions to hold the gap value 0.')
+        self.assertEqual(aaindex1.encode_values(['ACDW', 'AC'], index_codes, max_len=3).shape, (2, 3, 2),
+            'Expected batch to be truncated to max_len.')
+        #ragged batches are concatenated without padding, delimited by offsets
+        values, offsets = aaindex1.encode_values(['ACDW', '', 'AC'], index_codes, ragged=True)
+        self.assertEqual(values.shape, (6, 2), f'Expected ragged values of shape (6, 2), got {values.shape}.')
+        self.assertEqual(offsets.tolist(), [0, 4, 4, 6], f'Unexpected ragged offsets, got {offsets.tolist()}.')
+        self.assertTrue(np.array_equal(values[:4], encoded) and np.array_equal(values[4:], encoded[:2]),
+            'Expected ragged rows to match single sequence encodings.')
+        self.assertEqual(aaindex1.encode_values(['ACDW', 'AC'], index_codes, max_len=3, ragged=True)[1].tolist(),
+            [0, 3, 5], 'Expected ragged sequences to be truncated to max_len.')
+#3.)
+        normalised = aaindex1.encode_values('ACDW', index_codes, normalisation='zscore')
+        expected = aaindex1.normalised('zscore', index_codes)[:, encode('ACDW')].T
+        self.assertTrue(np.array_equal(normalised, expected),
+            'Expected normalised encoding to gather from the normalised array.')
+#4.)
+        with self.assertRaises(ValueError):
+            aaindex1.encode_values('ACDXZ', index_codes)
+        with self.assertRaises(TypeError):
+            aaindex1.encode_values(1234, index_codes)
+        for ragged in (False, True):
+            with self.assertRaises(ValueError):
+                aaindex1.encode_values(['ACDW', 'AC'], index_codes, max_len=-1, ragged=ragged)
+
+    def test_freeze(self):
+        """ Test Case for freeze(), making the database immutable and safe to share between threads. """
+        frozen = AAIndex1()
+#1.)
+        self.assertFalse(frozen.frozen, 'Expected new instance to not be frozen.')
+        frozen.freeze(arrays=True)
+        frozen.freeze()
+        self.assertTrue(frozen.frozen, 'Expected instance to be frozen.')
+        record = frozen['chop780207']
+        self.assertIs(record, frozen['CHOP780207'],
+            'Expected frozen records to be shared rather than rebuilt.')
+        self.assertEqual(dict(record.values), aaindex1['CHOP780207'].values,
+            'Expected frozen record values to match the mutable instance.')
+        self.assertEqual(record.values.A, aaindex1['CHOP780207'].values['A'],
+            'Expected nested values to support dot notation.')
+        self.assertTrue(np.array_equal(frozen.encode_values('ACDW'), aaindex1.encode_values('ACDW')),
+            'Expected frozen encode_values() to match the mutable instance.')
+#2.)
+        with self.assertRaises(AttributeError):
+            frozen.data_dir = 'other_dir'
+        with self.assertRaises(AttributeError):
+            frozen.categories = {}
+        with self.assertRaises(TypeError):
+            record['description'] = 'blah'
+        with self.assertRaises(TypeError):
+            record.values.A = 1
+        with self.assertRaises(TypeError):
+            frozen.search('hydrophobicity')['ARGP820101'].update({})
+        with self.assertRaises(TypeError):
+            frozen.aaindex_json['CHOP780207'].pop('values')
+#3.)
+        #a cold database accessed from many threads at once is loaded only once
+        shared = AAIndex1()
+        load = shared._load
+        loads = []
+        def counted_load():
+            loads.append(1)
+            return load()
+        shared._load = counted_load
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(len(shared)))
+                   for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual((len(loads), len(results)), (1, 8),
+            f'Expected database to be loaded once for 8 threads, got {len(loads)} loads.')
+
+    def test_pickle(self):
+        """ Test Case for pickling instances without their parsed records. """
+#1.)
+        blob = pickle.dumps(aaindex1)
+        self.assertLess(len(blob), 1024, f'Expected pickle under 1KB, got {len(blob)} bytes.')
+        unpickled = pickle.loads(blob)
+        self.assertIsNone(unpickled._aaindex_json, 'Expected unpickled instance to load lazily.')
+        self.assertEqual(unpickled['CHOP780207'], aaindex1['CHOP780207'],
+            'Expected unpickled instance to load the same records.')
+        self.assertEqual(unpickled.categories, aaindex1.categories,
+            'Expected unpickled instance to load the same categories.')
+#2.)
+        frozen = AAIndex1()
+        frozen.freeze()
+        unpickled = pickle.loads(pickle.dumps(frozen))
+        self.assertTrue(unpickled.frozen, 'Expected unpickled instance to remain frozen.')
+        with self.assertRaises(AttributeError):
+            unpickled.data_dir = 'other_dir'
+#3.)
+        #records assigned in memory are carried in the pickle
+        custom = AAIndex1()
+        custom.aaindex_json = {'CHOP780207': dict(aaindex1.aaindex_json['CHOP780207'])}
+        unpickled = pickle.loads(pickle.dumps(custom))
+        self.assertEqual(list(unpickled), ['CHOP780207'],
+            'Expected records assigned in memory to survive pickling.')
+
+    def test_profile(self):
+        """ Test Case for profile() and profiles(), sliding-window property profiles. """
+        sequence = 'MKTAYIAKQRQISFVKSHFSRQLEERLGLIEVQAPILSRVGDGTQ'
+        kyte_doolittle = aaindex1.values('KYTJ820101')
+        def reference(seq, window):
+            half = window // 2
+            return [np.mean([kyte_doolittle[aa] for aa in seq[i - half:i - half + window]])
+                    if i - half >= 0 and i - half + window <= len(seq) else np.nan for i in range(len(seq))]
+#1.)
+        profile = aaindex1.profile(sequence, 'KYTJ820101', 9)
+        self.assertEqual(profile.shape, (len(sequence),),
+            f'Expected profile of shape ({len(sequence)},), got {profile.shape}.')
+        self.assertTrue(np.allclose(profile, reference(sequence, 9), equal_nan=True),
+            'Expected profile to match the window means.')
+        self.assertTrue(np.isnan(profile[:4]).all() and np.isnan(profile[-4:]).all(),
+            'Expected NaN where the window does not fit.')
+#2.)
+        profiles = aaindex1.profiles([sequence, sequence[:12]], ['KYTJ820101', 'CHOP780207'], [4, 9, 19])
+        self.assertEqual(profiles.shape, (2, 3, len(sequence), 2),
+            f'Expected profiles of shape (2, 3, {len(sequence)}, 2), got {profiles.shape}.')
+        for row, window in enumerate([4, 9, 19]):
+            self.assertTrue(np.allclose(profiles[0, row, :, 0], reference(sequence, window), equal_nan=True),
+                f'Expected batched profile for window {window} to match the window means.')
+        self.assertTrue(np.allclose(profiles[1, 1, :12, 0], reference(sequence[:12], 9), equal_nan=True),
+            'Expected shorter sequence profile to match its own window means.')
+        self.assertTrue(np.isnan(profiles[1, :, 12:]).all(), 'Expected padding positions to be NaN.')
+        self.assertTrue(np.isnan(profiles[1, 2]).all(), 'Expected NaN profile for a window longer than the sequence.')
+#3.)
+        #AVBF000101 has no value for proline: only the windows containing it are NaN
+        with_na = aaindex1.profile('ACDEFGPHIKLMN', 'AVBF000101', 3, na_policy='nan')
+        avbf = aaindex1.values('AVBF000101')
+        self.assertTrue(np.isnan(with_na[5:8]).all(), 'Expected NaN for the windows containing the NA residue.')
+        self.assertTrue(np.allclose(with_na[1:5], [np.mean([avbf[aa] for aa in 'ACDEFG'[i - 1:i + 2]]) for i in range(1, 5)]),
+            'Expected windows before the NA residue to match the window means.')
+        self.assertTrue(np.allclose(with_na[8:12], [np.mean([avbf[aa] for aa in 'ACDEFGPHIKLMN'[i - 1:i + 2]])
+                                                     for i in range(8, 12)]),
+            'Expected windows after the NA residue to match the window means.')
+        self.assertEqual(np.isnan(aaindex1.profile('PACDEFGH', 'AVBF000101', 3, na_policy='nan')).sum(), 3,
+            'Expected a leading NA residue to only blank the windows containing it.')
+#4.)
+        with self.assertRaises(ValueError):
+            aaindex1.profile(sequence, 'KYTJ820101', 0)
+        with self.assertRaises(TypeError):
+            aaindex1.profile(['ACDE'], 'KYTJ820101')
+
+    def test_record_offsets(self):
+        """ Test Case for single record lookups served from the byte-offset index into the raw file. """
+        database = AAIndex1()
+        database.record_cache_size = 2
+#1.)
+        record = database['kytj820101']
+        self.assertIsNone(database._aaindex_json, 'Expected single record lookup to not load the database.')
+        self.assertEqual(record, aaindex1['KYTJ820101'], 'Expected record parsed alone to match the database.')
+        self.assertEqual(database.values('CHOP780207'), aaindex1.values('CHOP780207'),
+            'Expected values parsed alone to match the database.')
+        self.assertEqual(database.values('ANDN920101')['-'], 0, 'Expected gap placeholder in record parsed alone.')
+        self.assertEqual(list(database._record_cache), ['CHOP780207', 'ANDN920101'],
+            'Expected LRU to keep the most recently used records.')
+        with self.assertRaises(ValueError):
+            database['ABCD123456']
+        self.assertIsNone(database._aaindex_json, 'Expected invalid record code to not load the database.')
+#2.)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            #index of a raw file whose size has changed is rebuilt
+            with open(os.path.join(tmp_dir, 'aaindex1.offsets.json'), 'w') as f:
+                f.write('{"size": 1, "records": {}}')
+            with open(os.path.join(database.aaindex_module_path, database.data_dir, 'aaindex1')) as f:
+                raw = f.read()
+            with open(os.path.join(tmp_dir, 'aaindex1'), 'w') as f:
+                f.write(raw[raw.index('H ARGP820101'):])
+            database.data_dir = tmp_dir
+            self.assertEqual(database['ARGP820101'], aaindex1['ARGP820101'],
+                'Expected record from the rebuilt index to match the database.')
+            self.assertNotIn('ANDN920101', database._known_codes(), 'Expected index of the new raw file.')
+
+    def test_refresh(self):
+        """ Test Case for refresh(), updating the database from a new release file. """
+        database = AAIndex1()
+        codes = ['KYTJ820101', 'CHOP780207']
+        raw_path = os.path.join(database.aaindex_module_path, database.data_dir, database.aaindex_filename)
+        with open(raw_path) as f:
+            records = f.read().split('//\n')
+#1.)
+        diff = database.refresh(raw_path, release_date='February 13, 2017')
+        self.assertEqual((diff.added, diff.removed, diff.changed), ([], [], []),
+            'Expected no differences when refreshing from the packaged release.')
+        self.assertEqual(diff.content_hash, AAIndex1().content_hash,
+            'Expected content hash of the packaged release.')
+        self.assertEqual(len(database.content_hash), 64, 'Expected a SHA-256 hex digest.')
+#2.)
+        #cache arrays, then change a value of KYTJ820101, remove ANDN920101 and add a copy of CHOP780207
+        untouched = database.to_array(['ARGP820101'])
+        stale = [database.to_array(), database.to_array(codes), database.normalised('zscore', codes),
+                 database.kmer_table(2, codes)]
+        #str and lowercase codes are cached under the same canonical key
+        aliased = [database.to_array('KYTJ820101'), database.normalised('zscore', 'KYTJ820101'),
+                   database.quantised('float32', ['kytj820101']).dequantise()]
+        changed = [record.replace('  1.8 ', ' -9.9 ', 1) if record.startswith('H KYTJ820101') else record
+                   for record in records if not record.startswith('H ANDN920101')]
+        added = [record.replace('H CHOP780207', 'H NEWR300101') for record in records
+                 if record.startswith('H CHOP780207')]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            release_path = os.path.join(tmp_dir, 'aaindex1')
+            with open(release_path, 'w') as f:
+                f.write('//\n'.join(added + changed))
+            diff = database.refresh(release_path, release_date='May 1, 2030')
+        self.assertEqual((diff.added, diff.removed, diff.changed), (['NEWR300101'], ['ANDN920101'], ['KYTJ820101']),
+            f'Unexpected differences between releases, got {diff}.')
+        self.assertEqual((database.last_updated, database.content_hash), (diff.release_date, diff.content_hash),
+            'Expected release date and content hash to be recorded.')
+        self.assertEqual(database.values('KYTJ820101')['A'], -9.9, 'Expected the changed value to be loaded.')
+        self.assertNotIn('ANDN920101', database, 'Expected removed record to be dropped.')
+#3.)
+        reference = AAIndex1()
+        reference.aaindex_json = database.aaindex_json
+        self.assertIs(database.to_array(['ARGP820101']), untouched,
+            'Expected cached arrays of unchanged records to be kept.')
+        for array, rebuilt in zip(stale, [database.to_array(), database.to_array(codes),
+                                          database.normalised('zscore', codes), database.kmer_table(2, codes)]):
+            self.assertFalse(np.array_equal(array, rebuilt), 'Expected cached arrays of changed records to be updated.')
+        self.assertTrue(np.array_equal(database.to_array(), reference.to_array()),
+            'Expected the array of all records to match a full rebuild.')
+        for array, rebuilt in zip(aliased, [database.to_array('KYTJ820101'), database.normalised('zscore', 'KYTJ820101'),
+                                            database.quantised('float32', ['kytj820101']).dequantise()]):
+            self.assertFalse(np.array_equal(array, rebuilt),
+                'Expected arrays cached under str or lowercase codes to be updated.')
+        self.assertEqual(database.to_array('kytj820101')[0, 0], -9.9,
+            'Expected the changed value in the array of a str record code.')
+        self.assertAlmostEqual(float(database.quantised('float32', ['KYTJ820101']).dequantise()[0, 0]), -9.9, 5,
+            'Expected the changed value in the quantised array of a lowercase record code.')
+        self.assertTrue(np.array_equal(database.normalised('zscore', codes), reference.normalised('zscore', codes)),
+            'Expected patched normalised array to match a full rebuild.')
+        self.assertTrue(np.array_equal(database.kmer_table(2, codes), reference.kmer_table(2, codes)),
+            'Expected patched k-mer table to match a full rebuild.')
+        self.assertEqual(pickle.loads(pickle.dumps(database)).content_hash, database.content_hash,
+            'Expected refreshed content hash to survive pickling.')
+#4.)
+        with self.assertRaises(OSError):
+            database.refresh('missing_release_file')
+        frozen = AAIndex1()
+        frozen.freeze()
+        with self.assertRaises(AttributeError):
+            frozen.refresh(raw_path)
+
+    def test_kmer_table(self):
+        """ Test Case for kmer_table() and score_kmers(), precomputed k-mer lookup tables. """
+        codes = ['KYTJ820101', 'CHOP780207']
+        peptides = ['ACDEF', 'WYVKL', 'MKTAY', 'AAAAA']
+        def reference(peptide, reduction):
+            totals = [sum(aaindex1.values(code)[aa] for aa in peptide) for code in codes]
+            return [total / len(peptide) for total in totals] if reduction == 'mean' else totals
+#1.)
+        table = aaindex1.kmer_table(2, codes)
+        self.assertEqual(table.shape, (21 ** 2, 2), f'Expected table of shape (441, 2), got {table.shape}.')
+        self.assertFalse(table.flags.writeable, 'Expected k-mer table to be read-only.')
+        self.assertIs(aaindex1.kmer_table(2, codes), table, 'Expected k-mer table to be cached.')
+#2.)
+        for reduction in ('sum', 'mean'):
+            scores = aaindex1.score_kmers(peptides, codes, reduction)
+            self.assertEqual(scores.shape, (4, 2), f'Expected scores of shape (4, 2), got {scores.shape}.')
+            self.assertTrue(np.allclose(scores, [reference(peptide, reduction) for peptide in peptides]),
+                f'Expected {reduction} k-mer scores to match the summed residue values.')
+#3.)
+        kmer_codes = encode_kmers(peptides)
+        self.assertTrue(np.array_equal(aaindex1.score_kmers(kmer_codes, codes, k=5),
+                                       aaindex1.score_kmers(peptides, codes)),
+            'Expected scoring k-mer codes to match scoring peptides.')
+#4.)
+        with self.assertRaises(ValueError):
+            aaindex1.kmer_table(0, codes)
+        with self.assertRaises(ValueError):
+            aaindex1.kmer_table(6, codes)
+        with self.assertRaises(ValueError):
+            aaindex1.kmer_table(2, codes, reduction='max')
+        with self.assertRaises(ValueError):
+            aaindex1.score_kmers(['ACD', 'AC'], codes)
+        with self.assertRaises(ValueError):
+            aaindex1.score_kmers(kmer_codes, codes)
+        with self.assertRaises(ValueError):
+            aaindex1.score_kmers(peptides, codes, k=3)
+        with self.assertRaises(TypeError):
+            aaindex1.score_kmers(kmer_codes.astype(float), codes, k=5)
+        with self.assertRaises(IndexError):
+            aaindex1.score_kmers(np.array([-1]), codes, k=2)
+        with self.assertRaises(IndexError):
+            aaindex1.score_kmers(np.array([21 ** 2]), codes, k=2)
+#5.)
+        #tables over all records are refused above max_bytes instead of exhausting memory
+        with self.assertRaises(ValueError):
+            aaindex1.kmer_table(4)
+        with self.assertRaises(ValueError):
+            aaindex1.score_kmers(peptides)
+        with self.assertRaises(ValueError):
+            aaindex1.kmer_table(3, codes, max_bytes=21 ** 3 * len(codes) * 8 - 1)
+        self.assertEqual(aaindex1.kmer_table(3, codes, max_bytes=21 ** 3 * len(codes) * 8).shape,
+                         (21 ** 3, len(codes)), 'Expected a table of exactly max_bytes to be built.')
+
 if __name__ == '__main__':
     #run all unit tests
     unittest.main(verbosity=2)
\ No newline at end of file
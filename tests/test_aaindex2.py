@@ -2,8 +2,11 @@
 ################             AAindex2 Module Tests             #################
 ################################################################################
 
+import os
+import tempfile
 import unittest
-from aaindex import aaindex2, __version__
+import numpy as np
+from aaindex import AAIndex2, aaindex2, encode, __version__
 
 class AAIndex2_Tests(unittest.TestCase):
     """
@@ -32,6 +35,20 @@ class AAIndex2_Tests(unittest.TestCase):
         testing the last updated date attribute matches the known database version.
     test_dunder_methods:
         testing __len__, __contains__, __iter__, and __repr__ dunder methods.
+    test_to_array:
+        testing the dense, cached, read-only 20x20 array built for a record.
+    test_get_many:
+        testing vectorised pairwise lookups with pre-encoded amino acids.
+    test_pair_features:
+        testing the stacked matrix tensor and the gathering of all matrix scores per pair.
+    test_asymmetric:
+        testing symmetric records are stored packed and asymmetric records keep both halves.
+    test_freeze:
+        testing the immutable, thread-safe read-only mode of a frozen database.
+    test_record_offsets:
+        testing single records are parsed from their byte offset in the raw file without parsing the database.
+    test_refresh:
+        testing a new release is diffed against the loaded records and cached tensors are patched.
     """
     def test_num_records(self):
         """ Test Case to check the correct number of records are present in the AAi2 database.
@@ -287,6 +304,15 @@ class AAIndex2_Tests(unittest.TestCase):
         self.assertEqual(matrix['A']['A'], 3.0,
             'Expected A,A = 3.0 in values() result.')
 #2.)
+        #mutating a returned record or matrix must not leak into later lookups
+        database = AAIndex2()
+        database['HENS920102']['matrix']['A']['A'] = 999
+        database.values('HENS920102')['A']['R'] = 999
+        self.assertEqual((database['HENS920102']['matrix']['A']['A'], database.values('HENS920102')['A']['R']),
+                         (database.get('HENS920102', 'A', 'A'), database.get('HENS920102', 'A', 'R')),
+            'Expected each lookup to return its own copy of the matrix.')
+        self.assertEqual(database.values('HENS920102')['A']['A'], 6.0, 'Expected HENS920102 A,A = 6.0.')
+#3.)
         #invalid record code should raise ValueError
         with self.assertRaises(ValueError):
             aaindex2.values('BLAH999999')
@@ -325,6 +351,194 @@ class AAIndex2_Tests(unittest.TestCase):
         self.assertEqual(record.description, 'The PAM-120 matrix (Altschul, 1991)',
             'Whitespace-padded record code should resolve correctly.')
 
+    def test_to_array(self):
+        """ Test Case for to_array(), the dense 20x20 array of a record's matrix. """
+        amino_acids = 'ARNDCQEGHILKMFPSTWYV'
+#1.)
+        array = aaindex2.to_array('ALTS910101')
+        self.assertEqual(array.shape, (20, 20),
+            f'Expected array of shape (20, 20), got {array.shape}.')
+        for i, aa1 in enumerate(amino_acids):
+            for j, aa2 in enumerate(amino_acids):
+                self.assertEqual(array[i, j], aaindex2.get('ALTS910101', aa1, aa2),
+                    f'Array value for ({aa1},{aa2}) does not match get().')
+#2.)
+        #arrays are cached and read-only
+        self.assertIs(aaindex2.to_array('ALTS910101'), array,
+            'Expected to_array() to return the cached array.')
+        self.assertIs(aaindex2.to_array('alts910101'), array,
+            'Expected lowercase record code to return the cached array.')
+        with self.assertRaises(ValueError):
+            array[0, 0] = 1.0
+#4.)
+        with self.assertRaises(ValueError):
+            aaindex2.to_array('BLAH999999')
+
+    def test_get_many(self):
+        """ Test Case for get_many(), vectorised lookups of pre-encoded amino acid pairs. """
+        seq1 = encode('ARNDCQEG')
+        seq2 = encode('WYVAKLMF')
+#1.)
+        scores = aaindex2.get_many('ALTS910101', np.stack([seq1, seq2], axis=-1))
+        self.assertEqual(scores.shape, (8,),
+            f'Expected 8 scores, got shape {scores.shape}.')
+        for score, aa1, aa2 in zip(scores, 'ARNDCQEG', 'WYVAKLMF'):
+            self.assertEqual(score, aaindex2.get('ALTS910101', aa1, aa2),
+                f'get_many() score for ({aa1},{aa2}) does not match get().')
+#2.)
+        #arbitrary leading dimensions are preserved
+        pairs = np.array([[[0, 0], [0, 1]], [[1, 0], [19, 19]]])
+        self.assertEqual(aaindex2.get_many('ALTS910101', pairs).shape, (2, 2),
+            'Expected get_many() to preserve the leading dimensions of pairs.')
+#3.)
+        with self.assertRaises(ValueError):
+            aaindex2.get_many('ALTS910101', np.array([0, 1, 2]))
+        with self.assertRaises(IndexError):
+            aaindex2.get_many('ALTS910101', np.array([[0, 20]]))
+
+    def test_pair_features(self):
+        """ Test Case for to_tensor() and pair_features(), gathering every matrix score per pair. """
+        codes = ['ALTS910101', 'AZAE970101']
+#1.)
+        tensor = aaindex2.to_tensor()
+        self.assertEqual(tensor.shape, (94, 20, 20),
+            f'Expected tensor of shape (94, 20, 20), got {tensor.shape}.')
+        self.assertIs(aaindex2.to_tensor(), tensor,
+            'Expected to_tensor() to return the cached tensor.')
+        self.assertTrue(np.array_equal(aaindex2.to_tensor(codes)[1], aaindex2.to_array(codes[1]), equal_nan=True),
+            'Expected tensor slices to match to_array() in the requested order.')
+#2.)
+        features = aaindex2.pair_features('ARW', 'AVW')
+        self.assertEqual(features.shape, (3, 94),
+            f'Expected features of shape (3, 94), got {features.shape}.')
+        for col, code in enumerate(aaindex2.record_codes()):
+            for row, (aa1, aa2) in enumerate(zip('ARW', 'AVW')):
+                expected = aaindex2.get(code, aa1, aa2)
+                expected = np.nan if expected is None else expected
+                self.assertTrue(np.array_equal(features[row, col], expected, equal_nan=True),
+                    f'pair_features() value for {code} ({aa1},{aa2}) does not match get().')
+#3.)
+        features = aaindex2.pair_features(encode('AR'), encode('RA'), record_codes=codes)
+        self.assertEqual(features.tolist(), [[-3.0, 1.0], [-3.0, 1.0]],
+            f'Unexpected pair_features() output for selected records, got {features.tolist()}.')
+#4.)
+        with self.assertRaises(ValueError):
+            aaindex2.pair_features('AR', 'A')
+        with self.assertRaises(IndexError):
+            aaindex2.pair_features('A-', 'AA')
+        with self.assertRaises(ValueError):
+            aaindex2.pair_features('A', 'A', record_codes=['BLAH999999'])
+
+    def test_asymmetric(self):
+        """ Test Case for the packed storage of symmetric matrices and the full storage
+        of asymmetric matrices. """
+        index_code1 = 'ALTS910101'
+        index_code2 = 'LINK010101'
+#1.)
+        #symmetric records store only the 210 values of their lower triangle
+        record = aaindex2[index_code1]
+        self.assertTrue(record.symmetric,
+            'Expected ALTS910101 to be flagged as symmetric.')
+        self.assertEqual(len(record.matrix_values), 210,
+            f'Expected 210 packed values for ALTS910101, got {len(record.matrix_values)}.')
+#2.)
+        #asymmetric records store all 400 values and keep both halves of the matrix
+        record2 = aaindex2[index_code2]
+        self.assertFalse(record2.symmetric,
+            'Expected LINK010101 to be flagged as asymmetric.')
+        self.assertEqual(len(record2.matrix_values), 400,
+            f'Expected 400 values for LINK010101, got {len(record2.matrix_values)}.')
+        self.assertEqual(aaindex2.get(index_code2, 'A', 'R'), 0.03,
+            f"Expected A,R = 0.03 for LINK010101, got {aaindex2.get(index_code2, 'A', 'R')}.")
+        self.assertEqual(aaindex2.get(index_code2, 'R', 'A'), 0.034,
+            f"Expected R,A = 0.034 for LINK010101, got {aaindex2.get(index_code2, 'R', 'A')}.")
+        self.assertEqual(record2.matrix['R']['A'], 0.034,
+            'Expected the matrix dict to hold the row-major value for R,A.')
+        array = aaindex2.to_array(index_code2)
+        self.assertEqual((array[0, 1], array[1, 0]), (0.03, 0.034),
+            'Expected to_array() to keep both halves of an asymmetric matrix.')
+#3.)
+        #malformed matrix headers still resolve the correct row and column orders
+        record3 = aaindex2['DOSZ010101']
+        self.assertEqual(''.join(record3.col_order), 'ARNDCQEGHILKMFPSTWYV',
+            f"Unexpected col_order for DOSZ010101, got {''.join(record3.col_order)}.")
+        self.assertEqual(aaindex2.get('DOSZ010101', 'O', 'A'), 24.8,
+            f"Expected O,A = 24.8 for DOSZ010101, got {aaindex2.get('DOSZ010101', 'O', 'A')}.")
+
+    def test_freeze(self):
+        """ Test Case for freeze(), making the database immutable and safe to share between threads. """
+        frozen = AAIndex2()
+        frozen.freeze()
+#1.)
+        record = frozen['LINK010101']
+        self.assertIs(record, frozen['link010101'],
+            'Expected frozen records to be shared rather than rebuilt.')
+        self.assertEqual((record.matrix['A']['R'], record.matrix.R.A), (0.03, 0.034),
+            'Expected frozen matrix to keep both halves of an asymmetric record.')
+        self.assertEqual(frozen.get('HENS920102', 'W', 'C'), aaindex2.get('HENS920102', 'W', 'C'),
+            'Expected frozen get() to match the mutable instance.')
+        self.assertTrue(np.array_equal(frozen.to_tensor(), aaindex2.to_tensor(), equal_nan=True),
+            'Expected frozen to_tensor() to match the mutable instance.')
+        self.assertIs(frozen.search('BLOSUM62')['HENS920102'], frozen['HENS920102'],
+            'Expected search() to return the shared frozen records.')
+#2.)
+        with self.assertRaises(AttributeError):
+            frozen.aaindex_filename = 'aaindex3'
+        with self.assertRaises(TypeError):
+            record.matrix['A']['R'] = 1
+        with self.assertRaises(TypeError):
+            del record['matrix']
+
+    def test_record_offsets(self):
+        """ Test Case for single record lookups served from the byte-offset index into the raw file. """
+        database = AAIndex2()
+#1.)
+        self.assertEqual(database.get('HENS920102', 'W', 'C'), aaindex2.get('HENS920102', 'W', 'C'),
+            'Expected score from record parsed alone to match the database.')
+        self.assertEqual(database['LINK010101'].matrix, aaindex2['LINK010101'].matrix,
+            'Expected asymmetric matrix parsed alone to match the database.')
+        self.assertIsNone(database._aaindex_json, 'Expected single record lookups to not load the database.')
+        self.assertEqual(len(database), len(aaindex2), 'Expected full database to load when needed.')
+
+    def test_refresh(self):
+        """ Test Case for refresh(), updating the database from a new release file. """
+        database = AAIndex2()
+        codes = ['ALTS910101', 'BENS940101', 'BENS940102']
+        raw_path = os.path.join(database.aaindex_module_path, database.data_dir, database.aaindex_filename)
+        with open(raw_path) as f:
+            records = f.read().split('//\n')
+        untouched = database.to_array('BENS940102')
+        stale = database.to_tensor(codes)
+        stale_matrix = database.values('ALTS910101')
+#1.)
+        #change the (V, V) score of ALTS910101, the last value of its matrix
+        records = [record[:record.rindex('5.')] + '9.' + record[record.rindex('5.') + 2:]
+                   if record.startswith('H ALTS910101') else record for record in records]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            release_path = os.path.join(tmp_dir, 'aaindex2')
+            with open(release_path, 'w') as f:
+                f.write('//\n'.join(records))
+            diff = database.refresh(release_path, release_date='May 1, 2030')
+        self.assertEqual((diff.added, diff.removed, diff.changed), ([], [], ['ALTS910101']),
+            f'Unexpected differences between releases, got {diff}.')
+        self.assertEqual(database.get('ALTS910101', 'V', 'V'), 9.0, 'Expected the changed score to be loaded.')
+        self.assertEqual((stale_matrix['V']['V'], database.values('ALTS910101')['V']['V']), (5.0, 9.0),
+            'Expected the cached matrix dict of the changed record to be rebuilt.')
+        self.assertEqual(database.last_updated, 'May 1, 2030', 'Expected release date to be recorded.')
+        self.assertNotEqual(database.content_hash, aaindex2.content_hash, 'Expected new content hash.')
+#2.)
+        reference = AAIndex2()
+        reference.aaindex_json = database.aaindex_json
+        self.assertIs(database.to_array('BENS940102'), untouched,
+            'Expected cached arrays of unchanged records to be kept.')
+        self.assertEqual((stale[0, 19, 19], database.to_tensor(codes)[0, 19, 19]), (5.0, 9.0),
+            'Expected cached tensor of the changed record to be patched.')
+        self.assertTrue(np.array_equal(database.to_tensor(codes), reference.to_tensor(codes), equal_nan=True),
+            'Expected patched tensor to match a full rebuild.')
+        self.assertTrue(np.array_equal(database.pair_features('WA', 'WC', codes),
+                                       reference.pair_features('WA', 'WC', codes), equal_nan=True),
+            'Expected patched pair table to match a full rebuild.')
+
 if __name__ == '__main__':
     #run all unit tests
     unittest.main(verbosity=2)
@@ -2,8 +2,10 @@
 ################             AAindex3 Module Tests             #################
 ################################################################################
 
+import pickle
 import unittest
-from aaindex import aaindex3, __version__
+import numpy as np
+from aaindex import AAIndex3, aaindex3, encode, __version__
 
 class AAIndex3_Tests(unittest.TestCase):
     """
@@ -33,6 +35,14 @@ class AAIndex3_Tests(unittest.TestCase):
         testing the last updated date attribute matches the known database version.
     test_dunder_methods:
         testing __len__, __contains__, __iter__, and __repr__ dunder methods.
+    test_to_array:
+        testing the dense, cached, read-only 20x20 array built for a record.
+    test_get_many:
+        testing vectorised pairwise lookups with pre-encoded amino acids.
+    test_na_policy:
+        testing the NA replacement policies and NA mask of a record's dense array.
+    test_pickle:
+        testing instances pickle to a small reference to the database files, or a blob if assigned in memory.
     """
     def test_num_records(self):
         """ Test Case to check the correct number of records are present in the AAi3 database.
@@ -330,6 +340,112 @@ class AAIndex3_Tests(unittest.TestCase):
             'Statistical contact potential derived from 25 x-ray protein structures',
             'Whitespace-padded record code should resolve correctly.')
 
+    def test_to_array(self):
+        """ Test Case for to_array(), the dense 20x20 array of a record's matrix. """
+        amino_acids = 'ARNDCQEGHILKMFPSTWYV'
+#1.)
+        array = aaindex3.to_array('TANS760101')
+        self.assertEqual(array.shape, (20, 20),
+            f'Expected array of shape (20, 20), got {array.shape}.')
+        for i, aa1 in enumerate(amino_acids):
+            for j, aa2 in enumerate(amino_acids):
+                self.assertEqual(array[i, j], aaindex3.get('TANS760101', aa1, aa2),
+                    f'Array value for ({aa1},{aa2}) does not match get().')
+#2.)
+        #arrays are cached and read-only
+        self.assertIs(aaindex3.to_array('TANS760101'), array,
+            'Expected to_array() to return the cached array.')
+        self.assertIs(aaindex3.to_array('tans760101'), array,
+            'Expected lowercase record code to return the cached array.')
+        with self.assertRaises(ValueError):
+            array[0, 0] = 1.0
+#3.)
+        #NA values should be stored as NaN
+        self.assertTrue(np.isnan(aaindex3.to_array('ROBB790102')[0, 7]),
+            'Expected NaN for A,G in ROBB790102.')
+#4.)
+        with self.assertRaises(ValueError):
+            aaindex3.to_array('BLAH999999')
+
+    def test_get_many(self):
+        """ Test Case for get_many(), vectorised lookups of pre-encoded amino acid pairs. """
+        seq1 = encode('ARNDCQEG')
+        seq2 = encode('WYVAKLMF')
+#1.)
+        scores = aaindex3.get_many('TANS760101', np.stack([seq1, seq2], axis=-1))
+        self.assertEqual(scores.shape, (8,),
+            f'Expected 8 scores, got shape {scores.shape}.')
+        for score, aa1, aa2 in zip(scores, 'ARNDCQEG', 'WYVAKLMF'):
+            self.assertEqual(score, aaindex3.get('TANS760101', aa1, aa2),
+                f'get_many() score for ({aa1},{aa2}) does not match get().')
+#2.)
+        #arbitrary leading dimensions are preserved
+        pairs = np.array([[[0, 0], [0, 1]], [[1, 0], [19, 19]]])
+        self.assertEqual(aaindex3.get_many('TANS760101', pairs).shape, (2, 2),
+            'Expected get_many() to preserve the leading dimensions of pairs.')
+#3.)
+        with self.assertRaises(ValueError):
+            aaindex3.get_many('TANS760101', np.array([0, 1, 2]))
+        with self.assertRaises(IndexError):
+            aaindex3.get_many('TANS760101', np.array([[0, 20]]))
+
+    def test_na_policy(self):
+        """ Test Case for the NA policies and NA mask of a record's dense array. """
+        index_code = 'ROBB790102'
+        glycine = encode('G')[0]
+#1.)
+        mask = aaindex3.na_mask(index_code)
+        nan_array = aaindex3.to_array(index_code)
+        self.assertTrue(mask[glycine].all() and mask[:, glycine].all(),
+            'Expected every pair involving G to be NA in ROBB790102.')
+        self.assertTrue(np.array_equal(np.isnan(nan_array), mask),
+            'Expected NaN values exactly where the NA mask is set.')
+#2.)
+        zero_array = aaindex3.to_array(index_code, na_policy='zero')
+        self.assertTrue((zero_array[mask] == 0).all(),
+            'Expected NA values to be 0 under the zero policy.')
+#3.)
+        #diagonal mean policy fills with the mean of the known diagonal values
+        diagonal_array = aaindex3.to_array(index_code, na_policy='diagonal_mean')
+        expected = np.nanmean(np.diagonal(nan_array))
+        self.assertTrue(np.allclose(diagonal_array[mask], expected),
+            f'Expected NA values to be the diagonal mean {expected}.')
+#4.)
+        #mean policy falls back to the whole-matrix mean for all-NA columns
+        mean_array = aaindex3.to_array(index_code, na_policy='mean')
+        self.assertFalse(np.isnan(mean_array).any(),
+            'Expected no NaN values under the mean policy.')
+        self.assertAlmostEqual(mean_array[0, glycine], np.nanmean(nan_array),
+            msg='Expected all-NA column to be filled with the matrix mean.')
+#5.)
+        with self.assertRaises(ValueError):
+            aaindex3.to_array(index_code, na_policy='raise')
+        with self.assertRaises(ValueError):
+            aaindex3.to_array(index_code, na_policy='blah')
+        self.assertEqual(aaindex3.to_tensor([index_code], na_policy='zero')[0].tolist(), zero_array.tolist(),
+            'Expected to_tensor() to apply the NA policy to each matrix.')
+
+    def test_pickle(self):
+        """ Test Case for pickling instances without their parsed records. """
+#1.)
+        blob = pickle.dumps(aaindex3)
+        self.assertLess(len(blob), 1024, f'Expected pickle under 1KB, got {len(blob)} bytes.')
+        unpickled = pickle.loads(blob)
+        self.assertIsInstance(unpickled, AAIndex3, 'Expected an AAIndex3 instance.')
+        self.assertIsNone(unpickled._aaindex_json, 'Expected unpickled instance to load lazily.')
+        self.assertEqual(unpickled.get('TANS760101', 'A', 'C'), aaindex3.get('TANS760101', 'A', 'C'),
+            'Expected unpickled instance to load the same records.')
+#2.)
+        custom = AAIndex3()
+        custom.aaindex_json = {'TANS760101': aaindex3.aaindex_json['TANS760101']}
+        custom.freeze()
+        unpickled = pickle.loads(pickle.dumps(custom))
+        self.assertTrue(unpickled.frozen, 'Expected unpickled instance to remain frozen.')
+        self.assertEqual(list(unpickled), ['TANS760101'],
+            'Expected records assigned in memory to survive pickling.')
+        self.assertEqual(unpickled['TANS760101'].matrix, aaindex3['TANS760101'].matrix,
+            'Expected unpickled records to match the original.')
+
 if __name__ == '__main__':
     #run all unit tests
     unittest.main(verbosity=2)
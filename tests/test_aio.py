@@ -0,0 +1,95 @@
+################################################################################
+################             Asyncio Facade Module Tests       #################
+################################################################################
+
+import asyncio
+import threading
+import unittest
+import numpy as np
+from aaindex import AAIndex1, AAIndex3, aaindex1, aaindex3
+from aaindex.aio import AsyncAAIndex, async_aaindex1, preload
+
+class Aio_Tests(unittest.TestCase):
+    """
+    Test suite for testing the asyncio facade of the aaindex Python software package.
+
+    Test Cases
+    ==========
+    test_warm:
+        testing a cold database is loaded once, off the event loop thread, for concurrent callers.
+    test_lookups:
+        testing the record, values and get coroutines.
+    test_executor_queries:
+        testing search and encode_values run in the executor.
+    test_preload:
+        testing several databases are preloaded concurrently.
+    """
+    def test_warm(self):
+        """ Test Case to check cold databases are loaded off the event loop. """
+        database = AAIndex1()
+        load = database._load
+        load_threads = []
+        def tracked_load():
+            load_threads.append(threading.current_thread())
+            return load()
+        database._load = tracked_load
+        facade = AsyncAAIndex(database)
+#1.)
+        self.assertFalse(facade.loaded, 'Expected new database to not be loaded.')
+        async def run():
+            return await asyncio.gather(*(facade.record("CHOP780207") for _ in range(10)))
+        records = asyncio.run(run())
+        self.assertTrue(facade.loaded, 'Expected database to be loaded.')
+        self.assertEqual(len(load_threads), 1, f'Expected database to be loaded once, got {len(load_threads)}.')
+        self.assertIsNot(load_threads[0], threading.main_thread(), 'Expected database to be loaded off-loop.')
+        self.assertTrue(all(record == aaindex1["CHOP780207"] for record in records),
+            'Expected records to match synchronous lookup.')
+#2.)
+        asyncio.run(facade.warm(arrays=True))
+        self.assertEqual(len(load_threads), 1, 'Expected warm database to not be reloaded.')
+        self.assertIn((None, "zero"), database._array_cache, 'Expected dense array to be built.')
+#3.)
+        failing = AsyncAAIndex(AAIndex1())
+        failing.database.data_dir = "missing_data_dir"
+        with self.assertRaises(OSError, msg='OSError expected, database files not found.'):
+            asyncio.run(failing.warm())
+        self.assertIsNone(failing._warming, 'Expected failed load to be retried by next caller.')
+
+    def test_lookups(self):
+        """ Test Case to check the lookup coroutines. """
+        facade = AsyncAAIndex(aaindex3)
+#1.)
+        self.assertEqual(asyncio.run(async_aaindex1.values("andn920101"))["A"], 4.35,
+            'Expected value 4.35 for A in ANDN920101.')
+        self.assertEqual(asyncio.run(facade.get("TANS760101", "A", "C")), aaindex3.get("TANS760101", "A", "C"),
+            'Expected async get to match synchronous get.')
+        self.assertEqual(asyncio.run(facade.record("TANS760101")).description,
+            aaindex3["TANS760101"].description, 'Expected async record to match synchronous lookup.')
+#2.)
+        with self.assertRaises(ValueError, msg='ValueError expected, invalid record code.'):
+            asyncio.run(facade.record("ABCD123456"))
+        with self.assertRaises(TypeError, msg='TypeError expected, get() on AAindex1.'):
+            asyncio.run(async_aaindex1.get("ANDN920101", "A", "C"))
+        with self.assertRaises(TypeError, msg='TypeError expected, encode_values() on AAindex3.'):
+            asyncio.run(facade.encode_values("ACDE"))
+
+    def test_executor_queries(self):
+        """ Test Case to check search and encode_values. """
+#1.)
+        self.assertEqual(asyncio.run(async_aaindex1.search("hydrophobicity")).keys(),
+            aaindex1.search("hydrophobicity").keys(), 'Expected async search to match synchronous search.')
+#2.)
+        async def run():
+            return await asyncio.gather(async_aaindex1.encode_values("ACDE", ["ANDN920101"]),
+                                        async_aaindex1.encode_values(["ACDE", "AC"], ["ANDN920101"], max_len=3))
+        single, batch = asyncio.run(run())
+        np.testing.assert_array_equal(single, aaindex1.encode_values("ACDE", ["ANDN920101"]))
+        self.assertEqual(batch.shape, (2, 3, 1), f'Expected batch of shape (2, 3, 1), got {batch.shape}.')
+
+    def test_preload(self):
+        """ Test Case to check preloading several databases. """
+        facades = [AsyncAAIndex(AAIndex1()), AsyncAAIndex(AAIndex3())]
+#1.)
+        asyncio.run(preload(*facades))
+        self.assertTrue(all(facade.loaded for facade in facades), 'Expected all databases to be loaded.')
+        self.assertIsNotNone(facades[0].database._categories, 'Expected AAindex1 categories to be loaded.')
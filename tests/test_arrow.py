@@ -0,0 +1,130 @@
+################################################################################
+################            Arrow Export Module Tests          #################
+################################################################################
+
+import os
+import tempfile
+import unittest
+import numpy as np
+from aaindex import aaindex1, aaindex2, aaindex3
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+@unittest.skipIf(pyarrow is None, "pyarrow is not installed.")
+class Arrow_Tests(unittest.TestCase):
+    """
+    Test suite for testing the Apache Arrow and Parquet export of the aaindex Python software package.
+
+    Test Cases
+    ==========
+    test_values_long:
+        testing the AAindex1 values table in long form, including null NA values and zero-copy buffers.
+    test_values_wide:
+        testing the AAindex1 values table in wide form.
+    test_matrices:
+        testing the AAindex2/AAindex3 matrices tables in long and wide form.
+    test_metadata:
+        testing the metadata tables of each database.
+    test_parquet:
+        testing tables round trip through Parquet files.
+    """
+    def test_values_long(self):
+        """ Test Case to check the AAindex1 values table in long form. """
+#1.)
+        table = aaindex1.to_arrow()
+        self.assertEqual(table.column_names, ['record_code', 'amino_acid', 'value'],
+            f'Unexpected columns in values table, got {table.column_names}.')
+        self.assertEqual(table.num_rows, 566 * 21,
+            f'Expected {566 * 21} rows in values table, got {table.num_rows}.')
+#2.)
+        #numeric column wraps the cached numpy buffer without copying
+        table = aaindex1.to_arrow(na_policy='zero')
+        self.assertEqual(table.column('value').chunk(0).buffers()[1].address,
+            aaindex1.to_array(aaindex1.record_codes(), 'zero').ctypes.data,
+            'Expected the value column to share memory with the dense value array.')
+#3.)
+        #NA values are exported as nulls under the default NaN policy
+        table = aaindex1.to_arrow(record_codes=['ROSM880104'])
+        self.assertEqual(table.column('value').null_count, 2,
+            f"Expected 2 null values for ROSM880104, got {table.column('value').null_count}.")
+        rows = table.to_pylist()
+        self.assertEqual(rows[0], {'record_code': 'ROSM880104', 'amino_acid': 'A', 'value': 0.39},
+            f'Unexpected first row of values table, got {rows[0]}.')
+
+    def test_values_wide(self):
+        """ Test Case to check the AAindex1 values table in wide form. """
+#1.)
+        table = aaindex1.to_arrow(form='wide', record_codes=['AURR980103', 'FINA770101'])
+        self.assertEqual(table.column_names, ['record_code'] + list('ARNDCQEGHILKMFPSTWYV-'),
+            f'Unexpected columns in wide values table, got {table.column_names}.')
+        self.assertEqual(table.column('record_code').to_pylist(), ['AURR980103', 'FINA770101'],
+            'Expected one row per record in the requested order.')
+        self.assertEqual(table.column('W').to_pylist(), [1.06, 1.1],
+            f"Unexpected W values in wide values table, got {table.column('W').to_pylist()}.")
+#2.)
+        with self.assertRaises(ValueError):
+            aaindex1.to_arrow(form='blah')
+        with self.assertRaises(ValueError):
+            aaindex1.to_arrow(table='blah')
+
+    def test_matrices(self):
+        """ Test Case to check the AAindex2/AAindex3 matrices tables. """
+#1.)
+        table = aaindex2.to_arrow(record_codes=['ALTS910101'])
+        self.assertEqual(table.column_names, ['record_code', 'aa1', 'aa2', 'value'],
+            f'Unexpected columns in matrices table, got {table.column_names}.')
+        self.assertEqual(table.num_rows, 400,
+            f'Expected 400 rows in matrices table, got {table.num_rows}.')
+        self.assertEqual(table.slice(1, 1).to_pylist()[0],
+            {'record_code': 'ALTS910101', 'aa1': 'A', 'aa2': 'R', 'value': -3.0},
+            'Unexpected A,R row in matrices table.')
+#2.)
+        table = aaindex3.to_arrow(form='wide')
+        self.assertEqual(table.num_rows, 47 * 20,
+            f'Expected {47 * 20} rows in wide matrices table, got {table.num_rows}.')
+        tensor = aaindex3.to_tensor()
+        self.assertTrue(np.array_equal(table.column('G').to_numpy(zero_copy_only=False),
+            tensor[:, :, 7].ravel(), equal_nan=True),
+            'Expected wide matrices column G to match the stacked tensor.')
+
+    def test_metadata(self):
+        """ Test Case to check the metadata tables of each database. """
+#1.)
+        table = aaindex1.to_arrow('metadata')
+        self.assertEqual(table.num_rows, 566,
+            f'Expected 566 rows in metadata table, got {table.num_rows}.')
+        row = table.slice(aaindex1.record_codes().index('AURR980103'), 1).to_pylist()[0]
+        self.assertEqual(row['description'], aaindex1['AURR980103'].description,
+            'Unexpected description in metadata table.')
+        self.assertEqual(row['category'], aaindex1['AURR980103'].category,
+            'Unexpected category in metadata table.')
+#2.)
+        table = aaindex2.to_arrow('metadata', record_codes=['LINK010101'])
+        row = table.to_pylist()[0]
+        self.assertFalse(row['symmetric'],
+            'Expected LINK010101 to be flagged as asymmetric in metadata table.')
+        self.assertEqual(len(row['row_order']), 20,
+            'Expected 20 amino acids in row_order of metadata table.')
+
+    def test_parquet(self):
+        """ Test Case to check tables round trip through Parquet files. """
+        with tempfile.TemporaryDirectory() as tmp_dir:
+#1.)
+            path = os.path.join(tmp_dir, 'aaindex1.parquet')
+            aaindex1.to_parquet(path)
+            table = aaindex1.read_parquet(path)
+            self.assertTrue(table.equals(aaindex1.to_arrow()),
+                'Expected AAindex1 values table to round trip through Parquet.')
+#2.)
+            path = os.path.join(tmp_dir, 'aaindex3.parquet')
+            aaindex3.to_parquet(path, form='wide')
+            table = aaindex3.read_parquet(path, columns=['record_code', 'A'])
+            self.assertEqual(table.column_names, ['record_code', 'A'],
+                f'Expected only the requested columns, got {table.column_names}.')
+
+if __name__ == '__main__':
+    #run all unit tests
+    unittest.main(verbosity=2)
@@ -0,0 +1,112 @@
+################################################################################
+################              Cache Module Tests               #################
+################################################################################
+
+import os
+import tempfile
+import unittest
+import numpy as np
+from aaindex import aaindex1
+from aaindex.cache import EncodingCache
+
+class Cache_Tests(unittest.TestCase):
+    """
+    Test suite for testing the cache module in the aaindex Python software package.
+
+    Test Cases
+    ==========
+    test_encoding_cache:
+        testing cached encodings match encode_values(), hit/miss statistics and persistence across instances.
+    test_eviction:
+        testing least recently used entries are evicted beyond the size bound.
+    """
+    index_codes = ['KYTJ820101', 'CHOP780207', 'ANDN920101']
+    sequences = ['MKTAYIAKQRQISFVKSHFSRQ', 'ACDEFGHIKLMNPQRSTVWY', 'WYV-KL', 'MKTAYIAKQRQISFVKSHFSRQ']
+
+    def setUp(self):
+        """ Create a temporary directory for the cache file. """
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'cache', 'encodings.sqlite')
+
+    def tearDown(self):
+        """ Remove the temporary directory. """
+        self.directory.cleanup()
+
+    def test_encoding_cache(self):
+        """ Test Case to check cached encodings and statistics. """
+#1.)
+        with EncodingCache(self.path) as cache:
+            encoded = cache.encode_values(self.sequences, self.index_codes)
+            self.assertTrue(np.array_equal(encoded, aaindex1.encode_values(self.sequences, self.index_codes)),
+                'Expected cached batch encoding to match encode_values().')
+            stats = cache.stats()
+            self.assertEqual((stats.hits, stats.misses, stats.entries), (0, 3, 3),
+                f'Expected 3 misses and 3 stored distinct sequences, got {stats}.')
+            self.assertTrue(np.array_equal(cache.encode_values(self.sequences, self.index_codes), encoded),
+                'Expected encodings served from the cache to match.')
+            self.assertEqual(cache.stats().hits, 3, f'Expected 3 hits, got {cache.stats().hits}.')
+            self.assertEqual(cache.stats().hit_rate, 0.5, f'Expected hit rate 0.5, got {cache.stats().hit_rate}.')
+#2.)
+            self.assertTrue(np.array_equal(cache.encode_values('acdefghiklmnpqrstvwy', self.index_codes),
+                                           aaindex1.encode_values(self.sequences[1], self.index_codes)),
+                'Expected lowercase sequences to share the entry of their uppercase form.')
+            values, offsets = cache.encode_values(self.sequences, self.index_codes, ragged=True)
+            expected_values, expected_offsets = aaindex1.encode_values(self.sequences, self.index_codes, ragged=True)
+            self.assertTrue(np.array_equal(values, expected_values) and np.array_equal(offsets, expected_offsets),
+                'Expected ragged cached encodings to match encode_values().')
+            self.assertTrue(np.array_equal(cache.encode_values(self.sequences, self.index_codes, max_len=8),
+                                           aaindex1.encode_values(self.sequences, self.index_codes, max_len=8)),
+                'Expected cached encodings truncated to max_len.')
+            self.assertTrue(np.array_equal(cache.encode_values(self.sequences[0], self.index_codes, max_len=4),
+                                           aaindex1.encode_values(self.sequences[0], self.index_codes, max_len=4)),
+                'Expected max_len to be ignored for a single sequence, as in encode_values().')
+            values, offsets = cache.encode_values(self.sequences[0], self.index_codes, max_len=4, ragged=True)
+            expected_values, expected_offsets = aaindex1.encode_values(self.sequences[0], self.index_codes,
+                                                                       max_len=4, ragged=True)
+            self.assertTrue(np.array_equal(values, expected_values) and np.array_equal(offsets, expected_offsets),
+                'Expected a single ragged sequence truncated to max_len, as in encode_values().')
+            normalised = cache.encode_values(self.sequences, self.index_codes, 'zscore')
+            self.assertTrue(np.array_equal(normalised, aaindex1.encode_values(self.sequences, self.index_codes, 'zscore')),
+                'Expected normalised encodings to be cached under their own key.')
+            self.assertEqual(len(cache), 6, f'Expected 6 stored encodings, got {len(cache)}.')
+#3.)
+        with EncodingCache(self.path) as cache:
+            cache.encode_values(self.sequences, self.index_codes)
+            self.assertEqual((cache.hits, cache.misses), (3, 0), 'Expected encodings to persist across instances.')
+            cache.encode_values(self.sequences, self.index_codes[:2])
+            self.assertEqual(cache.misses, 3, 'Expected a different index set to miss.')
+            cache.clear()
+            self.assertEqual((len(cache), cache.hits), (0, 0), 'Expected clear() to empty the cache and statistics.')
+#4.)
+            with self.assertRaises(ValueError):
+                cache.encode_values('ACDXZ', self.index_codes)
+            with self.assertRaises(ValueError):
+                cache.encode_values('ACDE', ['ABCD123456'])
+            with self.assertRaises(TypeError):
+                cache.encode_values(1234, self.index_codes)
+            with self.assertRaises(ValueError):
+                cache.encode_values(self.sequences, self.index_codes, max_len=-1, ragged=True)
+        with self.assertRaises(ValueError):
+            EncodingCache(self.path, max_bytes=0)
+
+    def test_eviction(self):
+        """ Test Case to check size bounded least recently used eviction. """
+        entry_bytes = 20 * len(self.index_codes) * 8
+#1.)
+        with EncodingCache(self.path, max_bytes=2 * entry_bytes) as cache:
+            first, second, third = 'A' * 20, 'C' * 20, 'D' * 20
+            cache.encode_values([first, second], self.index_codes)
+            cache.encode_values(first, self.index_codes)
+            cache.encode_values(third, self.index_codes)
+            stats = cache.stats()
+            self.assertEqual((stats.entries, stats.evictions), (2, 1),
+                f'Expected 1 eviction leaving 2 entries, got {stats}.')
+            self.assertLessEqual(stats.nbytes, stats.max_bytes, 'Expected stored bytes within max_bytes.')
+#2.)
+            cache.encode_values([first, third], self.index_codes)
+            self.assertEqual(cache.misses, 3, 'Expected the recently used entries to be kept.')
+            cache.encode_values(second, self.index_codes)
+            self.assertEqual(cache.misses, 4, 'Expected the least recently used entry to have been evicted.')
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
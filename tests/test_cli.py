@@ -0,0 +1,173 @@
+################################################################################
+################           Command-Line Tool Module Tests      #################
+################################################################################
+
+import io
+import json
+import os
+import tempfile
+import unittest
+import unittest.mock
+from contextlib import redirect_stdout, redirect_stderr
+import numpy as np
+from aaindex import aaindex1, aaindex2
+from aaindex.cli import main, read_fasta
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+class CLI_Tests(unittest.TestCase):
+    """
+    Test suite for testing the command-line tool of the aaindex Python software package.
+
+    Test Cases
+    ==========
+    test_read_fasta:
+        testing FASTA files are streamed as (identifier, sequence) pairs.
+    test_get:
+        testing the get command prints records and values from each database.
+    test_search:
+        testing the search command prints matching record codes.
+    test_encode_npy:
+        testing the encode command writes a padded .npy array, serially, in parallel and from stdin.
+    test_encode_parquet:
+        testing the encode command writes a long Parquet table.
+    test_export:
+        testing the export command writes .npy and .json files.
+    """
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp_dir = tempfile.TemporaryDirectory()
+        cls.fasta = os.path.join(cls.tmp_dir.name, "seqs.fasta")
+        cls.sequences = [("seq1", "ACDEFGHIK"), ("seq2", "LMNPQ"), ("seq3", "RSTVWY-A")]
+        with open(cls.fasta, "w") as f:
+            for identifier, sequence in cls.sequences:
+                f.write(f">{identifier} description\n{sequence[:4]}\n{sequence[4:]}\n\n")
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp_dir.cleanup()
+
+    def run_cli(self, *argv):
+        """ Run the command-line tool, returning its exit code, stdout and stderr. """
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            code = main(list(argv))
+        return code, stdout.getvalue(), stderr.getvalue()
+
+    def test_read_fasta(self):
+        """ Test Case to check FASTA records are read. """
+#1.)
+        self.assertEqual(list(read_fasta(self.fasta)), self.sequences,
+            'Unexpected records read from FASTA file.')
+#2.)
+        bad_fasta = os.path.join(self.tmp_dir.name, "bad.fasta")
+        with open(bad_fasta, "w") as f:
+            f.write("ACDE\n>seq1\nACDE\n")
+        with self.assertRaises(ValueError, msg='ValueError expected, sequence before first header.'):
+            list(read_fasta(bad_fasta))
+
+    def test_get(self):
+        """ Test Case to check the get command. """
+#1.)
+        code, out, _ = self.run_cli("get", "ANDN920101")
+        self.assertEqual(code, 0, 'Expected exit code 0.')
+        self.assertEqual(json.loads(out)["description"], aaindex1["ANDN920101"].description,
+            'Unexpected record printed.')
+#2.)
+        code, out, _ = self.run_cli("get", "andn920101", "A")
+        self.assertEqual(float(out), 4.35, f'Expected value 4.35, got {out}.')
+#3.)
+        code, out, _ = self.run_cli("get", "ALTS910101", "A", "R")
+        self.assertEqual((code, float(out)), (0, aaindex2.get("ALTS910101", "A", "R")),
+            f'Unexpected AAindex2 value, got {out}.')
+#4.)
+        code, out, err = self.run_cli("get", "ABCD123456")
+        self.assertEqual((code, out), (1, ""), 'Expected exit code 1 for invalid record code.')
+        self.assertIn("not found", err, 'Expected error message on stderr.')
+#5.)
+        code, _, err = self.run_cli("get", "ANDN920101", "A", "R")
+        self.assertEqual(code, 1, 'Expected exit code 1 for two amino acids with an AAindex1 record.')
+
+    def test_search(self):
+        """ Test Case to check the search command. """
+#1.)
+        code, out, _ = self.run_cli("search", "hydrophobicity")
+        lines = out.strip().split("\n")
+        self.assertEqual(code, 0, 'Expected exit code 0.')
+        self.assertEqual(len(lines), len(aaindex1.search("hydrophobicity")),
+            'Expected one line per matching record.')
+        self.assertTrue(all(line.split("\t")[0] in aaindex1 for line in lines),
+            'Expected each line to start with an AAindex1 record code.')
+#2.)
+        code, out, _ = self.run_cli("search", "blosum", "--db", "2")
+        self.assertIn("HENS920102", out, 'Expected BLOSUM62 in AAindex2 search results.')
+
+    def test_encode_npy(self):
+        """ Test Case to check the encode command writing .npy files. """
+        codes = ["ANDN920101", "ARGP820101", "CHOP780207"]
+        expected = aaindex1.encode_values([sequence for _, sequence in self.sequences], codes)
+#1.)
+        output = os.path.join(self.tmp_dir.name, "out.npy")
+        code, _, _ = self.run_cli("encode", self.fasta, "-o", output, "-i", *codes,
+                                  "--dtype", "float64", "--batch-size", "2")
+        self.assertEqual(code, 0, 'Expected exit code 0.')
+        np.testing.assert_array_equal(np.load(output), expected)
+#2.)
+        output = os.path.join(self.tmp_dir.name, "out_parallel.npy")
+        code, _, _ = self.run_cli("encode", self.fasta, "-o", output, "-i", *codes,
+                                  "--dtype", "float64", "--batch-size", "1", "--jobs", "2")
+        self.assertEqual(code, 0, 'Expected exit code 0.')
+        np.testing.assert_array_equal(np.load(output), expected)
+#3.)
+        output = os.path.join(self.tmp_dir.name, "out_all.npy")
+        code, _, _ = self.run_cli("encode", self.fasta, "-o", output, "--max-len", "4")
+        self.assertEqual(np.load(output).shape, (3, 4, aaindex1.num_records()),
+            'Expected array of shape (3, 4, 566).')
+        self.assertEqual(np.load(output).dtype, np.float32, 'Expected float32 output by default.')
+#4.)
+        output = os.path.join(self.tmp_dir.name, "out_stdin.npy")
+        with open(self.fasta) as f, unittest.mock.patch("sys.stdin", io.StringIO(f.read())):
+            code, _, _ = self.run_cli("encode", "-", "-o", output, "-i", *codes, "--dtype", "float64")
+        self.assertEqual(code, 0, 'Expected exit code 0 reading from stdin.')
+        np.testing.assert_array_equal(np.load(output), expected)
+#5.)
+        code, _, err = self.run_cli("encode", self.fasta, "-o", os.path.join(self.tmp_dir.name, "out.csv"))
+        self.assertEqual(code, 1, 'Expected exit code 1 for invalid output extension.')
+
+    @unittest.skipIf(pyarrow is None, "pyarrow is not installed.")
+    def test_encode_parquet(self):
+        """ Test Case to check the encode command writing Parquet files. """
+        import pyarrow.parquet as pq
+        output = os.path.join(self.tmp_dir.name, "out.parquet")
+#1.)
+        code, _, _ = self.run_cli("encode", self.fasta, "-o", output, "-i", "ANDN920101", "CHOP780207",
+                                  "--dtype", "float64", "--batch-size", "2")
+        self.assertEqual(code, 0, 'Expected exit code 0.')
+        table = pq.read_table(output)
+        self.assertEqual(table.column_names, ["sequence_id", "position", "residue", "ANDN920101", "CHOP780207"],
+            f'Unexpected columns, got {table.column_names}.')
+        self.assertEqual(table.num_rows, sum(len(sequence) for _, sequence in self.sequences),
+            'Expected one row per residue.')
+#2.)
+        rows = table.to_pylist()
+        self.assertEqual(rows[0], {"sequence_id": "seq1", "position": 0, "residue": "A",
+                                   "ANDN920101": 4.35, "CHOP780207": aaindex1["CHOP780207"].values["A"]},
+            f'Unexpected first row, got {rows[0]}.')
+        self.assertEqual((rows[-1]["sequence_id"], rows[-1]["position"]), ("seq3", 7),
+            'Unexpected last row.')
+
+    def test_export(self):
+        """ Test Case to check the export command. """
+#1.)
+        output = os.path.join(self.tmp_dir.name, "aaindex3.npy")
+        code, _, _ = self.run_cli("export", output, "--db", "3")
+        self.assertEqual(code, 0, 'Expected exit code 0.')
+        self.assertEqual(np.load(output).shape, (47, 20, 20), 'Expected AAindex3 tensor of shape (47, 20, 20).')
+#2.)
+        output = os.path.join(self.tmp_dir.name, "aaindex1.json")
+        code, _, _ = self.run_cli("export", output)
+        with open(output) as f:
+            self.assertEqual(len(json.load(f)), 566, 'Expected 566 records in exported JSON.')
@@ -0,0 +1,137 @@
+################################################################################
+################             Contacts Module Tests             #################
+################################################################################
+
+import unittest
+import numpy as np
+from aaindex import aaindex3
+from aaindex.encoding import AMINO_ACIDS, encode
+from aaindex.contacts import ContactEnergy, find_contacts
+
+class Contacts_Tests(unittest.TestCase):
+    """
+    Test suite for testing the contacts module in the aaindex Python software package.
+
+    Test Cases
+    ==========
+    test_contact_energy:
+        testing contact energies of sequences and mutants against per-contact get() lookups.
+    test_find_contacts:
+        testing cell-list contacts of one or many models against all-pairs distances.
+    """
+    sequence = 'MKTAYIAKQRQISFVKSHFSRQ'
+    contacts = [[0, 5], [1, 9], [2, 14], [5, 9], [3, 20], [9, 17], [12, 4], [7, 18], [5, 16], [15, 21]]
+    matrices = ['MIYS960102', 'ZHAC000102']
+
+    def test_contact_energy(self):
+        """ Test Case to check contact energies and mutant energy deltas. """
+        def reference(sequence, code):
+            return sum(aaindex3.get(code, sequence[i], sequence[j]) for i, j in self.contacts)
+
+        def mutate(sequence, positions, residues):
+            sequence = list(sequence)
+            for position, residue in zip(positions, residues):
+                sequence[position] = residue
+            return ''.join(sequence)
+#1.)
+        energy = ContactEnergy(self.contacts, len(self.sequence), self.matrices)
+        self.assertEqual(len(energy), 10, f'Expected 10 contacts, got {len(energy)}.')
+        self.assertTrue(np.allclose(energy.score(self.sequence), [reference(self.sequence, code) for code in self.matrices]),
+            'Expected energy to match the sum of per-contact get() lookups, including asymmetric ZHAC000102.')
+        batch = [self.sequence, self.sequence[::-1], 'A' * len(self.sequence)]
+        scores = energy.score(batch)
+        self.assertEqual(scores.shape, (3, 2), f'Expected batch scores of shape (3, 2), got {scores.shape}.')
+        self.assertTrue(np.array_equal(scores, energy.score(np.stack([encode(sequence) for sequence in batch]))),
+            'Expected code arrays to score as their sequences.')
+        self.assertEqual(ContactEnergy(self.contacts, len(self.sequence)).score('-' * len(self.sequence)), 0,
+            'Expected gap residues to contribute nothing.')
+#2.)
+        single = ContactEnergy(self.contacts, len(self.sequence))
+        base = single.score(self.sequence)
+        mutants = [([5, 9], 'WD'), ([0, 5], 'GG'), ([11, 3], 'CP')]
+        deltas = single.delta(self.sequence, [positions for positions, _ in mutants],
+                              [residues for _, residues in mutants])
+        self.assertEqual(deltas.shape, (3, ), f'Expected deltas of shape (3,), got {deltas.shape}.')
+        for (positions, residues), delta in zip(mutants, deltas):
+            self.assertAlmostEqual(delta, single.score(mutate(self.sequence, positions, residues)) - base,
+                msg=f'Expected delta of mutant {positions} {residues} to match a full rescore.')
+        self.assertAlmostEqual(single.delta(self.sequence, 9, 'E'), single.score(mutate(self.sequence, [9], 'E')) - base,
+            msg='Expected single mutant delta to match a full rescore.')
+        self.assertEqual(single.delta(self.sequence, 11, 'W'), 0, 'Expected zero delta at a position without contacts.')
+#3.)
+        scan = energy.single_mutant_deltas(self.sequence)
+        self.assertEqual(scan.shape, (22, 20, 2), f'Expected scan of shape (22, 20, 2), got {scan.shape}.')
+        self.assertTrue(np.allclose(scan[9, AMINO_ACIDS.index('H')],
+                                    energy.score(mutate(self.sequence, [9], 'H')) - energy.score(self.sequence)),
+            'Expected scan to match a full rescore of the point mutant.')
+        self.assertTrue(np.allclose(scan[np.arange(22), encode(self.sequence)], 0),
+            'Expected zero delta for the wild-type residues.')
+#4.)
+        with self.assertRaises(ValueError):
+            ContactEnergy([[0, 22]], len(self.sequence))
+        with self.assertRaises(ValueError):
+            ContactEnergy([[3, 3]], len(self.sequence))
+        with self.assertRaises(ValueError):
+            ContactEnergy([[0, 1, 2]], len(self.sequence))
+        with self.assertRaises(ValueError):
+            single.score('ACDE')
+        with self.assertRaises(ValueError):
+            single.delta(self.sequence, [1, 1], 'AC')
+        with self.assertRaises(IndexError):
+            single.delta(self.sequence, 30, 'A')
+        with self.assertRaises(TypeError):
+            single.score(1234)
+
+    def test_find_contacts(self):
+        """ Test Case to check contacts found from residue coordinates. """
+        def reference(coordinates, cutoff, min_separation, chain_ids=None):
+            i, j = np.triu_indices(len(coordinates), 1)
+            distances = np.linalg.norm(coordinates[i] - coordinates[j], axis=1)
+            separated = j - i >= min_separation
+            if chain_ids is not None:
+                separated |= chain_ids[i] != chain_ids[j]
+            keep = (distances <= cutoff) & separated
+            return np.stack([i[keep], j[keep]], axis=1)
+
+        rng = np.random.default_rng(0)
+        models = np.cumsum(rng.normal(0, 2.5, (3, 300, 3)), axis=1)
+        chain_ids = np.repeat(['A', 'B', 'C'], 100)
+#1.)
+        contacts = find_contacts(models[0])
+        self.assertEqual(contacts.shape[1], 2, f'Expected contacts of shape (n, 2), got {contacts.shape}.')
+        self.assertTrue(np.array_equal(contacts, reference(models[0], 8.0, 3)),
+            'Expected contacts to match all-pairs distances.')
+        self.assertTrue(np.array_equal(find_contacts(models[0], 5.0, 1, chain_ids, chunk_size=1000),
+                                       reference(models[0], 5.0, 1, chain_ids)),
+            'Expected chunked contacts to match all-pairs distances.')
+        inter_chain = find_contacts(models[0], 12.0, 50, chain_ids)
+        self.assertTrue(np.array_equal(inter_chain, reference(models[0], 12.0, 50, chain_ids)),
+            'Expected contacts across chains to be kept whatever their separation.')
+#2.)
+        ensemble = find_contacts(models)
+        self.assertEqual(len(ensemble), 3, f'Expected contacts for 3 models, got {len(ensemble)}.')
+        for model, model_contacts in zip(models, ensemble):
+            self.assertTrue(np.array_equal(model_contacts, reference(model, 8.0, 3)),
+                'Expected contacts of each model to match all-pairs distances.')
+        missing = models[0].copy()
+        missing[10] = np.nan
+        self.assertFalse((find_contacts(missing) == 10).any(), 'Expected residues with NaN coordinates to be skipped.')
+        self.assertEqual(find_contacts(models[0][:1]).shape, (0, 2), 'Expected no contacts for a single residue.')
+#3.)
+        energy = ContactEnergy.from_coordinates(models[0])
+        self.assertTrue(np.array_equal(energy.contacts, contacts), 'Expected scorer over the model contacts.')
+        self.assertEqual(energy.length, 300, f'Expected scorer length 300, got {energy.length}.')
+#4.)
+        with self.assertRaises(ValueError):
+            find_contacts(models[0][:, :2])
+        with self.assertRaises(ValueError):
+            find_contacts(models[0], cutoff=0)
+        with self.assertRaises(ValueError):
+            find_contacts(models[0], min_separation=0)
+        with self.assertRaises(ValueError):
+            find_contacts(models[0], chain_ids=chain_ids[:10])
+        with self.assertRaises(ValueError):
+            ContactEnergy.from_coordinates(models)
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,182 @@
+################################################################################
+################            Descriptors Module Tests           #################
+################################################################################
+
+import unittest
+import numpy as np
+from aaindex import aaindex1, aaindex2
+from aaindex.descriptors import (moreau_broto, moran, geary, pseaac, sequence_order_coupling,
+                                  quasi_sequence_order, IncrementalDescriptors)
+
+class Descriptors_Tests(unittest.TestCase):
+    """
+    Test suite for testing the descriptors module in the aaindex Python software package.
+
+    Test Cases
+    ==========
+    test_autocorrelation:
+        testing Moreau-Broto, Moran and Geary autocorrelation against a direct per-residue calculation.
+    test_autocorrelation_edge_cases:
+        testing lag selection, short and constant sequences, and invalid input.
+    test_pseaac:
+        testing pseudo amino acid composition against a direct per-residue calculation.
+    test_quasi_sequence_order:
+        testing sequence-order coupling numbers and quasi-sequence-order descriptors.
+    test_incremental_descriptors:
+        testing descriptors updated by residue substitutions are bit-identical to a full recomputation.
+    """
+    index_codes = ['CHOP780207', 'ANDN920101', 'ARGP820101']
+    sequences = ['ACDEFGHIKLMNPQRSTVWY', 'WYVKL', 'MKTAYIAKQRQISFVKSHFSRQ']
+
+    def reference(self, method, sequence, code, lag):
+        """ Direct per-residue calculation of an autocorrelation descriptor. """
+        table = dict(zip('ARNDCQEGHILKMFPSTWYV', aaindex1.normalised('zscore', [code])[0]))
+        p = [table[aa] for aa in sequence]
+        n = len(p)
+        if n <= lag:
+            return np.nan
+        mean = sum(p) / n
+        sum_squares = sum((x - mean) ** 2 for x in p)
+        if method == 'moreau_broto':
+            return sum(p[i] * p[i + lag] for i in range(n - lag)) / (n - lag)
+        if method == 'moran':
+            return (sum((p[i] - mean) * (p[i + lag] - mean) for i in range(n - lag)) / (n - lag)) / (sum_squares / n)
+        return (n - 1) / (2 * (n - lag)) * sum((p[i] - p[i + lag]) ** 2 for i in range(n - lag)) / sum_squares
+
+    def test_autocorrelation(self):
+        """ Test Case to check autocorrelation descriptors against a direct calculation. """
+        for method, function in [('moreau_broto', moreau_broto), ('moran', moran), ('geary', geary)]:
+#1.)
+            batch = function(self.sequences, self.index_codes, lags=8)
+            self.assertEqual(batch.shape, (3, 8, 3),
+                f'Expected {method} batch of shape (3, 8, 3), got {batch.shape}.')
+            expected = np.array([[[self.reference(method, sequence, code, lag) for code in self.index_codes]
+                                  for lag in range(1, 9)] for sequence in self.sequences])
+            self.assertTrue(np.allclose(batch, expected, equal_nan=True),
+                f'Expected batched {method} to match the direct calculation.')
+#2.)
+            single = function(self.sequences[2], self.index_codes, lags=8)
+            self.assertTrue(np.allclose(single, batch[2]),
+                f'Expected single sequence {method} to match its row of the batch.')
+
+    def test_autocorrelation_edge_cases(self):
+        """ Test Case to check autocorrelation lags, short sequences and invalid input. """
+#1.)
+        selected = moran(self.sequences, self.index_codes, lags=[2, 5])
+        self.assertTrue(np.allclose(selected, moran(self.sequences, self.index_codes, lags=5)[:, [1, 4]],
+                                    equal_nan=True),
+            'Expected explicit lags to select the same columns.')
+        self.assertEqual(moreau_broto('ACDE', lags=3).shape, (3, aaindex1.num_records()),
+            'Expected all records by default.')
+#2.)
+        #lags not shorter than the sequence, and constant sequences, are NaN
+        self.assertTrue(np.isnan(geary('WYVKL', self.index_codes, lags=[5])).all(),
+            'Expected NaN for a lag equal to the sequence length.')
+        self.assertTrue(np.isnan(moran('AAAA', self.index_codes, lags=2)).all(),
+            'Expected NaN Moran autocorrelation for a constant sequence.')
+        self.assertFalse(np.isnan(moreau_broto('AAAA', self.index_codes, lags=2)).any(),
+            'Expected Moreau-Broto autocorrelation to be defined for a constant sequence.')
+#3.)
+        with self.assertRaises(ValueError):
+            moran('ACDE', self.index_codes, lags=0)
+        with self.assertRaises(ValueError):
+            geary('ACDXZ', self.index_codes)
+        with self.assertRaises(ValueError):
+            moreau_broto('ACDE', ['ABCD123456'])
+
+    def test_pseaac(self):
+        """ Test Case to check pseudo amino acid composition against a direct calculation. """
+        codes = ['EISD840101', 'HOPT810101', 'FASG760101']
+        def reference(sequence, lambda_, weight):
+            tables = [dict(zip('ARNDCQEGHILKMFPSTWYV', aaindex1.normalised('zscore', [code])[0])) for code in codes]
+            n = len(sequence)
+            theta = [sum(np.mean([(h[sequence[i + j]] - h[sequence[i]]) ** 2 for h in tables])
+                         for i in range(n - j)) / (n - j) for j in range(1, lambda_ + 1)]
+            freqs = [sequence.count(aa) / n for aa in 'ARNDCQEGHILKMFPSTWYV']
+            total = sum(freqs) + weight * sum(theta)
+            return [f / total for f in freqs] + [weight * t / total for t in theta]
+#1.)
+        batch = pseaac(self.sequences, lambda_=4)
+        self.assertEqual(batch.shape, (3, 24), f'Expected PseAAC of shape (3, 24), got {batch.shape}.')
+        self.assertTrue(np.allclose(batch, [reference(sequence, 4, 0.05) for sequence in self.sequences]),
+            'Expected PseAAC to match the direct calculation.')
+        self.assertTrue(np.allclose(batch.sum(axis=1), 1), 'Expected PseAAC components to sum to 1.')
+#2.)
+        single = pseaac(self.sequences[0], codes[:2], lambda_=3, weight=0.5)
+        self.assertEqual(single.shape, (23,), f'Expected single PseAAC of shape (23,), got {single.shape}.')
+        self.assertTrue(np.isnan(pseaac('WYVKL', lambda_=5)).all(),
+            'Expected NaN PseAAC for a sequence not longer than lambda.')
+
+    def test_quasi_sequence_order(self):
+        """ Test Case to check sequence-order coupling numbers and quasi-sequence-order descriptors. """
+        def coupling(sequence, lag, matrix):
+            return sum(aaindex2.get(matrix, sequence[i], sequence[i + lag]) ** 2 for i in range(len(sequence) - lag))
+#1.)
+        tau = sequence_order_coupling(self.sequences, 'MIYT790101', lags=4)
+        expected = [[coupling(sequence, lag, 'MIYT790101') for lag in range(1, 5)] for sequence in self.sequences]
+        self.assertTrue(np.allclose(tau, expected),
+            'Expected coupling numbers to match the direct calculation.')
+        self.assertTrue(np.isnan(sequence_order_coupling('WYVKL', lags=[5])).all(),
+            'Expected NaN coupling number for a lag equal to the sequence length.')
+#2.)
+        qso = quasi_sequence_order(self.sequences, maxlag=4)
+        self.assertEqual(qso.shape, (3, 24), f'Expected QSO of shape (3, 24), got {qso.shape}.')
+        tau = sequence_order_coupling(self.sequences, 'GRAR740104', lags=4)
+        freqs = np.array([[sequence.count(aa) / len(sequence) for aa in 'ARNDCQEGHILKMFPSTWYV']
+                          for sequence in self.sequences])
+        total = freqs.sum(axis=1, keepdims=True) + 0.1 * tau.sum(axis=1, keepdims=True)
+        self.assertTrue(np.allclose(qso, np.concatenate([freqs, 0.1 * tau], axis=1) / total),
+            'Expected QSO to normalise frequencies and weighted coupling numbers together.')
+        self.assertTrue(np.allclose(quasi_sequence_order(self.sequences[0], maxlag=4), qso[0]),
+            'Expected single sequence QSO to match its row of the batch.')
+#3.)
+        with self.assertRaises(ValueError):
+            quasi_sequence_order('ACDE', 'ABCD123456')
+
+    def test_incremental_descriptors(self):
+        """ Test Case to check incremental descriptor updates against a full recomputation. """
+        rng = np.random.default_rng(0)
+        sequence = ''.join(rng.choice(list('ARNDCQEGHILKMFPSTWYV'), 120))
+        descriptors = IncrementalDescriptors(sequence, self.index_codes, windows=[5, 9], lags=8)
+        branch = descriptors.copy()
+#1.)
+        for _ in range(100):
+            position, residues = int(rng.integers(0, 117)), ''.join(rng.choice(list('ARNDCQEGHILKMFPSTWYV'), 3))
+            descriptors.substitute(position, residues)
+            sequence = sequence[:position] + residues + sequence[position + 3:]
+        self.assertEqual(descriptors.sequence, sequence, 'Expected substitutions to be applied to the sequence.')
+        rebuilt = IncrementalDescriptors(sequence, self.index_codes, windows=[5, 9], lags=8)
+        for method in ['mean', 'profiles', 'moreau_broto', 'moran', 'geary']:
+            self.assertTrue(np.array_equal(getattr(descriptors, method)(), getattr(rebuilt, method)(), equal_nan=True),
+                f'Expected updated {method} to be bit-identical to a full recomputation.')
+#2.)
+        self.assertTrue(np.allclose(descriptors.moran(), moran(sequence, self.index_codes, 8, None)),
+            'Expected Moran autocorrelation to match moran().')
+        self.assertTrue(np.allclose(descriptors.geary(), geary(sequence, self.index_codes, 8, None)),
+            'Expected Geary autocorrelation to match geary().')
+        self.assertTrue(np.allclose(descriptors.moreau_broto(), moreau_broto(sequence, self.index_codes, 8, None)),
+            'Expected Moreau-Broto autocorrelation to match moreau_broto().')
+        self.assertTrue(np.allclose(descriptors.profiles(), aaindex1.profiles([sequence], self.index_codes, [5, 9])[0],
+                                    equal_nan=True), 'Expected profiles to match AAIndex1.profiles().')
+        self.assertFalse(np.array_equal(branch.moran(), descriptors.moran()),
+            'Expected copies to be updated independently.')
+#3.)
+        constant = IncrementalDescriptors('AAA', self.index_codes, lags=4)
+        self.assertTrue(np.isnan(constant.moran()).all() and np.isnan(constant.geary()).all(),
+            'Expected NaN autocorrelation for a constant sequence and lags not shorter than it.')
+        with self.assertRaises(IndexError):
+            constant.substitute(2, 'CC')
+        with self.assertRaises(ValueError):
+            constant.substitute(0, 'X')
+        with self.assertRaises(ValueError):
+            IncrementalDescriptors('ACDE', self.index_codes, windows=0)
+#4.)
+        #sum trees over all records of a long sequence are refused above max_bytes
+        with self.assertRaises(ValueError):
+            IncrementalDescriptors('ACDEFGHIKL' * 100)
+        with self.assertRaises(ValueError):
+            IncrementalDescriptors('ACDE', self.index_codes, lags=2, max_bytes=512)
+
+if __name__ == '__main__':
+    #run all unit tests
+    unittest.main(verbosity=2)
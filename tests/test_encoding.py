@@ -0,0 +1,123 @@
+################################################################################
+################             Encoding Module Tests             #################
+################################################################################
+
+import unittest
+import numpy as np
+from aaindex import encode
+from aaindex.encoding import (AMINO_ACIDS, ALPHABET, GAP_CODE, AA_TO_INT, MAX_KMER, encode_kmers,
+                              ragged_reduce, ragged_to_padded)
+
+class Encoding_Tests(unittest.TestCase):
+    """
+    Test suite for testing the encoding module in the aaindex Python software package.
+
+    Test Cases
+    ==========
+    test_alphabet:
+        testing the encoding alphabet and amino acid to integer lookup table.
+    test_encode:
+        testing amino acid sequences are encoded into the correct integer codes.
+    test_encode_invalid:
+        testing invalid sequences raise the correct errors.
+    test_encode_kmers:
+        testing equal-length peptides are encoded into base-21 k-mer codes.
+    test_ragged:
+        testing per-sequence reductions and padding of ragged (values, offsets) arrays.
+    """
+    def test_alphabet(self):
+        """ Test Case to check the encoding alphabet and lookup table. """
+#1.)
+        self.assertEqual(len(ALPHABET), 21,
+            f'Expected 21 characters in alphabet, got {len(ALPHABET)}.')
+        self.assertEqual(ALPHABET[:20], AMINO_ACIDS,
+            'Expected the 20 canonical amino acids to come first in the alphabet.')
+        self.assertEqual(GAP_CODE, 20,
+            f'Expected gap code of 20, got {GAP_CODE}.')
+#2.)
+        for i, aa in enumerate(ALPHABET):
+            self.assertEqual(AA_TO_INT[aa], i,
+                f'Expected code {i} for {aa}, got {AA_TO_INT[aa]}.')
+
+    def test_encode(self):
+        """ Test Case to check sequences are encoded into the correct integer codes. """
+#1.)
+        codes = encode('ARNDCQEGHILKMFPSTWYV-')
+        self.assertEqual(codes.dtype, np.uint8,
+            f'Expected uint8 codes, got {codes.dtype}.')
+        self.assertEqual(codes.tolist(), list(range(21)),
+            f'Unexpected codes for alphabet, got {codes.tolist()}.')
+#2.)
+        #lowercase and whitespace-padded input is normalised
+        self.assertEqual(encode('  acdk ').tolist(), encode('ACDK').tolist(),
+            'Expected lowercase, whitespace-padded sequence to be normalised.')
+#3.)
+        self.assertEqual(len(encode('')), 0,
+            'Expected empty sequence to encode to an empty array.')
+
+    def test_encode_invalid(self):
+        """ Test Case to check invalid sequences raise the correct errors. """
+#1.)
+        with self.assertRaises(ValueError):
+            encode('ACDXZ')
+        with self.assertRaises(ValueError):
+            encode('ACDé')
+#2.)
+        with self.assertRaises(TypeError):
+            encode(1234)
+        with self.assertRaises(TypeError):
+            encode(None)
+
+    def test_encode_kmers(self):
+        """ Test Case to check peptides are encoded into base-21 k-mer codes. """
+#1.)
+        codes = encode_kmers(['AR', 'RA', '--', 'va'])
+        self.assertEqual(codes.tolist(), [1, 21, 440, 19 * 21],
+            f'Unexpected k-mer codes, got {codes.tolist()}.')
+        self.assertEqual(encode_kmers(['Y' * MAX_KMER]).tolist(), [sum(18 * 21 ** i for i in range(MAX_KMER))],
+            'Unexpected code for the longest k-mer.')
+        self.assertEqual(len(encode_kmers([])), 0, 'Expected no codes for no peptides.')
+#2.)
+        with self.assertRaises(ValueError):
+            encode_kmers(['ACD', 'AC'])
+        with self.assertRaises(ValueError):
+            encode_kmers(['A' * (MAX_KMER + 1)])
+        with self.assertRaises(ValueError):
+            encode_kmers(['ACX'])
+        with self.assertRaises(TypeError):
+            encode_kmers('ACD')
+
+    def test_ragged(self):
+        """ Test Case to check reductions and padding of ragged arrays. """
+        values = np.array([[1., 10.], [3., 20.], [2., 30.], [5., 5.], [4., 0.], [6., 1.]])
+        offsets = [0, 3, 3, 6]
+#1.)
+        self.assertEqual(ragged_reduce(values, offsets, 'sum').tolist(), [[6, 60], [0, 0], [15, 6]],
+            'Unexpected ragged sums.')
+        means = ragged_reduce(values, offsets)
+        self.assertTrue(np.array_equal(means[[0, 2]], [[2, 20], [5, 2]]) and np.isnan(means[1]).all(),
+            'Expected ragged means, NaN for the empty sequence.')
+        self.assertEqual(ragged_reduce(values, offsets, 'min')[2].tolist(), [4, 0], 'Unexpected ragged minimum.')
+        self.assertEqual(ragged_reduce(values, offsets, 'max')[0].tolist(), [3, 30], 'Unexpected ragged maximum.')
+        self.assertTrue(np.allclose(ragged_reduce(values, offsets, 'std')[0], values[:3].std(axis=0)),
+            'Expected ragged standard deviations to match numpy.')
+        self.assertEqual(ragged_reduce(np.full(300, 200, dtype=np.uint8), [0, 300], 'sum').tolist(), [60000],
+            'Expected integer values to be summed without overflow.')
+#2.)
+        padded = ragged_to_padded(values, offsets)
+        self.assertEqual(padded.shape, (3, 3, 2), f'Expected padded batch of shape (3, 3, 2), got {padded.shape}.')
+        self.assertTrue(np.array_equal(padded[2], values[3:]) and (padded[1] == 0).all(),
+            'Expected padded rows to hold each sequence followed by the fill value.')
+        self.assertTrue(np.array_equal(ragged_to_padded(values, offsets, 2, np.nan)[0], values[:2]),
+            'Expected sequences truncated to max_len.')
+#3.)
+        with self.assertRaises(ValueError):
+            ragged_reduce(values, [0, 3, 5])
+        with self.assertRaises(ValueError):
+            ragged_reduce(values, [0, 4, 3, 6])
+        with self.assertRaises(ValueError):
+            ragged_reduce(values, offsets, 'median')
+
+if __name__ == '__main__':
+    #run all unit tests
+    unittest.main(verbosity=2)
@@ -0,0 +1,51 @@
+################################################################################
+################             Features Module Tests             #################
+################################################################################
+
+import unittest
+import numpy as np
+from aaindex import aaindex2, aaindex3, encode, pair_features, pair_feature_codes
+
+class Features_Tests(unittest.TestCase):
+    """
+    Test suite for testing the features module in the aaindex Python software package.
+
+    Test Cases
+    ==========
+    test_pair_feature_codes:
+        testing the column labels cover every AAindex2 and AAindex3 record.
+    test_pair_features:
+        testing scores are gathered from every AAindex2 and AAindex3 matrix per pair.
+    """
+    def test_pair_feature_codes(self):
+        """ Test Case to check the column labels of pair_features(). """
+        codes = pair_feature_codes()
+#1.)
+        self.assertEqual(len(codes), 141,
+            f'Expected 141 pair feature codes, got {len(codes)}.')
+        self.assertEqual(codes[:94], aaindex2.record_codes(),
+            'Expected AAindex2 record codes first.')
+        self.assertEqual(codes[94:], aaindex3.record_codes(),
+            'Expected AAindex3 record codes last.')
+
+    def test_pair_features(self):
+        """ Test Case to check pair_features() gathers the score of every matrix per pair. """
+        aa_i = encode('ACDEFG')
+        aa_j = encode('KLMNPQ')
+#1.)
+        features = pair_features(aa_i, aa_j)
+        self.assertEqual(features.shape, (6, 141),
+            f'Expected features of shape (6, 141), got {features.shape}.')
+#2.)
+        for col, code in enumerate(pair_feature_codes()):
+            database = aaindex2 if col < 94 else aaindex3
+            expected = database.get_many(code, np.stack([aa_i, aa_j], axis=-1))
+            self.assertTrue(np.array_equal(features[:, col], expected, equal_nan=True),
+                f'pair_features() column for {code} does not match get_many().')
+#3.)
+        self.assertTrue(np.array_equal(pair_features('ACDEFG', 'KLMNPQ'), features, equal_nan=True),
+            'Expected string input to give the same features as encoded input.')
+
+if __name__ == '__main__':
+    #run all unit tests
+    unittest.main(verbosity=2)
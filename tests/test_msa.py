@@ -0,0 +1,147 @@
+################################################################################
+################                MSA Module Tests               #################
+################################################################################
+
+import unittest
+import numpy as np
+from aaindex import aaindex1, aaindex2
+from aaindex.encoding import ALPHABET, encode
+from aaindex.msa import (column_counts, henikoff_weights, column_scores, sum_of_pairs, column_properties,
+                         iter_column_properties)
+
+class MSA_Tests(unittest.TestCase):
+    """
+    Test suite for testing the msa module in the aaindex Python software package.
+
+    Test Cases
+    ==========
+    test_henikoff_weights:
+        testing column residue counts and position-based sequence weights.
+    test_sum_of_pairs:
+        testing column and total sum-of-pairs scores against pairwise get() lookups.
+    test_column_properties:
+        testing column property means and variances, gap handling and streamed column blocks.
+    """
+    alignment = ['MKT-AYIAK', 'MKS-AYLAK', 'MRTGAW-AK', 'LKT-AYIGR', '-KTDAF-AK']
+
+    def test_henikoff_weights(self):
+        """ Test Case to check column counts and Henikoff sequence weights. """
+#1.)
+        counts = column_counts(self.alignment)
+        self.assertEqual(counts.shape, (9, 21), f'Expected counts of shape (9, 21), got {counts.shape}.')
+        self.assertEqual(counts[0, ALPHABET.index('M')], 3, 'Expected 3 methionines in the first column.')
+        self.assertEqual(counts[3, ALPHABET.index('-')], 3, 'Expected 3 gaps in the fourth column.')
+        self.assertTrue(np.allclose(counts.sum(axis=1), 5), 'Expected every column to count 5 sequences.')
+        weighted = column_counts(self.alignment, [1, 2, 3, 4, 5], chunk_size=10)
+        self.assertEqual(weighted[0, ALPHABET.index('M')], 6, 'Expected weighted counts of the first column.')
+#2.)
+        weights = henikoff_weights(self.alignment)
+        expected = np.zeros(5)
+        for column in zip(*self.alignment):
+            for row, symbol in enumerate(column):
+                expected[row] += 1 / (len(set(column)) * column.count(symbol))
+        self.assertTrue(np.allclose(weights, expected * 5 / expected.sum()),
+            'Expected weights to match the per-column 1 / (r * n) sums.')
+        self.assertAlmostEqual(weights.mean(), 1, msg='Expected weights scaled to a mean of 1.')
+        self.assertTrue(np.allclose(henikoff_weights(['ACD'] * 4), 1), 'Expected equal weights for identical sequences.')
+#3.)
+        with self.assertRaises(ValueError):
+            column_counts(['ACD', 'AC'])
+        with self.assertRaises(ValueError):
+            column_counts(self.alignment, [1, 2])
+        with self.assertRaises(ValueError):
+            column_counts(np.full((2, 3), 25, dtype=np.uint8))
+        with self.assertRaises(TypeError):
+            henikoff_weights('MKTAYIAK')
+
+    def test_sum_of_pairs(self):
+        """ Test Case to check sum-of-pairs scores of alignment columns. """
+        def reference(code, weights, gap_score, gap_gap_score):
+            scores = np.zeros(9)
+            for index, column in enumerate(zip(*self.alignment)):
+                for s in range(5):
+                    for t in range(s + 1, 5):
+                        a, b = column[s], column[t]
+                        if a == '-' or b == '-':
+                            score = gap_gap_score if a == b else gap_score
+                        else:
+                            score = (aaindex2.get(code, a, b) + aaindex2.get(code, b, a)) / 2
+                        scores[index] += weights[s] * weights[t] * score
+            return scores
+#1.)
+        scores = column_scores(self.alignment)
+        self.assertEqual(scores.shape, (9, ), f'Expected column scores of shape (9,), got {scores.shape}.')
+        self.assertTrue(np.allclose(scores, reference('HENS920102', np.ones(5), 0, 0)),
+            'Expected BLOSUM62 column scores to match pairwise get() lookups.')
+        self.assertAlmostEqual(sum_of_pairs(self.alignment), scores.sum(),
+            msg='Expected total score to be the sum of column scores.')
+#2.)
+        weights = henikoff_weights(self.alignment)
+        for code in ['HENS920102', 'LINK010101']:
+            self.assertTrue(np.allclose(column_scores(self.alignment, code, 'henikoff', -4, 1),
+                                        reference(code, weights, -4, 1)),
+                f'Expected weighted {code} column scores with gap scores to match pairwise get() lookups.')
+        both = column_scores(self.alignment, ['HENS920102', 'LINK010101'], gap_score=-4)
+        self.assertEqual(both.shape, (9, 2), f'Expected scores of shape (9, 2), got {both.shape}.')
+        self.assertTrue(np.allclose(both[:, 1], column_scores(self.alignment, 'LINK010101', gap_score=-4)),
+            'Expected stacked scores to match single matrix scores.')
+        self.assertTrue(np.allclose(sum_of_pairs(np.stack([encode(sequence) for sequence in self.alignment])),
+                                    sum_of_pairs(self.alignment)),
+            'Expected code arrays to score as their sequences.')
+#3.)
+        with self.assertRaises(ValueError):
+            column_scores(self.alignment, weights='uniform')
+        with self.assertRaises(ValueError):
+            column_scores(self.alignment, 'ABCD123456')
+        with self.assertRaises(ValueError):
+            sum_of_pairs(['ACDXZ', 'ACDEF'])
+
+    def test_column_properties(self):
+        """ Test Case to check property statistics of alignment columns. """
+        index_codes = ['KYTJ820101', 'CHOP780207']
+        def reference(code, gaps, weights):
+            values = aaindex1.values(code)
+            means, variances = [], []
+            for column in zip(*self.alignment):
+                rows = [row for row, residue in enumerate(column) if gaps == 'value' or residue != '-']
+                column_values = np.array([values[column[row]] if column[row] != '-' else 0 for row in rows])
+                mean = np.average(column_values, weights=weights[rows])
+                means.append(mean)
+                variances.append(np.average((column_values - mean) ** 2, weights=weights[rows]))
+            return np.array(means), np.array(variances)
+#1.)
+        properties = column_properties(self.alignment, index_codes)
+        self.assertEqual(properties.mean.shape, (9, 2), f'Expected means of shape (9, 2), got {properties.mean.shape}.')
+        for index, code in enumerate(index_codes):
+            mean, variance = reference(code, 'ignore', np.ones(5))
+            self.assertTrue(np.allclose(properties.mean[:, index], mean) and
+                            np.allclose(properties.variance[:, index], variance),
+                f'Expected {code} column statistics over residues only to match the per-residue values.')
+        self.assertTrue(np.isnan(column_properties(['A-', 'C-'], 'KYTJ820101').mean[1]),
+            'Expected NaN statistics for columns without residues when gaps are ignored.')
+#2.)
+        weights = henikoff_weights(self.alignment)
+        weighted = column_properties(self.alignment, 'KYTJ820101', gaps='value', weights='henikoff')
+        mean, variance = reference('KYTJ820101', 'value', weights)
+        self.assertEqual(weighted.mean.shape, (9, ), f'Expected means of shape (9,), got {weighted.mean.shape}.')
+        self.assertTrue(np.allclose(weighted.mean, mean) and np.allclose(weighted.variance, variance),
+            'Expected weighted statistics counting gaps as 0 to match the per-residue values.')
+#3.)
+        blocks = list(iter_column_properties(self.alignment, index_codes, block_size=4))
+        self.assertEqual([(block.start, block.stop) for block in blocks], [(0, 4), (4, 8), (8, 9)],
+            'Expected column blocks of at most 4 columns.')
+        self.assertTrue(np.array_equal(np.concatenate([block.mean for block in blocks]), properties.mean),
+            'Expected streamed blocks to match the full column means.')
+        self.assertTrue(np.allclose(column_properties(self.alignment, index_codes, 'zscore').mean[:, 1],
+                                    column_properties(self.alignment, ['CHOP780207'], 'zscore').mean[:, 0]),
+            'Expected normalised statistics to be computed per property.')
+#4.)
+        with self.assertRaises(ValueError):
+            column_properties(self.alignment, index_codes, gaps='skip')
+        with self.assertRaises(ValueError):
+            column_properties(self.alignment, index_codes, block_size=0)
+        with self.assertRaises(ValueError):
+            column_properties(self.alignment, ['ABCD123456'])
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
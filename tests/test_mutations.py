@@ -0,0 +1,76 @@
+################################################################################
+################             Mutations Module Tests            #################
+################################################################################
+
+import unittest
+import numpy as np
+from aaindex import aaindex1, aaindex2
+from aaindex.encoding import AMINO_ACIDS
+from aaindex.mutations import property_deltas, substitution_scores
+
+class Mutations_Tests(unittest.TestCase):
+    """
+    Test suite for testing the mutations module in the aaindex Python software package.
+
+    Test Cases
+    ==========
+    test_property_deltas:
+        testing the property changes of every point mutant against per-mutant values() lookups.
+    test_substitution_scores:
+        testing the substitution scores of every point mutant against per-mutant get() lookups.
+    """
+    index_codes = ['KYTJ820101', 'CHOP780207', 'ANDN920101']
+    sequences = ['MKTAYIAKQR', 'WYV-KL']
+
+    def test_property_deltas(self):
+        """ Test Case to check property deltas of every point mutant. """
+        def reference(sequence):
+            return [[[aaindex1.values(code)[mutant] - aaindex1.values(code)[wild_type] if wild_type != '-' else np.nan
+                      for code in self.index_codes] for mutant in AMINO_ACIDS] for wild_type in sequence]
+#1.)
+        deltas = property_deltas(self.sequences, self.index_codes)
+        self.assertEqual(deltas.shape, (2, 10, 20, 3), f'Expected deltas of shape (2, 10, 20, 3), got {deltas.shape}.')
+        self.assertTrue(np.allclose(deltas[0], reference(self.sequences[0])),
+            'Expected deltas to match the per-mutant values() differences.')
+        self.assertTrue(np.allclose(deltas[1, :6], reference(self.sequences[1]), equal_nan=True),
+            'Expected deltas at gap positions to be NaN.')
+        self.assertTrue(np.isnan(deltas[1, 6:]).all(), 'Expected padding positions to be NaN.')
+#2.)
+        single = property_deltas(self.sequences[0], 'KYTJ820101')
+        self.assertEqual(single.shape, (10, 20), f'Expected single deltas of shape (10, 20), got {single.shape}.')
+        self.assertTrue(np.array_equal(single, deltas[0, :, :, 0]),
+            'Expected single sequence deltas to match its row of the batch.')
+        self.assertEqual(single[0, AMINO_ACIDS.index('M')], 0, 'Expected zero delta for the wild-type residue.')
+        self.assertTrue(np.allclose(property_deltas(self.sequences[0], self.index_codes, 'zscore')[:, :, 1],
+                                    property_deltas(self.sequences[0], ['CHOP780207'], 'zscore')[:, :, 0]),
+            'Expected normalised deltas to be computed per property.')
+        self.assertEqual(property_deltas(self.sequences, self.index_codes, max_len=4).shape, (2, 4, 20, 3),
+            'Expected batch truncated to max_len.')
+#3.)
+        with self.assertRaises(ValueError):
+            property_deltas('ACDXZ', self.index_codes)
+        with self.assertRaises(ValueError):
+            property_deltas('ACDE', ['ABCD123456'])
+        with self.assertRaises(TypeError):
+            property_deltas(1234, self.index_codes)
+
+    def test_substitution_scores(self):
+        """ Test Case to check substitution scores of every point mutant. """
+        matrices = ['HENS920102', 'LINK010101']
+#1.)
+        scores = substitution_scores(self.sequences, matrices)
+        self.assertEqual(scores.shape, (2, 10, 20, 2), f'Expected scores of shape (2, 10, 20, 2), got {scores.shape}.')
+        expected = [[[aaindex2.get(matrix, wild_type, mutant) for matrix in matrices] for mutant in AMINO_ACIDS]
+                    for wild_type in self.sequences[0]]
+        self.assertTrue(np.allclose(scores[0], np.array(expected, dtype=float), equal_nan=True),
+            'Expected scores to match the per-mutant get() lookups, wild type indexing the row.')
+        self.assertTrue(np.isnan(scores[1, 3]).all() and np.isnan(scores[1, 6:]).all(),
+            'Expected gap and padding positions to be NaN.')
+#2.)
+        blosum = substitution_scores(self.sequences[0])
+        self.assertEqual(blosum.shape, (10, 20), f'Expected single BLOSUM62 scores of shape (10, 20), got {blosum.shape}.')
+        self.assertTrue(np.array_equal(blosum, scores[0, :, :, 0]),
+            'Expected default matrix to be BLOSUM62.')
+#3.)
+        with self.assertRaises(ValueError):
+            substitution_scores('ACDE', 'ABCD123456')
@@ -0,0 +1,92 @@
+################################################################################
+################           Quantisation Module Tests           #################
+################################################################################
+
+import unittest
+import numpy as np
+from aaindex import aaindex1, aaindex2
+from aaindex.quantisation import QUANTISED_DTYPES, QuantisedArray, quantise
+
+class Quantisation_Tests(unittest.TestCase):
+    """
+    Test suite for testing the quantisation module in the aaindex Python software package.
+
+    Test Cases
+    ==========
+    test_quantise:
+        testing float and per-index int8 storage, dequantisation and error reporting of arrays.
+    test_quantised_databases:
+        testing reduced precision value arrays and matrix stacks of the databases and their reports.
+    """
+    def test_quantise(self):
+        """ Test Case to check reduced precision storage of arrays. """
+        array = np.array([[-2.5, 0.0, 7.5, np.nan], [3.0, 3.0, 3.0, 3.0], [1e-3, 2e-3, 4e-3, 8e-3]])
+#1.)
+        quantised = quantise(array)
+        self.assertIsInstance(quantised, QuantisedArray, 'Expected a QuantisedArray.')
+        self.assertEqual(quantised.dtype, 'int8', f'Expected int8 storage, got {quantised.dtype}.')
+        self.assertEqual(quantised.nbytes, 12 + 2 * 3 * 8, f'Unexpected number of bytes {quantised.nbytes}.')
+        self.assertEqual(quantised.data[0].tolist(), [-127, -64, 127, -128],
+            f'Expected each index mapped onto -127..127 with NaN as -128, got {quantised.data[0].tolist()}.')
+        restored = quantised.dequantise()
+        self.assertTrue(np.isnan(restored[0, 3]), 'Expected NaN restored from -128.')
+        self.assertTrue(np.all(np.abs(restored - array)[:, :3] <= quantised.scale[:, np.newaxis] / 2 + 1e-12),
+            'Expected dequantised values within half of each index scale.')
+        self.assertTrue(np.array_equal(restored[1], array[1]), 'Expected a constant index restored exactly.')
+        self.assertEqual(quantised.dequantise('float32').dtype, np.float32, 'Expected float32 dequantised output.')
+#2.)
+        error = quantised.error(array)
+        self.assertEqual(error.max_abs_error.shape, (3, ), 'Expected an error per index.')
+        self.assertTrue(np.allclose(error.max_abs_error, np.nanmax(np.abs(restored - array), axis=1)),
+            'Expected maximum absolute errors ignoring NaN in both arrays.')
+        self.assertTrue(error.rmse[2] < 1e-4, 'Expected a small error for an index with a small range.')
+        self.assertTrue(np.array_equal(quantise(array, 'float32').dequantise(), array.astype(np.float32),
+                                       equal_nan=True), 'Expected float32 storage to be a cast.')
+        self.assertTrue(np.isinf(quantise(np.array([[1e6]]), 'float16').error([[1e6]]).max_abs_error[0]),
+            'Expected float16 overflow reported as an infinite error.')
+#3.)
+        with self.assertRaises(ValueError):
+            quantise(array, 'int4')
+        with self.assertRaises(ValueError):
+            quantised.error(array[:2])
+
+    def test_quantised_databases(self):
+        """ Test Case to check reduced precision arrays of the databases. """
+        index_codes = ['KYTJ820101', 'CHOP780207']
+#1.)
+        values = aaindex1.quantised('int8', index_codes)
+        self.assertEqual(values.shape, (2, 21), f'Expected quantised values of shape (2, 21), got {values.shape}.')
+        self.assertIs(values, aaindex1.quantised('int8', index_codes), 'Expected quantised arrays to be cached.')
+        self.assertTrue(np.allclose(values.dequantise(), aaindex1.to_array(index_codes), atol=values.scale.max()),
+            'Expected dequantised values to approximate to_array().')
+        self.assertTrue(np.array_equal(aaindex1.quantised('float16', index_codes, 'zscore').dequantise(),
+                                       aaindex1.normalised('zscore', index_codes).astype(np.float16)),
+            'Expected normalised values stored as float16.')
+#2.)
+        matrices = aaindex2.quantised('int8', ['HENS920102', 'ALTS910101'])
+        self.assertEqual(matrices.shape, (2, 20, 20), f'Expected quantised tensor of shape (2, 20, 20), got {matrices.shape}.')
+        self.assertEqual(matrices.data.dtype, np.int8, 'Expected int8 storage.')
+        self.assertTrue(np.allclose(matrices.dequantise(), aaindex2.to_tensor(['HENS920102', 'ALTS910101']),
+                                    atol=matrices.scale.max()), 'Expected dequantised matrices to approximate to_tensor().')
+#3.)
+        report = aaindex2.quantisation_report(['HENS920102', 'ALTS910101'])
+        self.assertEqual(list(report), list(QUANTISED_DTYPES), 'Expected a report entry per storage format.')
+        self.assertTrue(report.float32.max_abs_error.max() <= report.float16.max_abs_error.max() <=
+                        report.int8.max_abs_error.max(), 'Expected errors to grow as precision drops.')
+        self.assertTrue(report.int8.compression > 7, f'Expected int8 compression above 7, got {report.int8.compression}.')
+        self.assertEqual(list(aaindex1.quantisation_report(index_codes, dtypes=['int8'])), ['int8'],
+            'Expected a report on the requested formats only.')
+        with self.assertRaises(ValueError):
+            aaindex1.quantised('int16', index_codes)
+#4.)
+        #an empty selection of records gives empty arrays, as to_array() and to_tensor()
+        for dtype in QUANTISED_DTYPES:
+            self.assertEqual(aaindex1.quantised(dtype, []).dequantise().shape, (0, 21),
+                f'Expected an empty {dtype} value array.')
+            self.assertEqual(aaindex2.quantised(dtype, []).dequantise().shape, (0, 20, 20),
+                f'Expected an empty {dtype} matrix stack.')
+        self.assertEqual(aaindex2.quantisation_report([]).int8.max_abs_error.shape, (0, ),
+            'Expected an empty error per index.')
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)